@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.api_metrics
+
+This module implements an in-memory collector for the AWS API calls made through the
+ConnectionManager, and the aggregated report that can be produced from it at the end of a run.
+"""
+
+import json
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+NO_STACK = "<no stack>"
+
+
+class ApiCall(object):
+    """
+    A record of a single ConnectionManager call.
+
+    :param service: The Boto3 service called.
+    :param command: The Boto3 command called.
+    :param stack_name: The external name of the stack the call was made on behalf of.
+    """
+
+    __slots__ = (
+        "service",
+        "command",
+        "stack_name",
+        "latency",
+        "retries",
+        "throttle_seconds",
+        "coalesced",
+    )
+
+    def __init__(self, service: str, command: str, stack_name: Optional[str]):
+        self.service = service
+        self.command = command
+        self.stack_name = stack_name or NO_STACK
+        self.latency = 0.0
+        self.retries = 0
+        self.throttle_seconds = 0.0
+        self.coalesced = False
+
+
+def _percentile(sorted_values: List[float], percent: float) -> float:
+    """Returns the nearest-rank percentile of an already sorted, non-empty list."""
+    index = int(round(percent / 100.0 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+class ApiCallCollector(object):
+    """
+    Collects ApiCall records with as little overhead as possible. Nothing is recorded unless the
+    collector has been enabled, and recording only appends to a list, which is thread-safe.
+
+    :param top_stacks: The number of stacks to list in the summary, ordered by call count.
+    """
+
+    def __init__(self, top_stacks: int = 10):
+        self.enabled = False
+        self.top_stacks = top_stacks
+        self._calls: List[ApiCall] = []
+        self._local = threading.local()
+
+    @property
+    def calls(self) -> List[ApiCall]:
+        return list(self._calls)
+
+    def reset(self):
+        self._calls = []
+
+    @contextmanager
+    def record(self, service: str, command: str, stack_name: Optional[str]):
+        """
+        Records the call made within the context, including all of its retries.
+
+        :param service: The Boto3 service called.
+        :param command: The Boto3 command called.
+        :param stack_name: The external name of the stack the call is made on behalf of.
+        """
+        call = ApiCall(service, command, stack_name)
+        self._local.current = call
+        start = time.perf_counter()
+        try:
+            yield call
+        finally:
+            call.latency = time.perf_counter() - start
+            self._local.current = None
+            self._calls.append(call)
+
+    def record_throttle(self, delay: float):
+        """Adds a throttling retry and the time slept for it to the call currently recorded."""
+        call = getattr(self._local, "current", None)
+        if call is not None:
+            call.retries += 1
+            call.throttle_seconds += delay
+
+    def record_coalesced(self):
+        """Marks the call currently recorded as having shared another call's request."""
+        call = getattr(self._local, "current", None)
+        if call is not None:
+            call.coalesced = True
+
+    def summary(self) -> Dict:
+        """
+        Aggregates the recorded calls.
+
+        :returns: Calls, latency percentiles, retries and throttling time per command, along with
+            the stacks that made the most calls.
+        """
+        calls = self.calls
+        by_command = defaultdict(list)
+        for call in calls:
+            by_command[f"{call.service}.{call.command}"].append(call)
+
+        commands = {}
+        for name, command_calls in sorted(
+            by_command.items(), key=lambda item: -len(item[1])
+        ):
+            latencies = sorted(call.latency for call in command_calls)
+            commands[name] = {
+                "calls": len(command_calls),
+                "coalesced": sum(call.coalesced for call in command_calls),
+                "p50_latency_seconds": round(_percentile(latencies, 50), 4),
+                "p95_latency_seconds": round(_percentile(latencies, 95), 4),
+                "total_latency_seconds": round(sum(latencies), 4),
+                "retries": sum(call.retries for call in command_calls),
+                "throttle_seconds": round(
+                    sum(call.throttle_seconds for call in command_calls), 4
+                ),
+            }
+
+        stack_counts = Counter(call.stack_name for call in calls)
+        return {
+            "total_calls": len(calls),
+            "total_retries": sum(call.retries for call in calls),
+            "total_throttle_seconds": round(
+                sum(call.throttle_seconds for call in calls), 4
+            ),
+            "commands": commands,
+            "top_stacks": [
+                {"stack": stack_name, "calls": count}
+                for stack_name, count in stack_counts.most_common(self.top_stacks)
+            ],
+        }
+
+    def report(self) -> str:
+        """Returns the summary as a JSON string."""
+        return json.dumps(self.summary(), indent=4)
+
+
+api_call_collector = ApiCallCollector()
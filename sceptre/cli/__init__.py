@@ -7,35 +7,100 @@ This module implements Sceptre's CLI, and should not be directly imported.
 """
 
 import os
+from pathlib import Path
 
 import click
 import colorama
 
 from sceptre import __version__
-from sceptre.cli.create import create_command
-from sceptre.cli.delete import delete_command
-from sceptre.cli.describe import describe_group
-from sceptre.cli.diff import diff_command
-from sceptre.cli.drift import drift_group
-from sceptre.cli.dump import dump_group
-from sceptre.cli.execute import execute_command
-from sceptre.cli.helpers import catch_exceptions, setup_vars
-from sceptre.cli.launch import launch_command
-from sceptre.cli.list import list_group
-from sceptre.cli.new import new_group
-from sceptre.cli.policy import set_policy_command
-from sceptre.cli.prune import prune_command
-from sceptre.cli.status import status_command
-from sceptre.cli.template import (
-    validate_command,
-    generate_command,
-    estimate_cost_command,
-    fetch_remote_template_command,
-)
-from sceptre.cli.update import update_command
-
-
-@click.group()
+from sceptre.api_metrics import api_call_collector
+from sceptre.cli.helpers import LazyGroup, catch_exceptions, setup_vars
+from sceptre.connection_manager import ConnectionManager
+from sceptre.outputs_snapshot import OutputsSnapshot, use_outputs_snapshot
+from sceptre.resolvers import ResolvableContainerProperty
+from sceptre.resolvers.cache import ResolverCache
+from sceptre.resolvers.profiler import resolver_profiler
+
+
+# Subcommands are imported only when invoked, keeping startup fast for commands like --version.
+# Their short help is repeated here so that --help can list them without importing them.
+LAZY_COMMANDS = {
+    "new": (
+        "sceptre.cli.new:new_group",
+        "Commands for initialising Sceptre projects.",
+    ),
+    "create": (
+        "sceptre.cli.create:create_command",
+        "Creates a stack or a change set.",
+    ),
+    "update": (
+        "sceptre.cli.update:update_command",
+        "Update a stack.",
+    ),
+    "delete": (
+        "sceptre.cli.delete:delete_command",
+        "Deletes a stack or a change set.",
+    ),
+    "launch": (
+        "sceptre.cli.launch:launch_command",
+        "Launch a Stack or StackGroup.",
+    ),
+    "execute": (
+        "sceptre.cli.execute:execute_command",
+        "Executes a Change Set.",
+    ),
+    "validate": (
+        "sceptre.cli.template:validate_command",
+        "Validates the template.",
+    ),
+    "estimate-cost": (
+        "sceptre.cli.template:estimate_cost_command",
+        "Estimates the cost of the template.",
+    ),
+    "generate": (
+        "sceptre.cli.template:generate_command",
+        "Prints the template.",
+    ),
+    "set-policy": (
+        "sceptre.cli.policy:set_policy_command",
+        "Sets Stack policy.",
+    ),
+    "status": (
+        "sceptre.cli.status:status_command",
+        "Print status of stack or stack_group.",
+    ),
+    "list": (
+        "sceptre.cli.list:list_group",
+        "Commands for listing attributes of stacks.",
+    ),
+    "dump": (
+        "sceptre.cli.dump:dump_group",
+        "Commands for dumping attributes of stacks.",
+    ),
+    "describe": (
+        "sceptre.cli.describe:describe_group",
+        "Commands for describing attributes of stacks.",
+    ),
+    "fetch-remote-template": (
+        "sceptre.cli.template:fetch_remote_template_command",
+        "Prints the remote template.",
+    ),
+    "diff": (
+        "sceptre.cli.diff:diff_command",
+        "Compares deployed infrastructure with current configurations",
+    ),
+    "drift": (
+        "sceptre.cli.drift:drift_group",
+        "Commands for calling drift detection.",
+    ),
+    "prune": (
+        "sceptre.cli.prune:prune_command",
+        "Deletes all obsolete stacks in the project",
+    ),
+}
+
+
+@click.group(cls=LazyGroup, lazy_commands=LAZY_COMMANDS)
 @click.version_option(version=__version__, prog_name="Sceptre")
 @click.option("--debug", is_flag=True, help="Turn on debug logging.")
 @click.option("--dir", "directory", help="Specify sceptre directory.")
@@ -68,6 +133,77 @@ from sceptre.cli.update import update_command
     default=False,
     help="Merge variables from successive --vars and var files",
 )
+@click.option(
+    "--coalesce-aws-calls",
+    is_flag=True,
+    default=False,
+    help="Share one in-flight request between concurrent identical read-only AWS calls.",
+)
+@click.option(
+    "--coalesce-ttl",
+    type=click.FloatRange(min=0),
+    default=0,
+    help="Seconds a coalesced read-only AWS response may be reused by later identical calls.",
+)
+@click.option(
+    "--api-report",
+    is_flag=True,
+    default=False,
+    help="Print a JSON report of the AWS API calls made at the end of the run.",
+)
+@click.option(
+    "--api-report-file",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write a JSON report of the AWS API calls made at the end of the run to this file.",
+)
+@click.option(
+    "--connection-backend",
+    type=click.Choice(["aws", "offline"]),
+    default="aws",
+    envvar="SCEPTRE_CONNECTION_BACKEND",
+    help="Make AWS calls against AWS, or against an in-memory offline stand-in.",
+)
+@click.option(
+    "--offline-config",
+    type=click.Path(exists=True, dir_okay=False),
+    envvar="SCEPTRE_OFFLINE_CONFIG",
+    help="A YAML file configuring the offline connection backend.",
+)
+@click.option(
+    "--resolver-concurrency",
+    type=click.IntRange(min=1),
+    default=1,
+    envvar="SCEPTRE_RESOLVER_CONCURRENCY",
+    help="The number of resolvers in a stack's parameters, sceptre_user_data and other "
+    "properties that may be resolved at the same time.",
+)
+@click.option(
+    "--refresh-resolver-cache",
+    is_flag=True,
+    default=False,
+    envvar="SCEPTRE_REFRESH_RESOLVER_CACHE",
+    help="Ignore resolver results cached on disk by earlier runs, and cache fresh ones.",
+)
+@click.option(
+    "--resolver-profile",
+    is_flag=True,
+    default=False,
+    help="Print a report of the time spent resolving each resolver at the end of the run, "
+    "as JSON with --output json and otherwise as text.",
+)
+@click.option(
+    "--resolver-profile-file",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write a JSON report of the time spent resolving each resolver at the end of the run "
+    "to this file.",
+)
+@click.option(
+    "--outputs-snapshot",
+    type=click.Path(exists=True, dir_okay=False),
+    envvar="SCEPTRE_OUTPUTS_SNAPSHOT",
+    help="Read stack outputs and exports from a snapshot written by "
+    "'sceptre list outputs --snapshot' instead of describing stacks.",
+)
 @click.pass_context
 @catch_exceptions
 def cli(
@@ -80,11 +216,49 @@ def cli(
     var_file,
     ignore_dependencies,
     merge_vars,
+    coalesce_aws_calls,
+    coalesce_ttl,
+    api_report,
+    api_report_file,
+    connection_backend,
+    offline_config,
+    resolver_concurrency,
+    refresh_resolver_cache,
+    resolver_profile,
+    resolver_profile_file,
+    outputs_snapshot,
 ):
     """
     Sceptre is a tool to manage your cloud native infrastructure deployments.
     """
     colorama.init()
+    ConnectionManager.coalesce_calls = coalesce_aws_calls
+    ConnectionManager.coalesce_ttl = coalesce_ttl
+    api_call_collector.enabled = bool(api_report or api_report_file)
+    ResolvableContainerProperty.max_concurrent_resolvers = resolver_concurrency
+    ResolverCache.refresh = refresh_resolver_cache
+    use_outputs_snapshot(
+        OutputsSnapshot.from_file(outputs_snapshot) if outputs_snapshot else None
+    )
+    if connection_backend == "offline":
+        from sceptre.offline_backend import OfflineBackendConfig, use_offline_backend
+
+        use_offline_backend(
+            OfflineBackendConfig.from_file(offline_config) if offline_config else None
+        )
+    elif ConnectionManager.default_session_class is not None:
+        from sceptre.offline_backend import use_aws_backend
+
+        use_aws_backend()
+    if api_call_collector.enabled:
+        ctx.call_on_close(lambda: write_api_report(api_report, api_report_file))
+    resolver_profiler.enabled = bool(resolver_profile or resolver_profile_file)
+    if resolver_profiler.enabled:
+        ctx.call_on_close(
+            lambda: write_resolver_profile(
+                resolver_profile, output, resolver_profile_file
+            )
+        )
     ctx.obj = {
         "user_variables": setup_vars(var_file, var, merge_vars, debug, no_colour),
         "output_format": output,
@@ -94,21 +268,39 @@ def cli(
     }
 
 
-cli.add_command(new_group)
-cli.add_command(create_command)
-cli.add_command(update_command)
-cli.add_command(delete_command)
-cli.add_command(launch_command)
-cli.add_command(execute_command)
-cli.add_command(validate_command)
-cli.add_command(estimate_cost_command)
-cli.add_command(generate_command)
-cli.add_command(set_policy_command)
-cli.add_command(status_command)
-cli.add_command(list_group)
-cli.add_command(dump_group)
-cli.add_command(describe_group)
-cli.add_command(fetch_remote_template_command)
-cli.add_command(diff_command)
-cli.add_command(drift_group)
-cli.add_command(prune_command)
+def write_api_report(echo: bool, file_path: str = None):
+    """
+    Writes the AWS API call report to stderr and/or a file, then stops collecting calls.
+
+    :param echo: Whether to print the report to stderr, keeping stdout free for command output.
+    :param file_path: An optional path to write the report to.
+    """
+    report = api_call_collector.report()
+    if echo:
+        click.echo(report, err=True)
+    if file_path:
+        path = Path(file_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(report)
+
+    api_call_collector.enabled = False
+    api_call_collector.reset()
+
+
+def write_resolver_profile(echo: bool, output_format: str, file_path: str = None):
+    """
+    Writes the resolver profile report to stderr and/or a file, then stops profiling.
+
+    :param echo: Whether to print the report to stderr, keeping stdout free for command output.
+    :param output_format: The format of the printed report; "json" or anything else for text.
+    :param file_path: An optional path to write the report to, as JSON.
+    """
+    if echo:
+        click.echo(resolver_profiler.report(output_format), err=True)
+    if file_path:
+        path = Path(file_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(resolver_profiler.report("json"))
+
+    resolver_profiler.enabled = False
+    resolver_profiler.reset()
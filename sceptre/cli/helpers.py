@@ -1,3 +1,4 @@
+import importlib
 import logging
 import sys
 
@@ -12,10 +13,6 @@ import click
 import six
 import yaml
 
-from boto3.exceptions import Boto3Error
-from botocore.exceptions import BotoCoreError, ClientError
-from jinja2.exceptions import TemplateError
-
 from sceptre.helpers import logging_level
 from sceptre.exceptions import SceptreException
 from sceptre.stack_status import StackStatus
@@ -24,6 +21,70 @@ from sceptre.stack_status_colourer import StackStatusColourer
 logger = logging.getLogger(__name__)
 
 
+class LazyGroup(click.Group):
+    """
+    A click Group whose subcommands are only imported when they are invoked, so that running one
+    command (or --help) doesn't pay for importing every other command and its dependencies.
+
+    :param lazy_commands: A dict of command names to the "module:attribute" import path of the
+        click command and the short help listed for it by --help.
+    """
+
+    def __init__(self, *args, lazy_commands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = lazy_commands or {}
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_commands))
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name in self.lazy_commands and cmd_name not in self.commands:
+            import_path, _ = self.lazy_commands[cmd_name]
+            module_name, attribute = import_path.split(":")
+            command = getattr(importlib.import_module(module_name), attribute)
+            self.add_command(command, cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def format_commands(self, ctx, formatter):
+        """Lists the subcommands as click does, with the static short help of those not imported."""
+        rows = []
+        for cmd_name in self.list_commands(ctx):
+            command = self.commands.get(cmd_name)
+            if command is None:
+                rows.append((cmd_name, self.lazy_commands[cmd_name][1]))
+            elif not command.hidden:
+                rows.append((cmd_name, command))
+        if not rows:
+            return
+        limit = formatter.width - 6 - max(len(cmd_name) for cmd_name, _ in rows)
+        with formatter.section("Commands"):
+            formatter.write_dl(
+                [
+                    (
+                        cmd_name,
+                        (
+                            help
+                            if isinstance(help, str)
+                            else help.get_short_help_str(limit)
+                        ),
+                    )
+                    for cmd_name, help in rows
+                ]
+            )
+
+
+def _simplified_exception_types():
+    """
+    Returns the error types that catch_exceptions simplifies. These are imported lazily, since
+    importing boto3 and jinja2 is expensive and only needed once such an error has been raised.
+    """
+    from boto3.exceptions import Boto3Error
+    from botocore.exceptions import BotoCoreError, ClientError
+    from jinja2.exceptions import TemplateError
+
+    return SceptreException, BotoCoreError, ClientError, Boto3Error, TemplateError
+
+
 def catch_exceptions(func):
     """
     Catches and simplifies expected errors thrown by sceptre.
@@ -44,13 +105,9 @@ def catch_exceptions(func):
         """
         try:
             return func(*args, **kwargs)
-        except (
-            SceptreException,
-            BotoCoreError,
-            ClientError,
-            Boto3Error,
-            TemplateError,
-        ) as error:
+        except Exception as error:
+            if not isinstance(error, _simplified_exception_types()):
+                raise
             if logging_level() == logging.DEBUG:
                 raise
             write(error)
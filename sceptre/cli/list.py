@@ -3,6 +3,13 @@ import click
 
 from sceptre.context import SceptreContext
 from sceptre.cli.helpers import catch_exceptions, write
+from sceptre.exports_catalog import (
+    describe_all_stacks,
+    describe_stack,
+    export_catalogs,
+)
+from sceptre.outputs_cache import account_key
+from sceptre.outputs_snapshot import OutputsSnapshot
 from sceptre.plan.plan import SceptrePlan
 
 from typing import List, Dict
@@ -111,9 +118,15 @@ def write_outputs(export, responses, plan, context):
     type=click.Choice(["envvar", "stackoutput", "stackoutputexternal"]),
     help="Specify the export formatting.",
 )
+@click.option(
+    "--snapshot",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Also write the outputs of every stack in the accounts and regions of the "
+    "stacks to this file, for use with 'sceptre --outputs-snapshot'.",
+)
 @click.pass_context
 @catch_exceptions
-def list_outputs(ctx, path, export):
+def list_outputs(ctx, path, export, snapshot):
     """
     List outputs for stack.
     \f
@@ -121,6 +134,8 @@ def list_outputs(ctx, path, export):
     :type path: str
     :param export: Specify the export formatting.
     :type export: str
+    :param snapshot: A path to write an outputs snapshot to.
+    :type snapshot: str
     """
     context = SceptreContext(
         command_path=path,
@@ -133,11 +148,36 @@ def list_outputs(ctx, path, export):
     )
 
     plan = SceptrePlan(context)
+    if snapshot:
+        write_outputs_snapshot(plan, snapshot)
     responses = [response for response in plan.describe_outputs().values() if response]
 
     write_outputs(export, responses, plan, context)
 
 
+def write_outputs_snapshot(plan, path):
+    """
+    Writes every stack, with its outputs and tags, in the accounts and regions of the plan's
+    stacks to an outputs snapshot. Each account and region is listed once, through the shared
+    export catalogs, which the plan's own outputs are then read from.
+    """
+    regions = {}
+    for stack in plan.graph:
+        account = account_key(stack.profile, stack.sceptre_role)
+        regions.setdefault((account, stack.region), stack)
+
+    catalogs = []
+    for (account, region), stack in regions.items():
+        catalog = export_catalogs.get(
+            account,
+            region,
+            lambda stack=stack: describe_all_stacks(stack.connection_manager),
+            lambda name, stack=stack: describe_stack(stack.connection_manager, name),
+        )
+        catalogs.append((account, region, catalog.stacks()))
+    OutputsSnapshot.from_catalogs(catalogs).write(path)
+
+
 @list_group.command(name="change-sets")
 @click.option("-U", "--url", is_flag=True, help="Instead write a URL.")
 @click.argument("path")
@@ -12,7 +12,6 @@ import copy
 import datetime
 import fnmatch
 import logging
-import sys
 import yaml
 import json
 
@@ -34,6 +33,7 @@ from sceptre.exceptions import InvalidSceptreDirectoryError
 from sceptre.exceptions import VersionIncompatibleError
 from sceptre.exceptions import ConfigFileNotFoundError
 from sceptre.helpers import sceptreise_path, logging_level, write_debug_file
+from sceptre.plugins import HOOKS, RESOLVERS, plugin_registry
 from sceptre.stack import Stack
 from sceptre.config import strategies
 
@@ -150,27 +150,12 @@ class ConfigReader(object):
         self._check_valid_project_path(self.full_config_path)
 
         # Add Resolver and Hook classes to PyYAML loader
-        self._add_yaml_constructors(["sceptre.hooks", "sceptre.resolvers"])
+        self._add_yaml_constructors([HOOKS, RESOLVERS])
         if not self.context.user_variables:
             self.context.user_variables = {}
 
         self.templating_vars = {"var": self.context.user_variables}
 
-    @staticmethod
-    def _iterate_entry_points(group):
-        """
-        Helper to determine whether to use pkg_resources or importlib.metadata.
-        https://docs.python.org/3/library/importlib.metadata.html
-        """
-        if sys.version_info < (3, 10):
-            from pkg_resources import iter_entry_points
-
-            return iter_entry_points(group)
-        else:
-            from importlib.metadata import entry_points
-
-            return entry_points(group=group)
-
     def _add_yaml_constructors(self, entry_point_groups):
         """
         Adds PyYAML constructor functions for all classes found registered at
@@ -206,10 +191,8 @@ class ConfigReader(object):
             return class_constructor
 
         for group in entry_point_groups:
-            for entry_point in self._iterate_entry_points(group):
-                # Retrieve name and class from entry point
-                node_tag = "!" + entry_point.name
-                node_class = entry_point.load()
+            for name, node_class in plugin_registry.load_group(group).items():
+                node_tag = "!" + name
 
                 # Add constructor to PyYAML loader
                 yaml.SafeLoader.add_constructor(
@@ -6,23 +6,30 @@ This module implements a ConnectionManager class, which simplifies and manages
 Boto3 calls.
 """
 
+import copy
 import functools
+import inspect
+import json
 import logging
 import os
 import random
 import threading
 import time
 import warnings
-from typing import Optional, Dict, Tuple, Any
+from typing import Optional, Dict, Tuple, Any, TYPE_CHECKING
 
-import boto3
 import deprecation
-from botocore.credentials import Credentials
 from botocore.exceptions import ClientError
 
+from sceptre.api_metrics import api_call_collector
 from sceptre.exceptions import InvalidAWSCredentialsError, RetryLimitExceededError
 from sceptre.helpers import mask_key, create_deprecated_alias_property
 
+if TYPE_CHECKING:
+    # boto3 is expensive to import, so it is only imported once a session is first needed.
+    import boto3
+    from botocore.credentials import Credentials
+
 
 def _retry_boto_call(func):
     """
@@ -55,6 +62,7 @@ def _retry_boto_call(func):
             except ClientError as e:
                 if e.response["Error"]["Code"] == "Throttling":
                     logger.error("Request limit exceeded, pausing {}...".format(mdelay))
+                    api_call_collector.record_throttle(mdelay)
                     time.sleep(mdelay)
 
                     # Using De-correlated Jitter Algorithm
@@ -72,6 +80,52 @@ def _retry_boto_call(func):
     return decorated
 
 
+def _record_api_call(func):
+    """
+    Records a ConnectionManager call, including all of its retries, with the api_call_collector.
+    Nothing is recorded (and the arguments aren't even inspected) unless the collector is enabled.
+
+    :param func: The ConnectionManager.call method.
+    :type func: function
+    :returns: The decorated function.
+    :rtype: function
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def decorated(self, *args, **kwargs):
+        if not api_call_collector.enabled:
+            return func(self, *args, **kwargs)
+
+        arguments = signature.bind(self, *args, **kwargs).arguments
+        with api_call_collector.record(
+            arguments["service"], arguments["command"], self.stack_name
+        ):
+            return func(self, *args, **kwargs)
+
+    return decorated
+
+
+class _InFlightCall(object):
+    """
+    A single AWS request shared by every caller that issues an identical
+    coalescible command while it is in flight (or still fresh, when a TTL is
+    configured).
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+        self.completed_at = None
+        self.followers = 0
+
+    def is_stale(self, ttl: float) -> bool:
+        return self.completed_at is not None and (
+            self.error is not None or time.monotonic() - self.completed_at > ttl
+        )
+
+
 class ConnectionManager(object):
     """
     The Connection Manager is used to create boto3 clients for
@@ -94,6 +148,35 @@ class ConnectionManager(object):
     _clients = {}
     _stack_keys = {}
 
+    # The session class used when none is passed, in place of boto3.Session; see
+    # sceptre.offline_backend for a stand-in that doesn't call AWS.
+    default_session_class = None
+
+    # Read-only commands that can be safely coalesced: concurrent identical calls (same service,
+    # command, kwargs and credentials) share a single in-flight request and its response.
+    COALESCIBLE_COMMANDS = frozenset(
+        [
+            ("cloudformation", "describe_stacks"),
+            ("cloudformation", "describe_stack_resources"),
+            ("cloudformation", "get_template"),
+            ("cloudformation", "get_template_summary"),
+            ("cloudformation", "list_exports"),
+            ("s3", "get_bucket_location"),
+            ("s3", "list_buckets"),
+            ("iam", "list_groups"),
+            ("ssm", "get_parameter"),
+            ("ssm", "get_parameters"),
+            ("ec2", "describe_images"),
+            ("sts", "get_caller_identity"),
+        ]
+    )
+    # Coalescing is opt-in. When enabled, coalesce_ttl is the number of seconds a completed
+    # response may still be shared with later identical calls; 0 means "only while in flight".
+    coalesce_calls = False
+    coalesce_ttl = 0.0
+    _inflight_lock = threading.Lock()
+    _inflight_calls = {}
+
     iam_role = create_deprecated_alias_property(
         "iam_role", "sceptre_role", "4.0.0", "5.0.0"
     )
@@ -110,7 +193,7 @@ class ConnectionManager(object):
         sceptre_role: Optional[str] = None,
         sceptre_role_session_duration: Optional[int] = None,
         *,
-        session_class=boto3.Session,
+        session_class=None,
         get_envs_func=lambda: os.environ,
     ):
         self.logger = logging.getLogger(__name__)
@@ -124,6 +207,13 @@ class ConnectionManager(object):
         if stack_name:
             self._stack_keys[stack_name] = (region, profile, sceptre_role)
 
+        if session_class is None:
+            session_class = self.default_session_class
+        if session_class is None:
+            import boto3
+
+            session_class = boto3.Session
+
         self._session_class = session_class
         self._get_envs = get_envs_func
 
@@ -139,6 +229,16 @@ class ConnectionManager(object):
             )
         )
 
+    @classmethod
+    def clear_cache(cls):
+        """Discards every cached session, client and coalesced call."""
+        with cls._session_lock:
+            cls._boto_sessions.clear()
+        with cls._client_lock:
+            cls._clients.clear()
+        with cls._inflight_lock:
+            cls._inflight_calls.clear()
+
     def get_session(
         self,
         profile: Optional[str] = STACK_DEFAULT,
@@ -146,7 +246,7 @@ class ConnectionManager(object):
         sceptre_role: Optional[str] = STACK_DEFAULT,
         *,
         iam_role: Optional[str] = STACK_DEFAULT,
-    ) -> boto3.Session:
+    ) -> "boto3.Session":
         """
         Returns a boto3 session for the targeted profile, region, and sceptre_role.
 
@@ -242,7 +342,7 @@ class ConnectionManager(object):
         session = self.get_session(profile, region, sceptre_role)
         # Set aws environment variables specific to whatever AWS configuration has been set on the
         # stack's connection manager.
-        credentials: Credentials = session.get_credentials()
+        credentials: "Credentials" = session.get_credentials()
         envs = dict(**self._get_envs()) if include_system_envs else {}
 
         if include_system_envs:
@@ -275,7 +375,7 @@ class ConnectionManager(object):
         sceptre_role: Optional[str],
         *,
         iam_role: Optional[str] = None,
-    ) -> boto3.Session:
+    ) -> "boto3.Session":
         if iam_role is not None:
             self._emit_iam_role_deprecation_warning()
             sceptre_role = iam_role
@@ -376,47 +476,25 @@ class ConnectionManager(object):
 
             return self._clients[key]
 
-    @_retry_boto_call
-    def call(
+    def resolve_session_args(
         self,
-        service: str,
-        command: str,
-        kwargs: Dict[str, Any] = None,
         profile: Optional[str] = STACK_DEFAULT,
         region: Optional[str] = STACK_DEFAULT,
-        stack_name: Optional[str] = None,
         sceptre_role: Optional[str] = STACK_DEFAULT,
+        stack_name: Optional[str] = None,
         *,
         iam_role: Optional[str] = STACK_DEFAULT,
-    ):
+    ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
         """
-        Makes a thread-safe Boto3 client call.
-
-        Equivalent to ``boto3.client(<service>).<command>(**kwargs)``.
-
-        | Note regarding the profile, region, and sceptre_role parameters:
-        |    We will interpret each parameter individually this way:
-        |      * If the value passed is the STACK_DEFAULT constant, we'll assume it to mean we ought
-        |        to use the target stack's value of that parameter.
-        |      * If the value passed is None, we will interpret that as an explicit request to nullify
-        |        the target stack's setting. Note: While this is valid for profile and sceptre_role,
-        |        it will likely blow up if doing this for region, since AWS almost always requires that.
-        |      * Otherwise, any value that has been specified will override the target stack's
-        |        configuration, regardless of what has been passed for other parameters.
-        |      * In the case that `None` has been specified for all parameters, that will be
-        |        interpreted as using the target stack's values for all three, falling back to the
-        |        current stack.
+        Determines the profile, region and sceptre_role that call() will use for these arguments.
+        See call() for how each parameter is interpreted.
 
-        :param service: The Boto3 service to return a client for.
-        :param command: The Boto3 command to call.
-        :param kwargs: The keyword arguments to supply to <command>.
-        :param profile: The profile to use when invoking the command; Defaults to the stack's configuration
-        :param region: The region to use when invoking the command; Default's to the stack's configuration
+        :param profile: The profile to use; Defaults to the stack's configuration
+        :param region: The region to use; Defaults to the stack's configuration
+        :param sceptre_role: The IAM Role ARN to assume; Defaults to the stack's configuration.
         :param stack_name: The name of the stack whose configuration to use. Defaults to the current stack
-        :param sceptre_role: The IAM Role ARN to assume in order to invoke the command; Defaults to
-            the stack's configuration.
         :param iam_role: DEPRECATED. Use sceptre_role instead.
-        :returns: The response from the Boto3 call.
+        :returns: The profile, region and sceptre_role.
         """
         # If stack_name has been specified and we've already cached the region/profile/role
         # configured for that stack, the "defaults" we'll use will be those of that stack rather then
@@ -460,12 +538,120 @@ class ConnectionManager(object):
                 profile, region, sceptre_role, iam_role
             )
 
+        return profile, region, sceptre_role
+
+    @_record_api_call
+    @_retry_boto_call
+    def call(
+        self,
+        service: str,
+        command: str,
+        kwargs: Dict[str, Any] = None,
+        profile: Optional[str] = STACK_DEFAULT,
+        region: Optional[str] = STACK_DEFAULT,
+        stack_name: Optional[str] = None,
+        sceptre_role: Optional[str] = STACK_DEFAULT,
+        *,
+        iam_role: Optional[str] = STACK_DEFAULT,
+    ):
+        """
+        Makes a thread-safe Boto3 client call.
+
+        Equivalent to ``boto3.client(<service>).<command>(**kwargs)``.
+
+        | Note regarding the profile, region, and sceptre_role parameters:
+        |    We will interpret each parameter individually this way:
+        |      * If the value passed is the STACK_DEFAULT constant, we'll assume it to mean we ought
+        |        to use the target stack's value of that parameter.
+        |      * If the value passed is None, we will interpret that as an explicit request to nullify
+        |        the target stack's setting. Note: While this is valid for profile and sceptre_role,
+        |        it will likely blow up if doing this for region, since AWS almost always requires that.
+        |      * Otherwise, any value that has been specified will override the target stack's
+        |        configuration, regardless of what has been passed for other parameters.
+        |      * In the case that `None` has been specified for all parameters, that will be
+        |        interpreted as using the target stack's values for all three, falling back to the
+        |        current stack.
+
+        :param service: The Boto3 service to return a client for.
+        :param command: The Boto3 command to call.
+        :param kwargs: The keyword arguments to supply to <command>.
+        :param profile: The profile to use when invoking the command; Defaults to the stack's configuration
+        :param region: The region to use when invoking the command; Default's to the stack's configuration
+        :param stack_name: The name of the stack whose configuration to use. Defaults to the current stack
+        :param sceptre_role: The IAM Role ARN to assume in order to invoke the command; Defaults to
+            the stack's configuration.
+        :param iam_role: DEPRECATED. Use sceptre_role instead.
+        :returns: The response from the Boto3 call.
+        """
+        profile, region, sceptre_role = self.resolve_session_args(
+            profile, region, sceptre_role, stack_name, iam_role=iam_role
+        )
+
         if kwargs is None:  # pragma: no cover
             kwargs = {}
 
         client = self._get_client(service, region, profile, stack_name, sceptre_role)
+        if self.coalesce_calls and (service, command) in self.COALESCIBLE_COMMANDS:
+            key = (
+                service,
+                command,
+                region,
+                profile,
+                sceptre_role,
+                json.dumps(kwargs, sort_keys=True, default=str),
+            )
+            return self._coalesced_call(key, lambda: getattr(client, command)(**kwargs))
+
         return getattr(client, command)(**kwargs)
 
+    def _coalesced_call(self, key: tuple, make_call):
+        """
+        Makes the call with ``make_call``, unless an identical call is already in flight (or its
+        response is younger than ``coalesce_ttl``), in which case that call's response is shared.
+
+        Every caller that shares a response receives its own deep copy, so that no caller can
+        mutate another caller's response; the caller that actually makes the request only receives
+        the response itself when nobody shared it and it isn't kept for ``coalesce_ttl``. Errors
+        are raised in all callers and are never cached.
+
+        :param key: The key identifying identical calls.
+        :param make_call: A callable taking no arguments that makes the Boto3 call.
+        :returns: The response from the Boto3 call.
+        """
+        with self._inflight_lock:
+            in_flight = self._inflight_calls.get(key)
+            is_leader = in_flight is None or in_flight.is_stale(self.coalesce_ttl)
+            if is_leader:
+                in_flight = self._inflight_calls[key] = _InFlightCall()
+            else:
+                in_flight.followers += 1
+
+        if not is_leader:
+            self.logger.debug("Sharing in-flight %s call", key[1])
+            api_call_collector.record_coalesced()
+            in_flight.done.wait()
+            if in_flight.error is not None:
+                raise in_flight.error
+            return copy.deepcopy(in_flight.response)
+
+        try:
+            in_flight.response = make_call()
+        except Exception as e:
+            in_flight.error = e
+            raise
+        finally:
+            in_flight.completed_at = time.monotonic()
+            if in_flight.error is not None or not self.coalesce_ttl:
+                with self._inflight_lock:
+                    if self._inflight_calls.get(key) is in_flight:
+                        del self._inflight_calls[key]
+            in_flight.done.set()
+
+        # Without a TTL, the call was forgotten before it completed, so no more callers can share it.
+        with self._inflight_lock:
+            shared = bool(self.coalesce_ttl or in_flight.followers)
+        return copy.deepcopy(in_flight.response) if shared else in_flight.response
+
     def _coalesce_sceptre_role(self, iam_role: str, sceptre_role: str) -> str:
         """Evaluates the iam_role and sceptre_role parameters as passed to determine which value to
         use.
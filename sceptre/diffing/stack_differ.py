@@ -11,10 +11,9 @@ from typing import (
     Generic,
     TypeVar,
     Union,
+    TYPE_CHECKING,
 )
 
-import cfn_flip
-import deepdiff
 import yaml
 from cfn_tools import ODict
 from yaml import Dumper
@@ -25,6 +24,10 @@ from sceptre.stack import Stack
 
 from botocore.exceptions import ClientError
 
+if TYPE_CHECKING:
+    # deepdiff and cfn_flip are expensive to import, so they are only imported once a diff is made.
+    import deepdiff
+
 DiffType = TypeVar("DiffType")
 
 logger = logging.getLogger(__name__)
@@ -86,6 +89,17 @@ yaml.add_representer(str, repr_str)
 yaml.add_representer(ODict, repr_odict)
 
 
+def load_template(template: str) -> Tuple[dict, str]:
+    """Loads a json or yaml template string with cfn-flip.
+
+    :param template: The template string to load
+    :return: A tuple of the loaded template and its format (either "json" or "yaml")
+    """
+    import cfn_flip
+
+    return cfn_flip.load(template)
+
+
 class StackDiffer(Generic[DiffType]):
     """A utility for producing a StackDiff that indicates the full difference between a given stack
     as it is currently DEPLOYED on CloudFormation and the stack as it exists in the local Sceptre
@@ -359,7 +373,7 @@ class StackDiffer(Generic[DiffType]):
         """
 
 
-class DeepDiffStackDiffer(StackDiffer[deepdiff.DeepDiff]):
+class DeepDiffStackDiffer(StackDiffer["deepdiff.DeepDiff"]):
     """A StackDiffer that relies upon the DeepDiff library to produce the difference between the
     stack as it has been deployed onto CloudFormation and as it exists locally within Sceptre.
 
@@ -375,7 +389,7 @@ class DeepDiffStackDiffer(StackDiffer[deepdiff.DeepDiff]):
         self,
         show_no_echo=False,
         *,
-        universal_template_loader: Callable[[str], Tuple[dict, str]] = cfn_flip.load,
+        universal_template_loader: Callable[[str], Tuple[dict, str]] = load_template,
     ):
         """Initializes a DeepDiffStackDiffer.
 
@@ -392,14 +406,18 @@ class DeepDiffStackDiffer(StackDiffer[deepdiff.DeepDiff]):
         self,
         deployed: Optional[StackConfiguration],
         generated: StackConfiguration,
-    ) -> deepdiff.DeepDiff:
+    ) -> "deepdiff.DeepDiff":
+        import deepdiff
+
         return deepdiff.DeepDiff(
             deployed,
             generated,
             verbose_level=self.VERBOSITY_LEVEL_TO_INDICATE_CHANGED_VALUES,
         )
 
-    def compare_templates(self, deployed: str, generated: str) -> deepdiff.DeepDiff:
+    def compare_templates(self, deployed: str, generated: str) -> "deepdiff.DeepDiff":
+        import deepdiff
+
         # We don't actually care about the original formats here, since we only care about the
         # template VALUES.
         deployed_dict, _ = self.load_template(deployed)
@@ -423,7 +441,7 @@ class DifflibStackDiffer(StackDiffer[List[str]]):
         self,
         show_no_echo=False,
         *,
-        universal_template_loader: Callable[[str], Tuple[dict, str]] = cfn_flip.load,
+        universal_template_loader: Callable[[str], Tuple[dict, str]] = load_template,
     ):
         """Initializes a DifflibStackDiffer.
 
@@ -441,6 +459,8 @@ class DifflibStackDiffer(StackDiffer[List[str]]):
         deployed: Optional[StackConfiguration],
         generated: StackConfiguration,
     ) -> List[str]:
+        import cfn_flip
+
         if deployed is None:
             comparable_deployed = None
         else:
@@ -468,6 +488,8 @@ class DifflibStackDiffer(StackDiffer[List[str]]):
         deployed: str,
         generated: str,
     ) -> List[str]:
+        import cfn_flip
+
         # Sometimes there might only be simple whitespace differences... which difflib will show but
         # are actually insignificant and "false positives". Also, it's POSSIBLE that the template
         # format might have changed, even if all the VALUES have stayed the same, so we'll read both
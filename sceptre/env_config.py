@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.env_config
+
+This module implements a process-wide store of environment configs, i.e. the
+``config/<env_name>/config.yaml`` files that resolvers referring to other environments read, so
+that each file is only parsed again when it changes.
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import yaml
+
+from sceptre.context import SceptreContext
+
+
+class _Entry(object):
+    def __init__(self, stamp: Tuple[int, int], config: dict):
+        self.stamp = stamp
+        self.config = config
+        self.derived: Dict[str, Any] = {}
+
+
+class EnvConfigStore(object):
+    """
+    A thread-safe store of environment configs, keyed by environment name and project path. A
+    config is parsed again when its file's modification time or size changes.
+
+    Values derived from a config (e.g. clients built from its profile and region) can be memoised
+    alongside it with ``derived``, and are forgotten when the config changes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.RLock] = {}
+        self._config_dirs: Dict[str, str] = {}
+        self._entries: Dict[str, _Entry] = {}
+        self.loads = 0
+        self.hits = 0
+
+    def config_path(self, env_name: str, project_path: Optional[str] = None) -> str:
+        """
+        Returns the path of an environment's config file.
+
+        :param env_name: The name of the environment.
+        :param project_path: The sceptre project path. Defaults to $SCEPTRE_ROOT.
+        :returns: The path of the environment's config.yaml.
+        """
+        project_path = project_path or os.environ["SCEPTRE_ROOT"]
+        config_dir = self._config_dirs.get(project_path)
+        if config_dir is None:
+            context = SceptreContext(
+                command_path=project_path, project_path=project_path
+            )
+            config_dir = self._config_dirs[project_path] = context.full_config_path()
+        return os.path.join(config_dir, env_name, "config.yaml")
+
+    def get(self, env_name: str, project_path: Optional[str] = None) -> dict:
+        """
+        Returns an environment's config. The returned config is shared and must not be modified.
+
+        :param env_name: The name of the environment.
+        :param project_path: The sceptre project path. Defaults to $SCEPTRE_ROOT.
+        :returns: The parsed config.yaml of the environment.
+        """
+        return self._entry(self.config_path(env_name, project_path)).config
+
+    def derived(
+        self,
+        env_name: str,
+        name: str,
+        build: Callable[[dict], Any],
+        project_path: Optional[str] = None,
+    ) -> Any:
+        """
+        Returns a value derived from an environment's config, building it with ``build`` unless it
+        was built since the config last changed.
+
+        :param env_name: The name of the environment.
+        :param name: Identifies the derived value.
+        :param build: Builds the value from the environment's config.
+        :param project_path: The sceptre project path. Defaults to $SCEPTRE_ROOT.
+        :returns: The derived value.
+        """
+        path = self.config_path(env_name, project_path)
+        entry = self._entry(path)
+        with self._load_lock(path):
+            if name not in entry.derived:
+                entry.derived[name] = build(entry.config)
+            return entry.derived[name]
+
+    def clear(self):
+        """Forgets all stored configs."""
+        with self._lock:
+            self._entries.clear()
+            self.loads = self.hits = 0
+
+    def _load_lock(self, path: str) -> threading.RLock:
+        # Reentrant, so that building a derived value may read the same config.
+        with self._lock:
+            return self._load_locks.setdefault(path, threading.RLock())
+
+    def _entry(self, path: str) -> _Entry:
+        stat = os.stat(path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.stamp == stamp:
+                self.hits += 1
+                return entry
+
+        # Only one thread parses a given file at a time; the others then find it stored.
+        with self._load_lock(path):
+            with self._lock:
+                entry = self._entries.get(path)
+                if entry is not None and entry.stamp == stamp:
+                    self.hits += 1
+                    return entry
+            with open(path, "r") as fhandle:
+                config = yaml.load(fhandle.read(), Loader=yaml.FullLoader)
+            entry = _Entry(stamp, config)
+            with self._lock:
+                self._entries[path] = entry
+                self.loads += 1
+            return entry
+
+
+env_config_store = EnvConfigStore()
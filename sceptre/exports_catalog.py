@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.exports_catalog
+
+This module implements a process-wide catalog of the CloudFormation stacks in each account and
+region, with their outputs, tags and exports. A catalog is built once, by paging through
+describe_stacks, and then answers lookups and regex filters over every stack in memory. Building
+one also fills the stack outputs cache, so the outputs of every stack it lists are never described
+again.
+"""
+
+import functools
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Pattern, Tuple
+
+from botocore.exceptions import ClientError
+
+from sceptre.outputs_cache import stack_outputs_cache
+
+CatalogKey = Tuple[Optional[str], Optional[str]]
+
+
+@functools.lru_cache(maxsize=256)
+def compile_pattern(pattern: str) -> Pattern:
+    """
+    Compiles a regex, remembering it so the same pattern is only compiled once.
+
+    :param pattern: The regex.
+    """
+    return re.compile(pattern)
+
+
+class ExportCatalog(object):
+    """
+    The stacks of an account and region, as listed by describe_stacks, indexed by stack name and
+    by export name.
+
+    :param stacks: The stacks, as listed by describe_stacks.
+    """
+
+    def __init__(self, stacks: List[dict]):
+        self._stacks: Dict[str, dict] = {}
+        self._exports: Dict[str, str] = {}
+        for stack in stacks:
+            self._stacks[stack["StackName"]] = stack
+            for output in stack.get("Outputs", []):
+                if output.get("ExportName"):
+                    self._exports[output["ExportName"]] = output["OutputValue"]
+
+    def __len__(self):
+        return len(self._stacks)
+
+    def stacks(self) -> List[dict]:
+        """Returns the stacks, as listed by describe_stacks, in the order they were listed."""
+        return list(self._stacks.values())
+
+    def stack_names(self) -> List[str]:
+        """Returns the names of the stacks, in the order describe_stacks listed them."""
+        return list(self._stacks)
+
+    def outputs(self, stack_name: str) -> Optional[List[dict]]:
+        """
+        Returns the outputs of a stack.
+
+        :param stack_name: The external name of the stack.
+        :returns: The stack's outputs, or None if there is no such stack.
+        """
+        stack = self._stacks.get(stack_name)
+        return None if stack is None else stack.get("Outputs", [])
+
+    def with_stack(self, stack_name: str, stack: Optional[dict]) -> "ExportCatalog":
+        """
+        Returns a copy of the catalog with a stack replaced, added or, if stack is None, removed.
+
+        :param stack_name: The external name of the stack.
+        :param stack: The stack, as described by describe_stacks, or None if it no longer exists.
+        """
+        stacks = dict(self._stacks)
+        if stack is None:
+            stacks.pop(stack_name, None)
+        else:
+            stacks[stack_name] = stack
+        return ExportCatalog(list(stacks.values()))
+
+    def export(self, export_name: str) -> Optional[str]:
+        """
+        Returns the value of an export.
+
+        :param export_name: The name of the export.
+        :returns: The exported value, or None if there is no such export.
+        """
+        return self._exports.get(export_name)
+
+    def filter_stacks(self, pattern: str, prefix: str = "", **filters) -> List[dict]:
+        """
+        Returns the stacks whose names start with ``prefix`` and whose names (less the prefix)
+        match ``pattern``, in the order describe_stacks listed them.
+
+        :param pattern: A regex searched for in the stack names, less the prefix.
+        :param prefix: Only stacks whose names start with this are returned.
+        :param filters: Further regexes, by the name of a stack tag or describe_stacks field, that
+            must be found in the tag or field's value.
+        """
+        regex = compile_pattern(pattern)
+        filter_regexes = [
+            (key, compile_pattern(value)) for key, value in filters.items()
+        ]
+        matches = []
+        for stack_name, stack in self._stacks.items():
+            if not stack_name.startswith(prefix):
+                continue
+            if not regex.search(stack_name[len(prefix) :]):
+                continue
+            if all(self._matches(stack, key, regex) for key, regex in filter_regexes):
+                matches.append(stack)
+        return matches
+
+    def filter_outputs(
+        self, stack_pattern: str, key_pattern: str, prefix: str = "", **filters
+    ) -> List[Dict[str, str]]:
+        """
+        Returns the exported outputs whose keys match ``key_pattern``, of each stack returned by
+        filter_stacks that has any. Outputs without an export name are left out.
+
+        :param stack_pattern: A regex searched for in the stack names, less the prefix.
+        :param key_pattern: A regex searched for in the output keys.
+        :param prefix: Only stacks whose names start with this are included.
+        :param filters: See filter_stacks.
+        :returns: A dict of output values by output key for each matching stack.
+        """
+        regex = compile_pattern(key_pattern)
+        matches = []
+        for stack in self.filter_stacks(stack_pattern, prefix, **filters):
+            outputs = {
+                output["OutputKey"]: output["OutputValue"]
+                for output in stack.get("Outputs", [])
+                if output.get("ExportName") and regex.search(output["OutputKey"])
+            }
+            if outputs:
+                matches.append(outputs)
+        return matches
+
+    @staticmethod
+    def _matches(stack: dict, key: str, regex: Pattern) -> bool:
+        for tag in stack.get("Tags", []):
+            if tag["Key"] == key:
+                return bool(regex.search(tag["Value"]))
+        value = stack.get(key)
+        return value is not None and bool(regex.search(str(value)))
+
+
+class _Entry(object):
+    def __init__(self):
+        self.loaded = threading.Event()
+        self.catalog = None
+        self.error = None
+        # The stacks changed since the catalog was built, described again when next needed
+        self.stale = set()
+        self.refresh_lock = threading.Lock()
+
+
+class ExportCatalogStore(object):
+    """
+    A thread-safe store of export catalogs by (account, region). Concurrent requests for the same
+    catalog share a single build, and failed builds are not kept.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[CatalogKey, _Entry] = {}
+        self.builds = 0
+
+    def get(
+        self,
+        account: Optional[str],
+        region: Optional[str],
+        list_stacks: Callable[[], List[dict]],
+        describe_stack: Optional[Callable[[str], Optional[dict]]] = None,
+    ) -> ExportCatalog:
+        """
+        Returns the catalog of an account and region, building it from ``list_stacks`` unless it
+        has already been built.
+
+        :param account: The account; see sceptre.outputs_cache.account_key.
+        :param region: The region.
+        :param list_stacks: Returns every stack in the account and region, as listed by
+            describe_stacks; see describe_all_stacks.
+        :param describe_stack: Returns one stack, as described by describe_stacks, or None if it
+            doesn't exist; see describe_stack. When given, only the stacks invalidated since the
+            catalog was built are described again, rather than the whole catalog being rebuilt.
+        """
+        key = (account, region)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.stale and describe_stack is None:
+                del self._entries[key]
+                entry = None
+            is_builder = entry is None
+            if is_builder:
+                entry = self._entries[key] = _Entry()
+
+        if not is_builder:
+            entry.loaded.wait()
+            if entry.error is not None:
+                raise entry.error
+            if entry.stale and describe_stack is None:
+                # Changed since the catalog was looked up: it is rebuilt
+                return self.get(account, region, list_stacks)
+            if entry.stale:
+                self._refresh(account, region, entry, describe_stack)
+            return entry.catalog
+
+        try:
+            catalog = ExportCatalog(list_stacks())
+            for stack_name in catalog.stack_names():
+                stack_outputs_cache.put(
+                    account, region, stack_name, catalog.outputs(stack_name)
+                )
+            entry.catalog = catalog
+            with self._lock:
+                self.builds += 1
+        except Exception as error:
+            entry.error = error
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            raise
+        finally:
+            entry.loaded.set()
+        if entry.stale and describe_stack is not None:
+            # Changed while the catalog was being built
+            self._refresh(account, region, entry, describe_stack)
+        return entry.catalog
+
+    def _refresh(
+        self,
+        account: Optional[str],
+        region: Optional[str],
+        entry: _Entry,
+        describe_stack: Callable[[str], Optional[dict]],
+    ):
+        with entry.refresh_lock:
+            with self._lock:
+                stale, entry.stale = entry.stale, set()
+            try:
+                catalog = entry.catalog
+                for stack_name in sorted(stale):
+                    stack = describe_stack(stack_name)
+                    catalog = catalog.with_stack(stack_name, stack)
+                    if stack is not None:
+                        stack_outputs_cache.put(
+                            account, region, stack_name, stack.get("Outputs", [])
+                        )
+            except Exception:
+                with self._lock:
+                    entry.stale.update(stale)
+                raise
+            # Readers of the catalog being replaced keep a consistent copy
+            entry.catalog = catalog
+
+    def contains(self, account: Optional[str], region: Optional[str]) -> bool:
+        """
+        Returns whether the catalog of an account and region is built or being built.
+
+        :param account: The account; see sceptre.outputs_cache.account_key.
+        :param region: The region.
+        """
+        with self._lock:
+            return (account, region) in self._entries
+
+    def invalidate(self, region: Optional[str] = None):
+        """
+        Forgets the catalogs that may list a stack that changed, so they are rebuilt when next
+        needed.
+
+        :param region: Only forget the catalogs of this region, if given.
+        """
+        with self._lock:
+            for key in list(self._entries):
+                if region in (None, key[1]):
+                    del self._entries[key]
+
+    def invalidate_stack(
+        self, account: Optional[str], region: Optional[str], stack_name: str
+    ):
+        """
+        Marks a stack that changed as stale in the catalog of its account and region, so that it
+        alone is described again when the catalog is next needed. Other accounts' catalogs are
+        left alone.
+
+        :param account: The account; see sceptre.outputs_cache.account_key.
+        :param region: The region.
+        :param stack_name: The external name of the stack.
+        """
+        with self._lock:
+            entry = self._entries.get((account, region))
+            if entry is not None:
+                entry.stale.add(stack_name)
+
+    def clear(self):
+        """Forgets all catalogs."""
+        with self._lock:
+            self._entries.clear()
+            self.builds = 0
+
+
+def describe_all_stacks(connection_manager, **call_kwargs) -> List[dict]:
+    """
+    Pages through describe_stacks for every stack.
+
+    :param connection_manager: The connection manager to call describe_stacks with.
+    :param call_kwargs: Passed to the connection manager's call, e.g. profile and region.
+    :returns: The stacks, as listed by describe_stacks.
+    """
+    stacks = []
+    kwargs = {}
+    while True:
+        response = connection_manager.call(
+            service="cloudformation",
+            command="describe_stacks",
+            kwargs=kwargs,
+            **call_kwargs,
+        )
+        stacks.extend(response.get("Stacks", []))
+        if not response.get("NextToken"):
+            return stacks
+        kwargs = {"NextToken": response["NextToken"]}
+
+
+def describe_stack(
+    connection_manager, stack_name: str, **call_kwargs
+) -> Optional[dict]:
+    """
+    Describes one stack.
+
+    :param connection_manager: The connection manager to call describe_stacks with.
+    :param stack_name: The external name of the stack.
+    :param call_kwargs: Passed to the connection manager's call, e.g. profile and region.
+    :returns: The stack, as described by describe_stacks, or None if it doesn't exist.
+    """
+    try:
+        response = connection_manager.call(
+            service="cloudformation",
+            command="describe_stacks",
+            kwargs={"StackName": stack_name},
+            **call_kwargs,
+        )
+    except ClientError as error:
+        if "does not exist" in error.response["Error"].get("Message", ""):
+            return None
+        raise
+    stacks = response.get("Stacks", [])
+    return stacks[0] if stacks else None
+
+
+export_catalogs = ExportCatalogStore()
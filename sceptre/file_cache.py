@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.file_cache
+
+This module implements a process-wide cache of the contents of text files, shared by the
+``!file_contents`` and ``!policy`` resolvers, so that a file inlined by many stacks is only read
+once. Contents are keyed by the file's absolute path, modification time and size, so a file that
+changes is read again.
+"""
+
+import locale
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+CacheKey = Tuple[str, int, int]
+
+# The most bytes of file contents kept, the least recently read files being evicted first.
+MAX_BYTES = 64 * 1024 * 1024
+# Files of at least this many bytes are memory mapped by the shared cache, when set.
+MMAP_THRESHOLD_ENV = "SCEPTRE_FILE_CACHE_MMAP_BYTES"
+
+
+class FileContentsCache(object):
+    """
+    A thread-safe, size-bounded cache of file contents keyed by (absolute path, mtime, size).
+
+    :param max_bytes: The most bytes of file contents kept. Files bigger than this are read every
+        time.
+    :param mmap_threshold: The size from which files are read through a memory map rather than
+        buffered reads, or None to never memory map files.
+    """
+
+    def __init__(
+        self, max_bytes: int = MAX_BYTES, mmap_threshold: Optional[int] = None
+    ):
+        self.max_bytes = max_bytes
+        self.mmap_threshold = mmap_threshold
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CacheKey, str]" = OrderedDict()
+        self._bytes = 0
+        self._stats = dict(hits=0, misses=0, evictions=0)
+
+    def read(self, path: str) -> str:
+        """
+        Returns the contents of a text file, as ``open(path).read()`` would. The file is only read
+        if it isn't cached, or has changed since it was.
+
+        :param path: The path of the file.
+        :raises: OSError if the file can't be read, or TypeError if path isn't a path.
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            contents = self._entries.get(key)
+            if contents is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return contents
+            self._stats["misses"] += 1
+
+        contents = self._read_file(path, stat.st_size)
+        if stat.st_size <= self.max_bytes:
+            with self._lock:
+                if key not in self._entries:
+                    self._entries[key] = contents
+                    self._bytes += stat.st_size
+                    self._evict()
+        return contents
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the cache's hits, misses and evictions, and the bytes of contents it holds."""
+        with self._lock:
+            return dict(self._stats, bytes=self._bytes, files=len(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            for name in self._stats:
+                self._stats[name] = 0
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            (_, _, size), _ = self._entries.popitem(last=False)
+            self._bytes -= size
+            self._stats["evictions"] += 1
+
+    def _read_file(self, path: str, size: int) -> str:
+        if self.mmap_threshold is None or size < max(self.mmap_threshold, 1):
+            with open(path, "r") as fhandle:
+                return fhandle.read()
+        with open(path, "rb") as fhandle:
+            with mmap.mmap(fhandle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                contents = str(mapped, locale.getpreferredencoding(False))
+        # Text mode reads translate newlines
+        return contents.replace("\r\n", "\n").replace("\r", "\n")
+
+
+file_contents_cache = FileContentsCache(
+    mmap_threshold=(
+        int(os.environ[MMAP_THRESHOLD_ENV])
+        if os.environ.get(MMAP_THRESHOLD_ENV)
+        else None
+    )
+)
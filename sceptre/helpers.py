@@ -5,7 +5,6 @@ from datetime import datetime
 from os import sep
 from typing import Optional, Any, List, Tuple, Union
 
-import dateutil.parser
 import deprecation
 import logging
 import tempfile
@@ -178,6 +177,9 @@ def extract_datetime_from_aws_response_headers(
     """
     if boto_response is None:
         return None
+
+    import dateutil.parser
+
     try:
         return dateutil.parser.parse(
             boto_response["ResponseMetadata"]["HTTPHeaders"]["date"]
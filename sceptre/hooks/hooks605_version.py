@@ -17,6 +17,8 @@ import sys
 from typing import Callable, Dict
 import functools
 
+from sceptre.vcs_metadata import git_metadata
+
 
 def get_keywords():
     """Get the keywords needed to look up the version information."""
@@ -245,6 +247,18 @@ def git_versions_from_keywords(keywords, tag_prefix, verbose):
     }
 
 
+def _git_metadata_or_run(metadata, name, runner, commands, args, root, **kwargs):
+    """Read a value from the git metadata cache, else run git for it.
+
+    Returns the value and git's return code (0 when the value was cached),
+    as the runner does.
+    """
+    value = getattr(metadata, name)(root) if metadata is not None else None
+    if value is not None:
+        return value, 0
+    return runner(commands, args, cwd=root, **kwargs)
+
+
 @register_vcs_handler("git", "pieces_from_vcs")
 def git_pieces_from_vcs(tag_prefix, root, verbose, runner=run_command):
     """Get version from 'git describe' in the root of the source tree.
@@ -262,10 +276,16 @@ def git_pieces_from_vcs(tag_prefix, root, verbose, runner=run_command):
     # but that should not change where we get our version from.
     env = os.environ.copy()
     env.pop("GIT_DIR", None)
+    # unless a runner is injected, HEAD and the branch come from the
+    # process-wide metadata cache that !project_metadata also uses
+    use_git_metadata = runner is run_command
     runner = functools.partial(runner, env=env)
 
-    _, rc = runner(GITS, ["rev-parse", "--git-dir"],
-                   cwd=root, hide_stderr=True)
+    metadata = git_metadata if use_git_metadata else None
+
+    _, rc = _git_metadata_or_run(metadata, "head", runner, GITS,
+                                 ["rev-parse", "--git-dir"], root,
+                                 hide_stderr=True)
     if rc != 0:
         if verbose:
             print("Directory %s not under git control" % root)
@@ -284,7 +304,8 @@ def git_pieces_from_vcs(tag_prefix, root, verbose, runner=run_command):
     if describe_out is None:
         raise NotThisMethod("'git describe' failed")
     describe_out = describe_out.strip()
-    full_out, rc = runner(GITS, ["rev-parse", "HEAD"], cwd=root)
+    full_out, rc = _git_metadata_or_run(metadata, "head", runner, GITS,
+                                        ["rev-parse", "HEAD"], root)
     if full_out is None:
         raise NotThisMethod("'git rev-parse' failed")
     full_out = full_out.strip()
@@ -294,8 +315,9 @@ def git_pieces_from_vcs(tag_prefix, root, verbose, runner=run_command):
     pieces["short"] = full_out[:7]  # maybe improved later
     pieces["error"] = None
 
-    branch_name, rc = runner(
-        GITS, ["rev-parse", "--abbrev-ref", "HEAD"], cwd=root)
+    branch_name, rc = _git_metadata_or_run(
+        metadata, "branch", runner, GITS,
+        ["rev-parse", "--abbrev-ref", "HEAD"], root)
     # --abbrev-ref was added in git-1.6.3
     if rc != 0 or branch_name is None:
         raise NotThisMethod("'git rev-parse --abbrev-ref' returned error")
@@ -0,0 +1,1162 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.offline_backend
+
+This module implements an offline stand-in for the AWS APIs Sceptre uses. It models
+CloudFormation stacks, change sets and exports, S3 buckets and objects, SSM parameters and STS
+identities in memory, so that whole plans can be run without AWS, for example to benchmark the
+executor, the status poller or resolvers in CI.
+
+Calls can be slowed down by a configurable latency, fail with injected throttling errors and
+stack operations can take a configurable amount of time to complete.
+
+The backend is selected with ``sceptre --connection-backend offline`` (or the
+SCEPTRE_CONNECTION_BACKEND environment variable) and configured with a YAML file passed with
+``--offline-config`` (or SCEPTRE_OFFLINE_CONFIG)::
+
+    account_id: "123456789012"
+    latency: 0.05              # seconds added to every call
+    latency_jitter: 0.02       # up to this many more seconds, at random
+    command_latency:           # overrides latency for specific commands
+      cloudformation.describe_stacks: 0.2
+    throttle_rate: 0.01        # chance of any call failing with a Throttling error
+    operation_durations:       # seconds each stack operation takes to complete
+      create: 30
+      update: 20
+      delete: 10
+      change_set: 2
+    seed: 1                    # seeds latency jitter and throttling, for repeatable runs
+    stacks:                    # stacks that already exist, e.g. ones outside the project
+      - StackName: shared-vpc
+        Region: eu-west-1
+        Outputs:
+          VpcId: vpc-0123456789
+        Exports:
+          shared-vpc-VpcId: vpc-0123456789
+    parameters:                # SSM parameters
+      /shared/db/password: secret
+    buckets:
+      my-template-bucket:
+        region: eu-west-1
+        tags:
+          owner: platform
+"""
+
+import copy
+import email.utils
+import hashlib
+import io
+import logging
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+import yaml
+from botocore.exceptions import ClientError
+
+DEFAULT_ACCOUNT_ID = "123456789012"
+DEFAULT_REGION = "us-east-1"
+
+STACKS_PAGE_SIZE = 100
+EXPORTS_PAGE_SIZE = 100
+PARAMETERS_PAGE_SIZE = 10
+
+NO_CHANGES_REASON = (
+    "The submitted information didn't contain changes. "
+    "Submit different information to create a change set."
+)
+
+
+class OfflineBackendConfig(object):
+    """
+    The behaviour of the offline backend and the resources that already exist in it.
+
+    :param account_id: The AWS account the backend stands in for.
+    :param latency: The number of seconds added to every call.
+    :param latency_jitter: The maximum number of seconds added to a call on top of its latency.
+    :param command_latency: Latencies for specific commands, keyed by "service.command".
+    :param throttle_rate: The chance (between 0 and 1) of any call failing with a Throttling error.
+    :param operation_durations: The seconds each of the "create", "update", "delete" and
+        "change_set" operations take to complete.
+    :param seed: Seeds latency jitter and throttling, for repeatable runs.
+    :param stacks: Stacks that already exist when the backend starts.
+    :param parameters: SSM parameters that already exist, keyed by name.
+    :param buckets: S3 buckets that already exist, keyed by name, with their region and tags.
+    """
+
+    def __init__(
+        self,
+        account_id: str = DEFAULT_ACCOUNT_ID,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        command_latency: Optional[Dict[str, float]] = None,
+        throttle_rate: float = 0.0,
+        operation_durations: Optional[Dict[str, float]] = None,
+        seed: Optional[int] = None,
+        stacks: Optional[List[dict]] = None,
+        parameters: Optional[Dict[str, str]] = None,
+        buckets: Optional[Dict[str, dict]] = None,
+    ):
+        self.account_id = str(account_id)
+        self.latency = float(latency)
+        self.latency_jitter = float(latency_jitter)
+        self.command_latency = dict(command_latency or {})
+        self.throttle_rate = float(throttle_rate)
+        self.operation_durations = {
+            "create": 0.0,
+            "update": 0.0,
+            "delete": 0.0,
+            "change_set": 0.0,
+        }
+        self.operation_durations.update(operation_durations or {})
+        self.seed = seed
+        self.stacks = list(stacks or [])
+        self.parameters = dict(parameters or {})
+        self.buckets = dict(buckets or {})
+
+    @classmethod
+    def from_file(cls, path: str) -> "OfflineBackendConfig":
+        """
+        Reads the configuration from a YAML file.
+
+        :param path: The path of the file.
+        :returns: The configuration.
+        """
+        with open(path) as config_file:
+            return cls(**(yaml.safe_load(config_file) or {}))
+
+
+def _client_error(operation: str, code: str, message: str) -> ClientError:
+    operation_name = "".join(part.capitalize() for part in operation.split("_"))
+    return ClientError({"Error": {"Code": code, "Message": message}}, operation_name)
+
+
+def _response(body: Optional[dict] = None) -> dict:
+    response = dict(body or {})
+    response["ResponseMetadata"] = {
+        "RequestId": str(uuid.uuid4()),
+        "HTTPStatusCode": 200,
+        "HTTPHeaders": {"date": email.utils.formatdate(usegmt=True)},
+        "RetryAttempts": 0,
+    }
+    return response
+
+
+def _paginate(items: list, kwargs: dict, page_size: int, items_key: str) -> dict:
+    start = int(kwargs.get("NextToken") or 0)
+    page_size = min(int(kwargs.get("MaxResults") or page_size), page_size)
+    body = {items_key: items[start : start + page_size]}
+    if start + page_size < len(items):
+        body["NextToken"] = str(start + page_size)
+    return body
+
+
+def _timestamp(epoch: float) -> datetime:
+    return datetime.fromtimestamp(epoch, timezone.utc)
+
+
+class _OfflineStack(object):
+    """The state of a single CloudFormation stack."""
+
+    def __init__(self, name: str, region: str, account_id: str, created_at: float):
+        self.name = name
+        self.region = region
+        self.stack_id = "arn:aws:cloudformation:{0}:{1}:stack/{2}/{3}".format(
+            region, account_id, name, uuid.uuid4()
+        )
+        self.status = "REVIEW_IN_PROGRESS"
+        self.status_reason = None
+        self.created_at = created_at
+        self.updated_at = None
+        self.template_body = ""
+        self.template = {}
+        self.parameters = []
+        self.tags = []
+        self.capabilities = []
+        self.role_arn = None
+        self.notification_arns = []
+        self.policy_body = None
+        self.outputs = []
+        self.events = []
+        self.change_sets = {}
+        # While an operation is in progress: (status on completion, completion time)
+        self.pending = None
+
+    def describe(self) -> dict:
+        description = {
+            "StackId": self.stack_id,
+            "StackName": self.name,
+            "Parameters": copy.deepcopy(self.parameters),
+            "CreationTime": _timestamp(self.created_at),
+            "StackStatus": self.status,
+            "DisableRollback": False,
+            "NotificationARNs": list(self.notification_arns),
+            "Capabilities": list(self.capabilities),
+            "Outputs": copy.deepcopy(self.outputs),
+            "Tags": copy.deepcopy(self.tags),
+            "EnableTerminationProtection": False,
+            "DriftInformation": {"StackDriftStatus": "NOT_CHECKED"},
+        }
+        if self.updated_at is not None:
+            description["LastUpdatedTime"] = _timestamp(self.updated_at)
+        if self.status_reason:
+            description["StackStatusReason"] = self.status_reason
+        if self.role_arn:
+            description["RoleARN"] = self.role_arn
+        if "Description" in self.template:
+            description["Description"] = self.template["Description"]
+        return description
+
+
+class OfflineBackend(object):
+    """
+    The in-memory state shared by every offline session and client, and the implementation of
+    the commands they support. All state is guarded by a single lock, which is never held while
+    a call is being delayed.
+
+    :param config: The backend's configuration.
+    :param clock: Returns the current time, in seconds since the epoch.
+    :param sleep: Sleeps for the given number of seconds; used to simulate latency.
+    """
+
+    def __init__(
+        self,
+        config: Optional[OfflineBackendConfig] = None,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.config = config or OfflineBackendConfig()
+        self.clock = clock
+        self.sleep = sleep
+        self.calls = 0
+        self._lock = threading.RLock()
+        self._random = random.Random(self.config.seed)
+        self._stacks: Dict[str, Dict[str, _OfflineStack]] = {}
+        self._buckets: Dict[str, dict] = {}
+        self._parameters: Dict[str, dict] = {}
+
+        for stack in self.config.stacks:
+            self._seed_stack(stack)
+        for bucket_name, bucket in self.config.buckets.items():
+            bucket = bucket or {}
+            self._buckets[bucket_name] = {
+                "region": bucket.get("region", DEFAULT_REGION),
+                "tags": dict(bucket.get("tags") or {}),
+                "objects": {},
+                "created_at": self.clock(),
+            }
+        for name, value in self.config.parameters.items():
+            self._put_parameter(name, value, "SecureString")
+
+    def session(self, **kwargs) -> "OfflineSession":
+        """Creates a session with the arguments boto3.Session takes."""
+        return OfflineSession(self, **kwargs)
+
+    def call(self, service: str, command: str, region: str, kwargs: dict) -> dict:
+        """
+        Makes a call against the offline state, after any configured latency, and possibly
+        failing with a Throttling error.
+
+        :param service: The AWS service called.
+        :param command: The Boto3 command called.
+        :param region: The region the call is made in.
+        :param kwargs: The keyword arguments of the call.
+        :returns: A response shaped like Boto3's.
+        :raises: botocore.exceptions.ClientError
+        """
+        handler = getattr(self, "_{0}_{1}".format(service, command), None)
+        if handler is None:
+            raise NotImplementedError(
+                "The offline backend does not support {0}.{1}".format(service, command)
+            )
+
+        with self._lock:
+            self.calls += 1
+            latency = self.config.command_latency.get(
+                "{0}.{1}".format(service, command), self.config.latency
+            )
+            if self.config.latency_jitter:
+                latency += self._random.uniform(0, self.config.latency_jitter)
+            throttled = self._random.random() < self.config.throttle_rate
+
+        if latency > 0:
+            self.sleep(latency)
+        if throttled:
+            raise _client_error(command, "Throttling", "Rate exceeded")
+
+        with self._lock:
+            return _response(handler(region, **copy.deepcopy(kwargs)))
+
+    # Stack state
+
+    def _seed_stack(self, seed: dict):
+        region = seed.get("Region", DEFAULT_REGION)
+        stack = _OfflineStack(
+            seed["StackName"], region, self.config.account_id, self.clock()
+        )
+        stack.status = seed.get("StackStatus", "CREATE_COMPLETE")
+        stack.parameters = [
+            {"ParameterKey": key, "ParameterValue": str(value)}
+            for key, value in (seed.get("Parameters") or {}).items()
+        ]
+        stack.outputs = [
+            {"OutputKey": key, "OutputValue": str(value)}
+            for key, value in (seed.get("Outputs") or {}).items()
+        ]
+        for export_name, value in (seed.get("Exports") or {}).items():
+            output = next(
+                (
+                    output
+                    for output in stack.outputs
+                    if output["OutputValue"] == str(value)
+                    and "ExportName" not in output
+                ),
+                None,
+            )
+            if output is None:
+                output = {"OutputKey": export_name, "OutputValue": str(value)}
+                stack.outputs.append(output)
+            output["ExportName"] = export_name
+        self._stacks.setdefault(region, {})[stack.name] = stack
+
+    def _settle(self, stack: _OfflineStack):
+        """Completes the stack's operation and its change sets, if their time has come."""
+        now = self.clock()
+        if stack.pending is not None and now >= stack.pending[1]:
+            final_status, completed_at = stack.pending
+            stack.pending = None
+            stack.status = final_status
+            self._add_event(stack, final_status, completed_at)
+            if final_status == "DELETE_COMPLETE":
+                del self._stacks[stack.region][stack.name]
+        for change_set in stack.change_sets.values():
+            if (
+                change_set["Status"] == "CREATE_PENDING"
+                and now >= change_set["_ready_at"]
+            ):
+                change_set["Status"] = change_set.pop("_final_status")
+                change_set["ExecutionStatus"] = change_set.pop(
+                    "_final_execution_status"
+                )
+
+    def _region_stacks(self, region: str) -> Dict[str, _OfflineStack]:
+        stacks = self._stacks.setdefault(region, {})
+        for stack in list(stacks.values()):
+            self._settle(stack)
+        return stacks
+
+    def _find_stack(self, region: str, name: str) -> Optional[_OfflineStack]:
+        stacks = self._region_stacks(region)
+        if name in stacks:
+            return stacks[name]
+        for stack in stacks.values():
+            if stack.stack_id == name:
+                return stack
+        return None
+
+    def _get_stack(self, region: str, name: str, operation: str) -> _OfflineStack:
+        stack = self._find_stack(region, name)
+        if stack is None:
+            raise _client_error(
+                operation,
+                "ValidationError",
+                "Stack with id {0} does not exist".format(name),
+            )
+        return stack
+
+    def _add_event(self, stack: _OfflineStack, status: str, at: float, reason=None):
+        event = {
+            "StackId": stack.stack_id,
+            "EventId": str(uuid.uuid4()),
+            "StackName": stack.name,
+            "LogicalResourceId": stack.name,
+            "PhysicalResourceId": stack.stack_id,
+            "ResourceType": "AWS::CloudFormation::Stack",
+            "Timestamp": _timestamp(at),
+            "ResourceStatus": status,
+        }
+        if reason:
+            event["ResourceStatusReason"] = reason
+        stack.events.append(event)
+
+    def _start_operation(self, stack: _OfflineStack, operation: str):
+        now = self.clock()
+        stack.status = "{0}_IN_PROGRESS".format(operation.upper())
+        stack.status_reason = None
+        self._add_event(stack, stack.status, now, "User Initiated")
+        duration = float(self.config.operation_durations.get(operation, 0))
+        stack.pending = ("{0}_COMPLETE".format(operation.upper()), now + duration)
+        self._settle(stack)
+
+    def _template_from_kwargs(self, kwargs: dict, operation: str) -> str:
+        if "TemplateBody" in kwargs:
+            return kwargs["TemplateBody"]
+        if "TemplateURL" in kwargs:
+            return self._read_template_url(kwargs["TemplateURL"], operation)
+        raise _client_error(
+            operation,
+            "ValidationError",
+            "Either Template URL or Template Body must be specified.",
+        )
+
+    def _read_template_url(self, url: str, operation: str) -> str:
+        parsed = urlparse(url)
+        host_bucket = parsed.netloc.split(".s3", 1)[0]
+        key = parsed.path.lstrip("/")
+        candidates = [(host_bucket, key)]
+        if "/" in key:
+            candidates.append(tuple(key.split("/", 1)))
+        for bucket_name, object_key in candidates:
+            bucket = self._buckets.get(bucket_name)
+            if bucket is not None and object_key in bucket["objects"]:
+                return bucket["objects"][object_key]["Body"].decode("utf-8")
+        raise _client_error(
+            operation,
+            "ValidationError",
+            "S3 error: Access Denied for template URL {0}".format(url),
+        )
+
+    @staticmethod
+    def _parse_template(body: str, operation: str) -> dict:
+        import cfn_flip
+
+        try:
+            template, _ = cfn_flip.load(body)
+        except Exception as error:
+            raise _client_error(
+                operation, "ValidationError", "Template format error: {0}".format(error)
+            )
+        if not isinstance(template, dict):
+            raise _client_error(
+                operation, "ValidationError", "Template format error: not an object"
+            )
+        return template
+
+    def _apply_template(self, stack: _OfflineStack, kwargs: dict, operation: str):
+        body = self._template_from_kwargs(kwargs, operation)
+        stack.template_body = body
+        stack.template = self._parse_template(body, operation)
+        stack.parameters = self._merge_parameters(stack, kwargs.get("Parameters", []))
+        stack.tags = kwargs.get("Tags", stack.tags)
+        stack.capabilities = kwargs.get("Capabilities", stack.capabilities)
+        stack.role_arn = kwargs.get("RoleARN", stack.role_arn)
+        stack.notification_arns = kwargs.get(
+            "NotificationARNs", stack.notification_arns
+        )
+        stack.outputs = self._render_outputs(stack)
+
+    @staticmethod
+    def _merge_parameters(stack: _OfflineStack, parameters: List[dict]) -> List[dict]:
+        previous = {
+            parameter["ParameterKey"]: parameter["ParameterValue"]
+            for parameter in stack.parameters
+        }
+        merged = []
+        for parameter in parameters:
+            value = parameter.get("ParameterValue")
+            if parameter.get("UsePreviousValue"):
+                value = previous.get(parameter["ParameterKey"], "")
+            merged.append(
+                {"ParameterKey": parameter["ParameterKey"], "ParameterValue": value}
+            )
+        return merged
+
+    def _physical_id(self, stack: _OfflineStack, logical_id: str) -> str:
+        digest = hashlib.sha1(
+            "{0}/{1}".format(stack.stack_id, logical_id).encode()
+        ).hexdigest()
+        return "{0}-{1}-{2}".format(stack.name, logical_id, digest[:12].upper())
+
+    def _ref(self, stack: _OfflineStack, name: str) -> str:
+        parameters = {
+            parameter["ParameterKey"]: parameter["ParameterValue"]
+            for parameter in stack.parameters
+        }
+        pseudo_parameters = {
+            "AWS::AccountId": self.config.account_id,
+            "AWS::Region": stack.region,
+            "AWS::StackName": stack.name,
+            "AWS::StackId": stack.stack_id,
+            "AWS::Partition": "aws",
+            "AWS::URLSuffix": "amazonaws.com",
+        }
+        if name in parameters:
+            return parameters[name]
+        if name in pseudo_parameters:
+            return pseudo_parameters[name]
+        if name in (stack.template.get("Resources") or {}):
+            return self._physical_id(stack, name)
+        return name
+
+    def _render_value(self, stack: _OfflineStack, value: Any, output_key: str) -> str:
+        """Renders an output value, resolving the intrinsic functions that are easy to fake."""
+        if isinstance(value, (str, int, float, bool)):
+            return str(value)
+        function, argument = (
+            next(iter(value.items()))
+            if isinstance(value, dict) and len(value) == 1
+            else (None, None)
+        )
+        if function == "Ref":
+            return self._ref(stack, argument)
+        if function == "Fn::GetAtt":
+            if isinstance(argument, str):
+                argument = argument.split(".", 1)
+            return "{0}.{1}".format(self._physical_id(stack, argument[0]), argument[1])
+        if function == "Fn::Sub" and isinstance(argument, str):
+            return re.sub(
+                r"\$\{([^}!]+)\}",
+                lambda match: self._ref(stack, match.group(1)),
+                argument,
+            )
+        if function == "Fn::Join" and isinstance(argument[1], list):
+            return argument[0].join(
+                self._render_value(stack, item, output_key) for item in argument[1]
+            )
+        return "{0}-{1}".format(stack.name, output_key)
+
+    def _render_outputs(self, stack: _OfflineStack) -> List[dict]:
+        outputs = []
+        for key, output in (stack.template.get("Outputs") or {}).items():
+            rendered = {
+                "OutputKey": key,
+                "OutputValue": self._render_value(stack, output.get("Value"), key),
+            }
+            if "Description" in output:
+                rendered["Description"] = output["Description"]
+            if isinstance(output.get("Export"), dict):
+                rendered["ExportName"] = self._render_value(
+                    stack, output["Export"].get("Name"), key
+                )
+            outputs.append(rendered)
+        return outputs
+
+    def _has_changes(self, stack: _OfflineStack, kwargs: dict, operation: str) -> bool:
+        body = self._template_from_kwargs(kwargs, operation)
+        parameters = self._merge_parameters(stack, kwargs.get("Parameters", []))
+        return (
+            body != stack.template_body
+            or parameters != stack.parameters
+            or kwargs.get("Tags", stack.tags) != stack.tags
+        )
+
+    def _check_stable(self, stack: _OfflineStack, operation: str):
+        if (
+            stack.status.endswith("_IN_PROGRESS")
+            and stack.status != "REVIEW_IN_PROGRESS"
+        ):
+            raise _client_error(
+                operation,
+                "ValidationError",
+                "Stack:{0} is in {1} state and can not be updated.".format(
+                    stack.stack_id, stack.status
+                ),
+            )
+
+    # CloudFormation
+
+    def _cloudformation_create_stack(self, region, **kwargs):
+        name = kwargs["StackName"]
+        existing = self._find_stack(region, name)
+        if existing is not None and existing.status != "REVIEW_IN_PROGRESS":
+            raise _client_error(
+                "create_stack",
+                "AlreadyExistsException",
+                "Stack [{0}] already exists".format(name),
+            )
+        stack = existing or _OfflineStack(
+            name, region, self.config.account_id, self.clock()
+        )
+        self._apply_template(stack, kwargs, "create_stack")
+        self._stacks.setdefault(region, {})[name] = stack
+        self._start_operation(stack, "create")
+        return {"StackId": stack.stack_id}
+
+    def _cloudformation_update_stack(self, region, **kwargs):
+        stack = self._get_stack(region, kwargs["StackName"], "update_stack")
+        self._check_stable(stack, "update_stack")
+        if not self._has_changes(stack, kwargs, "update_stack"):
+            raise _client_error(
+                "update_stack", "ValidationError", "No updates are to be performed."
+            )
+        self._apply_template(stack, kwargs, "update_stack")
+        stack.updated_at = self.clock()
+        self._start_operation(stack, "update")
+        return {"StackId": stack.stack_id}
+
+    def _cloudformation_delete_stack(self, region, **kwargs):
+        stack = self._find_stack(region, kwargs["StackName"])
+        if stack is not None and stack.status != "DELETE_IN_PROGRESS":
+            self._start_operation(stack, "delete")
+        return {}
+
+    def _cloudformation_cancel_update_stack(self, region, **kwargs):
+        stack = self._get_stack(region, kwargs["StackName"], "cancel_update_stack")
+        if stack.status != "UPDATE_IN_PROGRESS":
+            raise _client_error(
+                "cancel_update_stack",
+                "ValidationError",
+                "CancelUpdateStack cannot be called from current stack status",
+            )
+        now = self.clock()
+        stack.status = "UPDATE_ROLLBACK_IN_PROGRESS"
+        self._add_event(stack, stack.status, now, "User Initiated")
+        duration = float(self.config.operation_durations.get("update", 0))
+        stack.pending = ("UPDATE_ROLLBACK_COMPLETE", now + duration)
+        self._settle(stack)
+        return {}
+
+    def _cloudformation_continue_update_rollback(self, region, **kwargs):
+        stack = self._get_stack(region, kwargs["StackName"], "continue_update_rollback")
+        now = self.clock()
+        stack.status = "UPDATE_ROLLBACK_COMPLETE"
+        self._add_event(stack, stack.status, now)
+        return {}
+
+    def _cloudformation_describe_stacks(self, region, **kwargs):
+        if kwargs.get("StackName"):
+            stack = self._get_stack(region, kwargs["StackName"], "describe_stacks")
+            return {"Stacks": [stack.describe()]}
+        stacks = [stack.describe() for stack in self._region_stacks(region).values()]
+        return _paginate(stacks, kwargs, STACKS_PAGE_SIZE, "Stacks")
+
+    def _cloudformation_describe_stack_events(self, region, **kwargs):
+        stack = self._get_stack(region, kwargs["StackName"], "describe_stack_events")
+        # CloudFormation returns the most recent events first.
+        return {"StackEvents": copy.deepcopy(stack.events[::-1])}
+
+    def _cloudformation_describe_stack_resources(self, region, **kwargs):
+        stack = self._get_stack(region, kwargs["StackName"], "describe_stack_resources")
+        resource_status = (
+            stack.status
+            if stack.status.endswith(("_COMPLETE", "_IN_PROGRESS", "_FAILED"))
+            else "CREATE_COMPLETE"
+        )
+        resources = [
+            {
+                "StackName": stack.name,
+                "StackId": stack.stack_id,
+                "LogicalResourceId": logical_id,
+                "PhysicalResourceId": self._physical_id(stack, logical_id),
+                "ResourceType": (resource or {}).get(
+                    "Type", "AWS::CloudFormation::Stack"
+                ),
+                "Timestamp": _timestamp(stack.updated_at or stack.created_at),
+                "ResourceStatus": resource_status,
+            }
+            for logical_id, resource in (stack.template.get("Resources") or {}).items()
+        ]
+        return {"StackResources": resources}
+
+    def _cloudformation_get_template(self, region, **kwargs):
+        stack = self._get_stack(region, kwargs["StackName"], "get_template")
+        return {
+            "TemplateBody": stack.template_body,
+            "StagesAvailable": ["Original", "Processed"],
+        }
+
+    def _template_summary(self, template: dict) -> dict:
+        summary = {
+            "Parameters": [
+                {
+                    "ParameterKey": key,
+                    "ParameterType": (parameter or {}).get("Type", "String"),
+                    "NoEcho": bool((parameter or {}).get("NoEcho", False)),
+                    "Description": (parameter or {}).get("Description", ""),
+                }
+                for key, parameter in (template.get("Parameters") or {}).items()
+            ],
+            "ResourceTypes": sorted(
+                {
+                    (resource or {}).get("Type", "")
+                    for resource in (template.get("Resources") or {}).values()
+                }
+            ),
+            "Version": str(template.get("AWSTemplateFormatVersion", "2010-09-09")),
+        }
+        for parameter, definition in zip(
+            summary["Parameters"], (template.get("Parameters") or {}).values()
+        ):
+            if "Default" in (definition or {}):
+                parameter["DefaultValue"] = str(definition["Default"])
+        if "Description" in template:
+            summary["Description"] = template["Description"]
+        return summary
+
+    def _cloudformation_get_template_summary(self, region, **kwargs):
+        if kwargs.get("StackName"):
+            stack = self._get_stack(region, kwargs["StackName"], "get_template_summary")
+            return self._template_summary(stack.template)
+        body = self._template_from_kwargs(kwargs, "get_template_summary")
+        return self._template_summary(
+            self._parse_template(body, "get_template_summary")
+        )
+
+    def _cloudformation_validate_template(self, region, **kwargs):
+        body = self._template_from_kwargs(kwargs, "validate_template")
+        template = self._parse_template(body, "validate_template")
+        summary = self._template_summary(template)
+        response = {
+            "Parameters": [
+                {
+                    key: parameter[key]
+                    for key in ("ParameterKey", "DefaultValue", "NoEcho", "Description")
+                    if key in parameter
+                }
+                for parameter in summary["Parameters"]
+            ],
+            "Capabilities": [],
+        }
+        if "Description" in summary:
+            response["Description"] = summary["Description"]
+        return response
+
+    def _cloudformation_estimate_template_cost(self, region, **kwargs):
+        self._template_from_kwargs(kwargs, "estimate_template_cost")
+        return {"Url": "https://calculator.s3.amazonaws.com/calc5.html?key=offline"}
+
+    def _cloudformation_set_stack_policy(self, region, **kwargs):
+        stack = self._get_stack(region, kwargs["StackName"], "set_stack_policy")
+        stack.policy_body = kwargs.get("StackPolicyBody")
+        return {}
+
+    def _cloudformation_get_stack_policy(self, region, **kwargs):
+        stack = self._get_stack(region, kwargs["StackName"], "get_stack_policy")
+        return {"StackPolicyBody": stack.policy_body} if stack.policy_body else {}
+
+    def _cloudformation_list_exports(self, region, **kwargs):
+        exports = [
+            {
+                "ExportingStackId": stack.stack_id,
+                "Name": output["ExportName"],
+                "Value": output["OutputValue"],
+            }
+            for stack in self._region_stacks(region).values()
+            if not stack.status.startswith(("CREATE_IN", "REVIEW_IN"))
+            for output in stack.outputs
+            if "ExportName" in output
+        ]
+        return _paginate(exports, kwargs, EXPORTS_PAGE_SIZE, "Exports")
+
+    # CloudFormation change sets
+
+    def _get_change_set(self, region, kwargs, operation) -> dict:
+        name = kwargs["ChangeSetName"]
+        stacks = (
+            [self._get_stack(region, kwargs["StackName"], operation)]
+            if kwargs.get("StackName")
+            else list(self._region_stacks(region).values())
+        )
+        for stack in stacks:
+            for change_set in stack.change_sets.values():
+                if name in (change_set["ChangeSetName"], change_set["ChangeSetId"]):
+                    return change_set
+        raise _client_error(
+            operation,
+            "ChangeSetNotFound",
+            "ChangeSet [{0}] does not exist".format(name),
+        )
+
+    def _cloudformation_create_change_set(self, region, **kwargs):
+        name = kwargs["StackName"]
+        stack = self._find_stack(region, name)
+        if kwargs.get("ChangeSetType") == "CREATE":
+            if stack is not None and stack.status != "REVIEW_IN_PROGRESS":
+                raise _client_error(
+                    "create_change_set",
+                    "ValidationError",
+                    "Stack [{0}] already exists and cannot be created again with the "
+                    "changeSet [{1}].".format(name, kwargs["ChangeSetName"]),
+                )
+            if stack is None:
+                stack = _OfflineStack(
+                    name, region, self.config.account_id, self.clock()
+                )
+                self._stacks.setdefault(region, {})[name] = stack
+        elif stack is None:
+            raise _client_error(
+                "create_change_set",
+                "ValidationError",
+                "Stack [{0}] does not exist".format(name),
+            )
+        else:
+            self._check_stable(stack, "create_change_set")
+
+        has_changes = stack.status == "REVIEW_IN_PROGRESS" or self._has_changes(
+            stack, kwargs, "create_change_set"
+        )
+        change_set_id = "arn:aws:cloudformation:{0}:{1}:changeSet/{2}/{3}".format(
+            region, self.config.account_id, kwargs["ChangeSetName"], uuid.uuid4()
+        )
+        stack.change_sets[kwargs["ChangeSetName"]] = {
+            "ChangeSetName": kwargs["ChangeSetName"],
+            "ChangeSetId": change_set_id,
+            "StackId": stack.stack_id,
+            "StackName": stack.name,
+            "CreationTime": _timestamp(self.clock()),
+            "Status": "CREATE_PENDING",
+            "ExecutionStatus": "UNAVAILABLE",
+            "Parameters": self._merge_parameters(stack, kwargs.get("Parameters", [])),
+            "Tags": kwargs.get("Tags", []),
+            "Changes": [],
+            "_request": kwargs,
+            "_ready_at": self.clock()
+            + float(self.config.operation_durations.get("change_set", 0)),
+            "_final_status": "CREATE_COMPLETE" if has_changes else "FAILED",
+            "_final_execution_status": "AVAILABLE" if has_changes else "UNAVAILABLE",
+        }
+        if not has_changes:
+            stack.change_sets[kwargs["ChangeSetName"]][
+                "StatusReason"
+            ] = NO_CHANGES_REASON
+        self._settle(stack)
+        return {"Id": change_set_id, "StackId": stack.stack_id}
+
+    @staticmethod
+    def _public_change_set(change_set: dict) -> dict:
+        return {
+            key: copy.deepcopy(value)
+            for key, value in change_set.items()
+            if not key.startswith("_")
+        }
+
+    def _cloudformation_describe_change_set(self, region, **kwargs):
+        change_set = self._get_change_set(region, kwargs, "describe_change_set")
+        return self._public_change_set(change_set)
+
+    def _cloudformation_list_change_sets(self, region, **kwargs):
+        stack = self._get_stack(region, kwargs["StackName"], "list_change_sets")
+        summaries = [
+            {
+                key: value
+                for key, value in self._public_change_set(change_set).items()
+                if key not in ("Parameters", "Tags", "Changes")
+            }
+            for change_set in stack.change_sets.values()
+        ]
+        return {"Summaries": summaries}
+
+    def _cloudformation_delete_change_set(self, region, **kwargs):
+        change_set = self._get_change_set(region, kwargs, "delete_change_set")
+        stack = self._find_stack(region, change_set["StackName"])
+        del stack.change_sets[change_set["ChangeSetName"]]
+        return {}
+
+    def _cloudformation_execute_change_set(self, region, **kwargs):
+        change_set = self._get_change_set(region, kwargs, "execute_change_set")
+        if change_set["ExecutionStatus"] != "AVAILABLE":
+            raise _client_error(
+                "execute_change_set",
+                "InvalidChangeSetStatus",
+                "ChangeSet [{0}] cannot be executed in its current status of [{1}]".format(
+                    change_set["ChangeSetId"], change_set["Status"]
+                ),
+            )
+        stack = self._find_stack(region, change_set["StackName"])
+        operation = "create" if stack.status == "REVIEW_IN_PROGRESS" else "update"
+        self._apply_template(stack, change_set["_request"], "execute_change_set")
+        if operation == "update":
+            stack.updated_at = self.clock()
+        for other in stack.change_sets.values():
+            other["ExecutionStatus"] = "OBSOLETE"
+        change_set["ExecutionStatus"] = "EXECUTE_COMPLETE"
+        self._start_operation(stack, operation)
+        return {}
+
+    # CloudFormation drift detection
+
+    def _cloudformation_detect_stack_drift(self, region, **kwargs):
+        stack = self._get_stack(region, kwargs["StackName"], "detect_stack_drift")
+        return {"StackDriftDetectionId": "{0}-drift".format(stack.stack_id)}
+
+    def _cloudformation_describe_stack_drift_detection_status(self, region, **kwargs):
+        detection_id = kwargs["StackDriftDetectionId"]
+        return {
+            "StackId": detection_id[: -len("-drift")],
+            "StackDriftDetectionId": detection_id,
+            "StackDriftStatus": "IN_SYNC",
+            "DetectionStatus": "DETECTION_COMPLETE",
+            "DriftedStackResourceCount": 0,
+            "Timestamp": _timestamp(self.clock()),
+        }
+
+    def _cloudformation_describe_stack_resource_drifts(self, region, **kwargs):
+        self._get_stack(region, kwargs["StackName"], "describe_stack_resource_drifts")
+        return {"StackResourceDrifts": []}
+
+    # S3
+
+    def _get_bucket(self, bucket_name: str, operation: str) -> dict:
+        if bucket_name not in self._buckets:
+            raise _client_error(
+                operation,
+                "NoSuchBucket",
+                "The specified bucket does not exist",
+            )
+        return self._buckets[bucket_name]
+
+    def _s3_head_bucket(self, region, **kwargs):
+        if kwargs["Bucket"] not in self._buckets:
+            raise _client_error("head_bucket", "404", "Not Found")
+        return {}
+
+    def _s3_create_bucket(self, region, **kwargs):
+        bucket_name = kwargs["Bucket"]
+        if bucket_name in self._buckets:
+            raise _client_error(
+                "create_bucket",
+                "BucketAlreadyOwnedByYou",
+                "Your previous request to create the named bucket succeeded and you "
+                "already own it.",
+            )
+        location = (kwargs.get("CreateBucketConfiguration") or {}).get(
+            "LocationConstraint"
+        )
+        self._buckets[bucket_name] = {
+            "region": location or DEFAULT_REGION,
+            "tags": {},
+            "objects": {},
+            "created_at": self.clock(),
+        }
+        return {"Location": "/{0}".format(bucket_name)}
+
+    def _s3_get_bucket_location(self, region, **kwargs):
+        bucket = self._get_bucket(kwargs["Bucket"], "get_bucket_location")
+        location = None if bucket["region"] == DEFAULT_REGION else bucket["region"]
+        return {"LocationConstraint": location}
+
+    def _s3_list_buckets(self, region, **kwargs):
+        return {
+            "Buckets": [
+                {"Name": name, "CreationDate": _timestamp(bucket["created_at"])}
+                for name, bucket in sorted(self._buckets.items())
+            ],
+            "Owner": {"ID": self.config.account_id},
+        }
+
+    def _s3_get_bucket_tagging(self, region, **kwargs):
+        bucket = self._get_bucket(kwargs["Bucket"], "get_bucket_tagging")
+        if not bucket["tags"]:
+            raise _client_error(
+                "get_bucket_tagging", "NoSuchTagSet", "The TagSet does not exist"
+            )
+        return {
+            "TagSet": [
+                {"Key": key, "Value": str(value)}
+                for key, value in bucket["tags"].items()
+            ]
+        }
+
+    def _s3_put_object(self, region, **kwargs):
+        bucket = self._get_bucket(kwargs["Bucket"], "put_object")
+        body = kwargs.get("Body", b"")
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        elif hasattr(body, "read"):
+            body = body.read()
+        etag = '"{0}"'.format(hashlib.md5(body).hexdigest())
+        bucket["objects"][kwargs["Key"]] = {"Body": body, "ETag": etag}
+        return {"ETag": etag}
+
+    def _s3_get_object(self, region, **kwargs):
+        bucket = self._get_bucket(kwargs["Bucket"], "get_object")
+        if kwargs["Key"] not in bucket["objects"]:
+            raise _client_error(
+                "get_object", "NoSuchKey", "The specified key does not exist."
+            )
+        stored = bucket["objects"][kwargs["Key"]]
+        return {
+            "Body": io.BytesIO(stored["Body"]),
+            "ContentLength": len(stored["Body"]),
+            "ETag": stored["ETag"],
+        }
+
+    # SSM
+
+    def _put_parameter(self, name: str, value: str, parameter_type: str) -> dict:
+        version = self._parameters.get(name, {}).get("Version", 0) + 1
+        self._parameters[name] = {
+            "Name": name,
+            "Type": parameter_type,
+            "Value": str(value),
+            "Version": version,
+            "LastModifiedDate": _timestamp(self.clock()),
+            "ARN": "arn:aws:ssm:{0}:{1}:parameter{2}".format(
+                DEFAULT_REGION,
+                self.config.account_id,
+                name if name.startswith("/") else "/" + name,
+            ),
+            "DataType": "text",
+        }
+        return self._parameters[name]
+
+    def _ssm_put_parameter(self, region, **kwargs):
+        name = kwargs["Name"]
+        if name in self._parameters and not kwargs.get("Overwrite"):
+            raise _client_error(
+                "put_parameter",
+                "ParameterAlreadyExists",
+                "The parameter already exists.",
+            )
+        parameter = self._put_parameter(
+            name, kwargs["Value"], kwargs.get("Type", "String")
+        )
+        return {"Version": parameter["Version"], "Tier": "Standard"}
+
+    def _ssm_get_parameter(self, region, **kwargs):
+        if kwargs["Name"] not in self._parameters:
+            raise _client_error("get_parameter", "ParameterNotFound", "")
+        return {"Parameter": dict(self._parameters[kwargs["Name"]])}
+
+    def _ssm_get_parameters(self, region, **kwargs):
+        names = kwargs["Names"]
+        if len(names) > 10:
+            raise _client_error(
+                "get_parameters",
+                "ValidationException",
+                "Member must have length less than or equal to 10",
+            )
+        return {
+            "Parameters": [
+                dict(self._parameters[name])
+                for name in names
+                if name in self._parameters
+            ],
+            "InvalidParameters": [
+                name for name in names if name not in self._parameters
+            ],
+        }
+
+    def _ssm_get_parameters_by_path(self, region, **kwargs):
+        path = kwargs["Path"].rstrip("/") + "/"
+        recursive = kwargs.get("Recursive", False)
+        parameters = [
+            dict(parameter)
+            for name, parameter in sorted(self._parameters.items())
+            if name.startswith(path) and (recursive or "/" not in name[len(path) :])
+        ]
+        return _paginate(parameters, kwargs, PARAMETERS_PAGE_SIZE, "Parameters")
+
+    # STS
+
+    def _sts_get_caller_identity(self, region, **kwargs):
+        return {
+            "UserId": "AIDAOFFLINE",
+            "Account": self.config.account_id,
+            "Arn": "arn:aws:iam::{0}:user/offline".format(self.config.account_id),
+        }
+
+    def _sts_assume_role(self, region, **kwargs):
+        return {
+            "Credentials": {
+                "AccessKeyId": "ASIAOFFLINE",
+                "SecretAccessKey": "offline",
+                "SessionToken": "offline",
+                "Expiration": _timestamp(self.clock() + 3600),
+            },
+            "AssumedRoleUser": {
+                "AssumedRoleId": "AROAOFFLINE:{0}".format(kwargs["RoleSessionName"]),
+                "Arn": kwargs["RoleArn"],
+            },
+        }
+
+
+class OfflineCredentials(object):
+    """Stands in for botocore.credentials.Credentials."""
+
+    method = "offline"
+
+    def __init__(self, access_key: str, secret_key: str, token: Optional[str] = None):
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.token = token
+
+
+class OfflineClient(object):
+    """
+    Stands in for a Boto3 client; every command is forwarded to the backend.
+
+    :param backend: The backend.
+    :param service: The AWS service.
+    :param region: The region calls are made in.
+    """
+
+    def __init__(self, backend: OfflineBackend, service: str, region: str):
+        self._backend = backend
+        self._service = service
+        self._region = region
+
+    def __getattr__(self, command: str):
+        if command.startswith("_"):
+            raise AttributeError(command)
+
+        def call(**kwargs):
+            return self._backend.call(self._service, command, self._region, kwargs)
+
+        call.__name__ = command
+        return call
+
+
+class OfflineSession(object):
+    """
+    Stands in for boto3.Session, taking the same arguments as the ConnectionManager passes it.
+
+    :param backend: The backend the session's clients call.
+    """
+
+    def __init__(
+        self,
+        backend: OfflineBackend,
+        profile_name: Optional[str] = None,
+        region_name: Optional[str] = None,
+        aws_access_key_id: Optional[str] = None,
+        aws_secret_access_key: Optional[str] = None,
+        aws_session_token: Optional[str] = None,
+    ):
+        self._backend = backend
+        self.profile_name = profile_name
+        self.region_name = region_name or DEFAULT_REGION
+        self._credentials = OfflineCredentials(
+            aws_access_key_id or "AKIAOFFLINE",
+            aws_secret_access_key or "offline",
+            aws_session_token,
+        )
+
+    def get_credentials(self) -> OfflineCredentials:
+        return self._credentials
+
+    def client(self, service: str) -> OfflineClient:
+        return OfflineClient(self._backend, service, self.region_name)
+
+
+def use_offline_backend(
+    config: Optional[OfflineBackendConfig] = None,
+) -> OfflineBackend:
+    """
+    Makes every ConnectionManager created from now on use a new offline backend, and discards
+    the sessions and clients already cached.
+
+    :param config: The backend's configuration.
+    :returns: The backend.
+    """
+    from sceptre.connection_manager import ConnectionManager
+
+    backend = OfflineBackend(config)
+    ConnectionManager.default_session_class = backend.session
+    ConnectionManager.clear_cache()
+    return backend
+
+
+def use_aws_backend():
+    """Makes every ConnectionManager created from now on use boto3 again."""
+    from sceptre.connection_manager import ConnectionManager
+
+    ConnectionManager.default_session_class = None
+    ConnectionManager.clear_cache()
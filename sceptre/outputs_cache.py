@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.outputs_cache
+
+This module implements a process-wide cache of CloudFormation stack outputs, shared by the
+output and export resolvers and by ``sceptre list outputs``, so that the outputs of a stack
+are only described once, however many stacks refer to them.
+"""
+
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+CacheKey = Tuple[Optional[str], Optional[str], str]
+
+
+def account_key(profile: Optional[str], sceptre_role: Optional[str]) -> Optional[str]:
+    """
+    Identifies the account calls are made in without calling AWS. This is the account ID in the
+    sceptre_role ARN when there is a role; otherwise the profile (if any), which determines the
+    account the calls are made in.
+
+    :param profile: The profile the calls are made with.
+    :param sceptre_role: The IAM role ARN the calls are made with.
+    :returns: The account ID, the profile name or None.
+    """
+    if sceptre_role:
+        parts = str(sceptre_role).split(":")
+        if len(parts) > 4 and parts[4]:
+            return parts[4]
+    return profile
+
+
+class _Entry(object):
+    def __init__(self):
+        self.loaded = threading.Event()
+        self.outputs = None
+        self.error = None
+
+
+class StackOutputsCache(object):
+    """
+    A thread-safe cache of stack outputs keyed by (account, region, external stack name).
+
+    Concurrent requests for the outputs of the same stack share a single load. Failed loads are
+    not cached, so a stack that doesn't exist yet is described again next time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[CacheKey, _Entry] = {}
+
+    def get(
+        self,
+        account: Optional[str],
+        region: Optional[str],
+        stack_name: str,
+        load: Callable[[], List[dict]],
+    ) -> List[dict]:
+        """
+        Returns the outputs of a stack, loading them with ``load`` unless they are cached. The
+        returned outputs are shared and must not be modified.
+
+        :param account: The account of the stack; see account_key.
+        :param region: The region of the stack.
+        :param stack_name: The external name of the stack.
+        :param load: Returns the stack's outputs, as listed by describe_stacks.
+        :returns: The stack's outputs, as listed by describe_stacks.
+        """
+        key = (account, region, stack_name)
+        with self._lock:
+            entry = self._entries.get(key)
+            is_loader = entry is None
+            if is_loader:
+                entry = self._entries[key] = _Entry()
+
+        if not is_loader:
+            entry.loaded.wait()
+            if entry.error is not None:
+                raise entry.error
+            return entry.outputs
+
+        try:
+            entry.outputs = load()
+        except Exception as error:
+            entry.error = error
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            raise
+        finally:
+            entry.loaded.set()
+        return entry.outputs
+
+    def contains(
+        self, account: Optional[str], region: Optional[str], stack_name: str
+    ) -> bool:
+        """
+        Returns whether the outputs of a stack are cached or being loaded.
+
+        :param account: The account of the stack; see account_key.
+        :param region: The region of the stack.
+        :param stack_name: The external name of the stack.
+        """
+        with self._lock:
+            return (account, region, stack_name) in self._entries
+
+    def put(
+        self,
+        account: Optional[str],
+        region: Optional[str],
+        stack_name: str,
+        outputs: List[dict],
+    ):
+        """
+        Caches the outputs of a stack that were loaded elsewhere.
+
+        :param account: The account of the stack; see account_key.
+        :param region: The region of the stack.
+        :param stack_name: The external name of the stack.
+        :param outputs: The stack's outputs, as listed by describe_stacks.
+        """
+        entry = _Entry()
+        entry.outputs = outputs
+        entry.loaded.set()
+        with self._lock:
+            self._entries[(account, region, stack_name)] = entry
+
+    def invalidate(self, stack_name: str, region: Optional[str] = None):
+        """
+        Forgets the cached outputs of a stack, in every account.
+
+        :param stack_name: The external name of the stack.
+        :param region: Only forget the outputs cached for this region, if given.
+        """
+        with self._lock:
+            for key in list(self._entries):
+                if key[2] == stack_name and region in (None, key[1]):
+                    del self._entries[key]
+
+    def clear(self):
+        """Forgets all cached outputs."""
+        with self._lock:
+            self._entries.clear()
+
+
+stack_outputs_cache = StackOutputsCache()
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.outputs_snapshot
+
+This module implements snapshots of the CloudFormation stacks (and their outputs) in the accounts
+and regions of a project, as written by ``sceptre list outputs --snapshot``. When a snapshot is
+in use (``sceptre --outputs-snapshot``), the stack output and export resolvers read outputs from
+it instead of describing stacks, so configs and templates can be rendered without any
+CloudFormation calls.
+"""
+
+import json
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sceptre.exceptions import StackDoesNotExistError
+
+SNAPSHOT_VERSION = 1
+# The describe_stacks fields kept in snapshots; the export filters match tags and fields too.
+STACK_FIELDS = ("StackName", "StackStatus", "Tags", "Outputs")
+
+
+class OutputsSnapshot(object):
+    """
+    The stacks of some accounts and regions, as listed by describe_stacks.
+
+    :param stacks: The stacks, each with the "Account" and "Region" it was listed in.
+    """
+
+    def __init__(self, stacks: List[dict]):
+        self._stacks = stacks
+        self._by_key: Dict[Tuple, dict] = {}
+        self._by_region: Dict[Tuple, List[dict]] = {}
+        for stack in stacks:
+            region, name = stack.get("Region"), stack["StackName"]
+            self._by_key[(stack.get("Account"), region, name)] = stack
+            self._by_region.setdefault((region, name), []).append(stack)
+
+    def __len__(self):
+        return len(self._stacks)
+
+    @classmethod
+    def from_file(cls, path: str) -> "OutputsSnapshot":
+        """
+        Reads a snapshot written by write.
+
+        :param path: The path of the snapshot file.
+        """
+        with open(path) as snapshot_file:
+            content = json.load(snapshot_file)
+        if content.get("Version") != SNAPSHOT_VERSION:
+            raise ValueError(
+                f"{path} is not a version {SNAPSHOT_VERSION} outputs snapshot"
+            )
+        return cls(content["Stacks"])
+
+    @classmethod
+    def from_catalogs(
+        cls, catalogs: Iterable[Tuple[Optional[str], Optional[str], Iterable[dict]]]
+    ):
+        """
+        Builds a snapshot from lists of stacks.
+
+        :param catalogs: The account, region and stacks (as listed by describe_stacks) of each
+            account and region.
+        """
+        stacks = []
+        for account, region, region_stacks in catalogs:
+            for stack in region_stacks:
+                entry = {"Account": account, "Region": region}
+                entry.update((key, stack[key]) for key in STACK_FIELDS if key in stack)
+                stacks.append(entry)
+        return cls(stacks)
+
+    def write(self, path: str):
+        """
+        Writes the snapshot as JSON.
+
+        :param path: The path of the snapshot file.
+        """
+        content = {
+            "Version": SNAPSHOT_VERSION,
+            "Created": datetime.now(timezone.utc).isoformat(),
+            "Stacks": self._stacks,
+        }
+        with open(path, "w") as snapshot_file:
+            json.dump(content, snapshot_file, indent=2, sort_keys=True, default=str)
+
+    def find(
+        self, account: Optional[str], region: Optional[str], stack_name: str
+    ) -> Optional[dict]:
+        """
+        Returns a stack, matching the account when the snapshot has the stack in more than one.
+        The account is otherwise ignored, since it depends on the profile and role the snapshot
+        and the lookup were made with.
+
+        :param account: The account of the stack; see sceptre.outputs_cache.account_key.
+        :param region: The region of the stack.
+        :param stack_name: The external name of the stack.
+        :returns: The stack, as listed by describe_stacks, or None.
+        """
+        stack = self._by_key.get((account, region, stack_name))
+        if stack is not None:
+            return stack
+        candidates = self._by_region.get((region, stack_name), [])
+        return candidates[0] if len(candidates) == 1 else None
+
+    def outputs(
+        self, account: Optional[str], region: Optional[str], stack_name: str
+    ) -> List[dict]:
+        """
+        Returns the outputs of a stack, as describe_stacks lists them.
+
+        :raises: sceptre.exceptions.StackDoesNotExistError when the snapshot doesn't have the stack
+        """
+        stack = self.find(account, region, stack_name)
+        if stack is None:
+            raise StackDoesNotExistError(
+                f"Stack with id {stack_name} is not in the outputs snapshot"
+            )
+        return stack.get("Outputs", [])
+
+    def stacks(self, account: Optional[str], region: Optional[str]) -> List[dict]:
+        """
+        Returns the stacks listed in an account and region. As with find, the account is only
+        ignored when the snapshot has a single account in the region; otherwise no stacks are
+        returned rather than another account's.
+
+        :param account: The account; see sceptre.outputs_cache.account_key.
+        :param region: The region.
+        """
+        in_region = [stack for stack in self._stacks if stack.get("Region") == region]
+        in_account = [stack for stack in in_region if stack.get("Account") == account]
+        if in_account:
+            return in_account
+        accounts = {stack.get("Account") for stack in in_region}
+        return in_region if len(accounts) == 1 else []
+
+
+_active_snapshot: Optional[OutputsSnapshot] = None
+_active_snapshot_lock = threading.Lock()
+
+
+def use_outputs_snapshot(snapshot: Optional[OutputsSnapshot]):
+    """
+    Makes the stack output and export resolvers read outputs from the snapshot, or from AWS again
+    when it is None.
+    """
+    global _active_snapshot
+    with _active_snapshot_lock:
+        _active_snapshot = snapshot
+
+
+def active_outputs_snapshot() -> Optional[OutputsSnapshot]:
+    """Returns the snapshot outputs are read from, if any."""
+    return _active_snapshot
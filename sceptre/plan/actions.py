@@ -13,6 +13,7 @@ import time
 import typing
 import urllib
 import botocore
+import functools
 
 from datetime import datetime, timedelta
 from dateutil.tz import tzutc
@@ -27,8 +28,10 @@ from sceptre.exceptions import (
     UnknownStackChangeSetStatusError,
     UnknownStackStatusError,
 )
+from sceptre.exports_catalog import export_catalogs
 from sceptre.helpers import extract_datetime_from_aws_response_headers
 from sceptre.hooks import add_stack_hooks, add_stack_hooks_with_aliases
+from sceptre.outputs_cache import account_key, stack_outputs_cache
 from sceptre.stack import Stack
 from sceptre.stack_status import StackChangeSetStatus, StackStatus
 
@@ -38,6 +41,35 @@ if typing.TYPE_CHECKING:
     from sceptre.diffing.stack_differ import StackDiff, StackDiffer
 
 
+def invalidates_stack_outputs(func):
+    """
+    A function decorator for actions that change a Stack's outputs. It forgets the Stack's cached
+    outputs both before the action starts and once it has finished, so that no outputs read
+    while the Stack was changing outlive the change. The export catalog of its account and
+    region, which lists its outputs too, describes the Stack again when next needed.
+
+    :param func: a function that operates on a stack
+    :type func: function
+    """
+
+    @functools.wraps(func)
+    def decorated(self, *args, **kwargs):
+        account = account_key(self.stack.profile, self.stack.sceptre_role)
+        stack_outputs_cache.invalidate(self.stack.external_name)
+        export_catalogs.invalidate_stack(
+            account, self.stack.region, self.stack.external_name
+        )
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            stack_outputs_cache.invalidate(self.stack.external_name)
+            export_catalogs.invalidate_stack(
+                account, self.stack.region, self.stack.external_name
+            )
+
+    return decorated
+
+
 class StackActions:
     """
     StackActions stores the operations a Stack can take, such as creating or
@@ -60,6 +92,7 @@ class StackActions:
         )
 
     @add_stack_hooks
+    @invalidates_stack_outputs
     def create(self):
         """
         Creates a Stack.
@@ -116,6 +149,7 @@ class StackActions:
         return status
 
     @add_stack_hooks
+    @invalidates_stack_outputs
     def update(self):
         """
         Updates the Stack.
@@ -166,6 +200,7 @@ class StackActions:
             else:
                 raise
 
+    @invalidates_stack_outputs
     def cancel_stack_update(self):
         """
         Cancels a Stack update.
@@ -239,6 +274,7 @@ class StackActions:
         return status
 
     @add_stack_hooks
+    @invalidates_stack_outputs
     def delete(self):
         """
         Deletes the Stack.
@@ -367,10 +403,16 @@ class StackActions:
         :rtype: list
         """
         self.logger.debug("%s - Describing stack outputs", self.stack.name)
-        response = self.describe()
+        outputs = stack_outputs_cache.get(
+            account_key(self.stack.profile, self.stack.sceptre_role),
+            self.stack.region,
+            self.stack.external_name,
+            lambda: self.describe()["Stacks"][0].get("Outputs", []),
+        )
 
-        return {self.stack.name: response["Stacks"][0].get("Outputs", [])}
+        return {self.stack.name: outputs}
 
+    @invalidates_stack_outputs
     def continue_update_rollback(self):
         """
         Rolls back a Stack in the UPDATE_ROLLBACK_FAILED state to
@@ -530,6 +572,7 @@ class StackActions:
             },
         )
 
+    @invalidates_stack_outputs
     def execute_change_set(self, change_set_name):
         """
         Executes the Change Set ``change_set_name``.
@@ -6,15 +6,34 @@ sceptre.plan.executor
 This module implements a SceptrePlanExecutor, which is responsible for
 executing the command specified in a SceptrePlan.
 """
+import contextvars
 import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Set
 
 from sceptre.plan.actions import StackActions
+from sceptre.plan.prefetch import prefetch_described_outputs, prefetch_stack_outputs
 from sceptre.stack import Stack
 
 
 class SceptrePlanExecutor(object):
+    # The commands that resolve the stacks' resolvers. Before each batch of stacks is executed for
+    # one of these, the outputs their !stack_output resolvers refer to are prefetched.
+    PREFETCH_OUTPUTS_COMMANDS = frozenset(
+        [
+            "create",
+            "update",
+            "launch",
+            "create_change_set",
+            "diff",
+            "validate",
+            "estimate_cost",
+            "generate",
+            "dump_config",
+            "dump_template",
+        ]
+    )
+
     def __init__(self, command: str, launch_order: List[Set[Stack]]):
         """
         Initialises a SceptrePlanExecutor, generates the launch order, threads
@@ -42,10 +61,25 @@ class SceptrePlanExecutor(object):
         """
         responses = {}
 
+        if self.command == "describe_outputs":
+            # e.g. list outputs: many stacks in one account and region are listed in one sweep
+            prefetch_described_outputs(
+                [stack for batch in self.launch_order for stack in batch]
+            )
+
         with ThreadPoolExecutor(max_workers=self.num_threads) as executor:
             for batch in self.launch_order:
+                if self.command in self.PREFETCH_OUTPUTS_COMMANDS:
+                    # The stacks this batch depends on are in earlier batches, which have finished.
+                    prefetch_stack_outputs(batch)
+
+                # Each stack runs in a copy of the caller's context, so context-local settings
+                # (e.g. resolver placeholders) are scoped to this plan.
                 futures = [
-                    executor.submit(self._execute, stack, *args) for stack in batch
+                    executor.submit(
+                        contextvars.copy_context().run, self._execute, stack, *args
+                    )
+                    for stack in batch
                 ]
 
                 for future in as_completed(futures):
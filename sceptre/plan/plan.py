@@ -20,6 +20,7 @@ from sceptre.diffing.stack_differ import StackDiff
 from sceptre.exceptions import ConfigFileNotFoundError
 from sceptre.helpers import sceptreise_path
 from sceptre.plan.executor import SceptrePlanExecutor
+from sceptre.resolvers.cache import PlanCaches
 from sceptre.stack import Stack
 
 
@@ -46,15 +47,20 @@ class SceptrePlan(object):
         self.reverse = None
         self.launch_order: Optional[List[Set[Stack]]] = None
 
+        # Stack and plan scoped resolver results are kept for this plan only, and aren't shared
+        # with (or cleared by) other plans in the process.
+        self.caches = PlanCaches()
         self.config_reader = ConfigReader(context)
-        all_stacks, command_stacks = self.config_reader.construct_stacks()
+        with self.caches.activate():
+            all_stacks, command_stacks = self.config_reader.construct_stacks()
         self.graph = StackGraph(all_stacks)
         self.command_stacks = command_stacks
 
     @require_resolved
     def _execute(self, *args):
         executor = SceptrePlanExecutor(self.command, self.launch_order)
-        return executor.execute(*args)
+        with self.caches.activate():
+            return executor.execute(*args)
 
     def _raise_no_launch_order_error(self):
         MAX_VALID_STACK_PATH_COUNT = 10
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.plan.prefetch
+
+This module implements prefetching the outputs referenced by !stack_output resolvers into the
+stack outputs cache, so that resolving a batch of stacks doesn't wait on one describe_stacks call
+after another.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from sceptre.exports_catalog import (
+    describe_all_stacks,
+    describe_stack,
+    export_catalogs,
+)
+from sceptre.outputs_cache import account_key, stack_outputs_cache
+from sceptre.outputs_snapshot import active_outputs_snapshot
+from sceptre.resolvers import ResolvableProperty, Resolver
+from sceptre.resolvers.stack_output import StackOutput
+from sceptre.stack import Stack
+
+logger = logging.getLogger(__name__)
+
+# The most describe_stacks calls made at the same time while prefetching.
+MAX_WORKERS = 10
+# When at least this many stacks in the same account and region are referenced, their outputs are
+# fetched by paging through describe_stacks for every stack, rather than describing each stack.
+SWEEP_THRESHOLD = 10
+
+
+def prefetch_stack_outputs(
+    stacks: Iterable[Stack],
+    max_workers: int = MAX_WORKERS,
+    sweep_threshold: int = SWEEP_THRESHOLD,
+):
+    """
+    Fetches the outputs referenced by the unresolved !stack_output resolvers of the stacks into the
+    stack outputs cache. Outputs that are already cached are skipped. Errors are only logged; the
+    resolvers will raise them when they are resolved.
+
+    :param stacks: The stacks whose resolvers will be resolved next.
+    :param max_workers: The most describe_stacks calls to make at the same time.
+    :param sweep_threshold: The number of stacks in an account and region from which their outputs
+        are fetched by paging through all stacks.
+    """
+    if active_outputs_snapshot() is not None:
+        # Outputs are read from the snapshot, which is already in memory.
+        return
+    targets: Dict[Tuple, Dict[str, Tuple[StackOutput, tuple]]] = {}
+    for resolver in _find_stack_output_resolvers(stacks):
+        try:
+            stack_name, _, profile, region, sceptre_role = resolver.output_target()
+            account, region_key, _ = resolver._outputs_cache_key(
+                stack_name, profile, region, sceptre_role
+            )
+        except Exception as err:
+            logger.debug("Not prefetching outputs for %s: %s", resolver, err)
+            continue
+        if stack_outputs_cache.contains(account, region_key, stack_name):
+            continue
+        targets.setdefault((account, region_key), {}).setdefault(
+            stack_name, (resolver, (stack_name, profile, region, sceptre_role))
+        )
+
+    tasks = []
+    for (account, region), stack_targets in targets.items():
+        if len(stack_targets) >= sweep_threshold:
+            tasks.append((_sweep, (account, region, stack_targets)))
+        else:
+            tasks.extend(
+                (resolver._get_stack_outputs, target)
+                for resolver, target in stack_targets.values()
+            )
+    if not tasks:
+        return
+
+    logger.debug(
+        "Prefetching the outputs of %d stacks", sum(map(len, targets.values()))
+    )
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks))) as executor:
+        for future in [executor.submit(_run_task, *task) for task in tasks]:
+            future.result()
+
+
+def _run_task(func, args):
+    try:
+        func(*args)
+    except Exception as err:
+        logger.debug("Failed to prefetch stack outputs: %s", err)
+
+
+def prefetch_described_outputs(
+    stacks: Iterable[Stack], sweep_threshold: int = SWEEP_THRESHOLD
+):
+    """
+    Fetches the stacks' own outputs into the stack outputs cache, by building the export catalog
+    of each account and region with at least ``sweep_threshold`` of the stacks. The outputs of the
+    other stacks are left to be described one by one. Errors are only logged.
+
+    :param stacks: The stacks whose outputs will be described.
+    :param sweep_threshold: The number of stacks in an account and region from which their outputs
+        are fetched by paging through all stacks.
+    """
+    groups: Dict[Tuple, List[Stack]] = {}
+    for stack in stacks:
+        key = (account_key(stack.profile, stack.sceptre_role), stack.region)
+        if not export_catalogs.contains(*key):
+            groups.setdefault(key, []).append(stack)
+
+    for (account, region), group in groups.items():
+        if len(group) < sweep_threshold:
+            continue
+        connection_manager = group[0].connection_manager
+        _run_task(
+            export_catalogs.get,
+            (account, region, lambda: describe_all_stacks(connection_manager)),
+        )
+
+
+def _sweep(account, region, stack_targets):
+    resolver, (stack_name, profile, region_arg, sceptre_role) = next(
+        iter(stack_targets.values())
+    )
+    connection_manager = resolver.stack.connection_manager
+    call_kwargs = dict(
+        profile=profile,
+        region=region_arg,
+        stack_name=stack_name,
+        sceptre_role=sceptre_role,
+    )
+    # Building the catalog caches the outputs of every stack in the account and region.
+    export_catalogs.get(
+        account,
+        region,
+        lambda: describe_all_stacks(connection_manager, **call_kwargs),
+        lambda changed: describe_stack(connection_manager, changed, **call_kwargs),
+    )
+
+
+def _find_stack_output_resolvers(stacks: Iterable[Stack]) -> Iterator[StackOutput]:
+    for stack in stacks:
+        for prop in vars(type(stack)).values():
+            if isinstance(prop, ResolvableProperty):
+                # Resolved values replace their resolvers, so only unresolved ones are found.
+                yield from _find_in_value(vars(stack).get(prop.name))
+
+
+def _find_in_value(value) -> Iterator[StackOutput]:
+    if isinstance(value, StackOutput):
+        yield value
+    elif isinstance(value, Resolver):
+        yield from _find_in_value(value._argument)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _find_in_value(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _find_in_value(item)
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.plugins
+
+This module implements a process-wide registry of the template handlers, resolvers and hooks
+registered as entry points by installed distributions.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+from importlib import metadata
+from typing import Any, Dict, Optional
+
+TEMPLATE_HANDLERS = "sceptre.template_handlers"
+RESOLVERS = "sceptre.resolvers"
+HOOKS = "sceptre.hooks"
+
+PLUGIN_GROUPS = (TEMPLATE_HANDLERS, RESOLVERS, HOOKS)
+
+_DISTRIBUTION_SUFFIXES = (".dist-info", ".egg-info", ".egg-link", ".pth")
+
+
+def _distributions_fingerprint() -> str:
+    """
+    Fingerprints the installed distributions from the metadata files on sys.path. Listing and
+    stat-ing these is much cheaper than reading every distribution's entry points, and any
+    install, upgrade or removal changes at least one of them.
+
+    :returns: A hex digest identifying the set of installed distributions.
+    """
+    digest = hashlib.sha256()
+    digest.update(sys.version.encode())
+    for path_entry in sys.path:
+        try:
+            names = sorted(os.listdir(path_entry or "."))
+        except OSError:
+            continue
+        digest.update(path_entry.encode())
+        for name in names:
+            if name.endswith(_DISTRIBUTION_SUFFIXES):
+                try:
+                    mtime = os.stat(os.path.join(path_entry or ".", name)).st_mtime_ns
+                except OSError:
+                    continue
+                digest.update(f"{name}:{mtime}".encode())
+    return digest.hexdigest()
+
+
+class PluginRegistry(object):
+    """
+    Discovers the entry points of the plugin groups once, with a single scan of the installed
+    distributions, and loads each plugin at most once.
+
+    Discovery can optionally be persisted to a snapshot file, which is reused by later processes
+    for as long as the installed distributions stay the same.
+
+    :param groups: The entry point groups to discover.
+    :param snapshot_path: The path of the snapshot file, if one should be used.
+    """
+
+    def __init__(self, groups=PLUGIN_GROUPS, snapshot_path: Optional[str] = None):
+        self.logger = logging.getLogger(__name__)
+        self.groups = tuple(groups)
+        self.snapshot_path = snapshot_path
+        self._lock = threading.RLock()
+        self._entry_points: Optional[Dict[str, Dict[str, str]]] = None
+        self._plugins: Dict[tuple, Any] = {}
+
+    def reset(self):
+        """Forgets discovered entry points and loaded plugins."""
+        with self._lock:
+            self._entry_points = None
+            self._plugins = {}
+
+    def entry_points(self, group: str) -> Dict[str, str]:
+        """
+        :param group: The entry point group.
+        :returns: The object reference of every entry point in the group, keyed by name.
+        """
+        return dict(self._discover().get(group, {}))
+
+    def load(self, group: str, name: str) -> Optional[Any]:
+        """
+        Loads a single plugin.
+
+        :param group: The entry point group.
+        :param name: The entry point name.
+        :returns: The loaded plugin, or None if no such entry point is registered.
+        """
+        key = (group, name)
+        try:
+            return self._plugins[key]
+        except KeyError:
+            pass
+
+        value = self._discover().get(group, {}).get(name)
+        if value is None:
+            return None
+        with self._lock:
+            if key not in self._plugins:
+                entry_point = metadata.EntryPoint(name=name, value=value, group=group)
+                self._plugins[key] = entry_point.load()
+            return self._plugins[key]
+
+    def load_group(self, group: str) -> Dict[str, Any]:
+        """
+        Loads every plugin of a group.
+
+        :param group: The entry point group.
+        :returns: The loaded plugins, keyed by entry point name.
+        """
+        return {name: self.load(group, name) for name in self.entry_points(group)}
+
+    def _discover(self) -> Dict[str, Dict[str, str]]:
+        entry_points = self._entry_points
+        if entry_points is not None:
+            return entry_points
+
+        with self._lock:
+            if self._entry_points is None:
+                fingerprint = (
+                    _distributions_fingerprint() if self.snapshot_path else None
+                )
+                entry_points = self._read_snapshot(fingerprint)
+                if entry_points is None:
+                    entry_points = self._scan()
+                    self._write_snapshot(fingerprint, entry_points)
+                self._entry_points = entry_points
+            return self._entry_points
+
+    def _scan(self) -> Dict[str, Dict[str, str]]:
+        all_entry_points = metadata.entry_points()
+        discovered = {}
+        for group in self.groups:
+            if hasattr(all_entry_points, "select"):
+                group_entry_points = all_entry_points.select(group=group)
+            else:
+                group_entry_points = all_entry_points.get(group, ())
+            discovered[group] = {}
+            for entry_point in group_entry_points:
+                # The first distribution on sys.path to register a name wins, as with imports.
+                discovered[group].setdefault(entry_point.name, entry_point.value)
+        return discovered
+
+    def _read_snapshot(self, fingerprint: Optional[str]):
+        if not self.snapshot_path:
+            return None
+        try:
+            with open(self.snapshot_path) as snapshot_file:
+                snapshot = json.load(snapshot_file)
+        except (OSError, ValueError):
+            return None
+        if snapshot.get("fingerprint") != fingerprint or not set(self.groups) <= set(
+            snapshot.get("entry_points", {})
+        ):
+            self.logger.debug("Plugin snapshot %s is stale", self.snapshot_path)
+            return None
+        return snapshot["entry_points"]
+
+    def _write_snapshot(self, fingerprint: Optional[str], entry_points: Dict):
+        if not self.snapshot_path:
+            return
+        temporary_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        try:
+            directory = os.path.dirname(self.snapshot_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(temporary_path, "w") as snapshot_file:
+                json.dump(
+                    {"fingerprint": fingerprint, "entry_points": entry_points},
+                    snapshot_file,
+                )
+            os.replace(temporary_path, self.snapshot_path)
+        except OSError as error:
+            self.logger.debug("Unable to write plugin snapshot: %s", error)
+
+
+plugin_registry = PluginRegistry(
+    snapshot_path=os.environ.get("SCEPTRE_PLUGIN_SNAPSHOT") or None
+)
@@ -1,11 +1,25 @@
 # -*- coding: utf-8 -*-
 import abc
+import contextvars
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from threading import RLock
-from typing import Any, TYPE_CHECKING, Type, Union, TypeVar
+from threading import Lock, RLock
+from typing import (
+    Any,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TYPE_CHECKING,
+    Type,
+    Union,
+    TypeVar,
+)
 
 from sceptre.exceptions import InvalidResolverArgumentError
+from sceptre.resolvers.cache import ResolverCache, cached_resolve
+from sceptre.resolvers.profiler import resolver_profiler
 from sceptre.helpers import _call_func_on_values, delete_keys_from_containers
 from sceptre.logging import StackLoggerAdapter
 from sceptre.resolvers.placeholders import (
@@ -20,6 +34,13 @@ if TYPE_CHECKING:
 T_Container = TypeVar("T_Container", bound=Union[dict, list])
 Self = TypeVar("Self")
 
+# The (stack, property) pairs whose values are being resolved in the current context. This is kept
+# in a context variable, rather than on the stack, so that resolvers resolved concurrently on behalf
+# of a get (see ResolvableContainerProperty.max_concurrent_resolvers) can detect recursion too.
+_gets_in_progress: contextvars.ContextVar = contextvars.ContextVar(
+    "_gets_in_progress", default=frozenset()
+)
+
 
 class RecursiveResolve(Exception):
     pass
@@ -93,7 +114,8 @@ class CustomYamlTagBase:
         keys_to_delete = []
 
         def resolve(containing_list_or_dict, key, obj: Resolver):
-            result = obj.resolve()
+            with resolver_profiler.profile(obj):
+                result = obj.resolve()
             # If the resolver "resolves to nothing", then it should get deleted out of its container.
             if result is None:
                 keys_to_delete.append((containing_list_or_dict, key))
@@ -182,6 +204,14 @@ class Resolver(CustomYamlTagBase, metaclass=abc.ABCMeta):
     Resolver is an abstract base class that should be subclassed by all Resolvers.
     """
 
+    #: Declares how the resolver's results are cached, if they are; see sceptre.resolvers.cache.
+    cache: Optional[ResolverCache] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "resolve" in vars(cls):
+            cls.resolve = cached_resolve(cls, vars(cls)["resolve"])
+
     @abc.abstractmethod
     def resolve(self):
         """
@@ -214,7 +244,8 @@ class ResolvableProperty(abc.ABC):
         self.logger = logging.getLogger(__name__)
         self.placeholder_type = placeholder_type
 
-        self._lock = RLock()
+        # Only guards creating the per-stack locks; it is never held while resolving.
+        self._lock_creation_lock = Lock()
 
     def __get__(self, stack: "stack.Stack", stack_class: Type["stack.Stack"]) -> Any:
         """
@@ -225,7 +256,11 @@ class ResolvableProperty(abc.ABC):
         :return: The attribute stored with the suffix ``name`` in the instance.
         :rtype: The obtained value, as resolved by the property
         """
-        with self._lock, self._no_recursive_get(stack):
+        if stack is None:
+            # Accessed on the class rather than on a stack instance
+            return self
+
+        with self._no_recursive_get(stack), self._get_stack_lock(stack):
             if hasattr(stack, self.name):
                 return self.get_resolved_value(stack, stack_class)
 
@@ -237,27 +272,43 @@ class ResolvableProperty(abc.ABC):
         :param stack: The Stack instance the value is being set onto
         :param value: The value being set on the property
         """
-        with self._lock:
+        with self._get_stack_lock(stack):
             self.assign_value_to_stack(stack, value)
 
+    def _get_stack_lock(self, stack: "stack.Stack") -> RLock:
+        # Descriptors live on the Stack class, so a lock held on the descriptor would serialize
+        # every stack's access to this property, including the network calls made by resolvers.
+        # Instead, each stack gets its own reentrant lock for this property.
+        lock_name = f"{self.name}_lock"
+        lock = vars(stack).get(lock_name)
+        if lock is None:
+            with self._lock_creation_lock:
+                lock = vars(stack).get(lock_name)
+                if lock is None:
+                    lock = RLock()
+                    setattr(stack, lock_name, lock)
+        return lock
+
     @contextmanager
     def _no_recursive_get(self, stack: "stack.Stack"):
         # We don't care about recursive gets on the same property but different Stack instances,
         # only recursive gets on the same stack. Some Resolvers access the same property on OTHER
         # stacks and that actually shouldn't be a problem. Remember, these descriptor instances are
         # set on the CLASS and so instance variables on them are shared across all classes that
-        # access them. Thus, we set this "get_in_progress" attribute on the stack instance rather
-        # than the descriptor instance.
-        get_status_name = f"_{self.name}_get_in_progress"
-        if getattr(stack, get_status_name, False):
+        # access them. Thus, the gets in progress are tracked per stack instance rather than on the
+        # descriptor instance. This is checked before taking the stack's lock, since a resolver
+        # running on a worker thread would otherwise wait for the get that is waiting for it.
+        get_key = (id(stack), self.name)
+        in_progress = _gets_in_progress.get()
+        if get_key in in_progress:
             raise RecursiveResolve(
                 f"Resolving Stack.{self.name[1:]} required resolving itself"
             )
-        setattr(stack, get_status_name, True)
+        token = _gets_in_progress.set(in_progress | {get_key})
         try:
             yield
         finally:
-            setattr(stack, get_status_name, False)
+            _gets_in_progress.reset(token)
 
     @abc.abstractmethod
     def get_resolved_value(
@@ -281,7 +332,8 @@ class ResolvableProperty(abc.ABC):
         :return: The resolved value (or placeholder, in certain circumstances)
         """
         try:
-            return resolver.resolve()
+            with resolver_profiler.profile(resolver):
+                return resolver.resolve()
         except RecursiveResolve:
             # Recursive resolve issues shouldn't be masked by a placeholder.
             raise
@@ -315,12 +367,19 @@ class ResolvableContainerProperty(ResolvableProperty):
     :type name: str
     """
 
+    #: The maximum number of resolvers in a container that are resolved at the same time, on a pool
+    #: of threads. With the default of 1, resolvers are resolved one after another on the calling
+    #: thread.
+    max_concurrent_resolvers = 1
+
     def __get__(
         self, stack: "stack.Stack", stack_class: Type["stack.Stack"]
     ) -> T_Container:
         container = super().__get__(stack, stack_class)
+        if stack is None:
+            return container
 
-        with self._lock:
+        with self._get_stack_lock(stack):
             # Resolve any deferred resolvers, now that the recursive get lock has been released.
             self._resolve_deferred_resolvers(stack, container)
 
@@ -338,24 +397,23 @@ class ResolvableContainerProperty(ResolvableProperty):
         :return: The fully resolved container.
         """
         keys_to_delete = []
+        container = getattr(stack, self.name)
 
-        def resolve(attr: Union[dict, list], key: Union[int, str], value: Resolver):
-            # Update the container key's value with the resolved value, if possible...
-            try:
-                result = self.resolve_resolver_value(value)
-                if result is None:
-                    self.logger.debug(
-                        f"Removing item {key} because resolver returned None."
-                    )
-                    # We gather up resolvers (and their immediate containers) that resolve to None,
-                    # since that really means the resolver resolves to nothing. This is not common,
-                    # but should be supported. We gather these rather than immediately remove them
-                    # because this function is called in the context of looping over that attr, so
-                    # we cannot alter its size until after the loop is complete.
-                    keys_to_delete.append((attr, key))
-                else:
-                    attr[key] = result
-            except RecursiveResolve:
+        resolvers = []
+        _call_func_on_values(
+            lambda attr, key, value: resolvers.append((attr, key, value)),
+            container,
+            Resolver,
+        )
+        if self.max_concurrent_resolvers > 1 and len(resolvers) > 1:
+            outcomes = self._resolve_concurrently([value for _, _, value in resolvers])
+        else:
+            # A generator, so that each resolver is only resolved once the previous one's result
+            # has been put in the container, and nothing more is resolved after an error.
+            outcomes = (self._resolve_outcome(value) for _, _, value in resolvers)
+
+        for (attr, key, value), (result, error) in zip(resolvers, outcomes):
+            if isinstance(error, RecursiveResolve):
                 # It's possible that resolving the resolver might attempt to access another
                 # resolvable property's value in this same container. In this case, we'll delay
                 # resolution and instead return a ResolveLater so the value can be resolved outside
@@ -364,15 +422,54 @@ class ResolvableContainerProperty(ResolvableProperty):
                     stack,
                     self.name,
                     key,
-                    lambda: value.resolve(),
+                    lambda value=value: value.resolve(),
+                )
+            elif error is not None:
+                raise error
+            elif result is None:
+                self.logger.debug(
+                    f"Removing item {key} because resolver returned None."
                 )
+                # We gather up resolvers (and their immediate containers) that resolve to None,
+                # since that really means the resolver resolves to nothing. This is not common,
+                # but should be supported. We gather these rather than immediately remove them
+                # because removing list items would change the indexes of the other resolvers.
+                keys_to_delete.append((attr, key))
+            else:
+                # Update the container key's value with the resolved value.
+                attr[key] = result
 
-        container = getattr(stack, self.name)
-        _call_func_on_values(resolve, container, Resolver)
         delete_keys_from_containers(keys_to_delete)
 
         return container
 
+    def _resolve_outcome(self, resolver: Resolver) -> Tuple[Any, Optional[Exception]]:
+        try:
+            return self.resolve_resolver_value(resolver), None
+        except Exception as error:
+            return None, error
+
+    def _resolve_concurrently(
+        self, resolvers: Iterable[Resolver]
+    ) -> List[Tuple[Any, Optional[Exception]]]:
+        """Resolves the resolvers on a bounded pool of threads, returning the result or error of each,
+        in order. Each resolver runs in a copy of the calling context, so it sees the gets that are in
+        progress and still raises RecursiveResolve when it accesses this property of the same stack.
+
+        :param resolvers: The resolvers to resolve
+        :return: A (result, error) pair for each resolver
+        """
+        resolvers = list(resolvers)
+        max_workers = min(self.max_concurrent_resolvers, len(resolvers))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run, self._resolve_outcome, resolver
+                )
+                for resolver in resolvers
+            ]
+            return [future.result() for future in futures]
+
     def assign_value_to_stack(self, stack: "stack.Stack", value: Union[dict, list]):
         """Assigns a COPY of the specified value to the stack instance. This method copies the value
         rather than directly assigns it to avoid bugs related to shared objects in memory.
@@ -10,35 +10,189 @@ of the commands from global config, pipes, and backtick substitution:
 
     !bash_resolver
       echo "arn:aws:kms:{{environment_config.region}}:{{environment_config.account_id}}:key/`AWS_PROFILE={{environment_config.profile}} aws kms list-aliases | jq -r '.Aliases[]|select(.AliasName=="alias/core-ssm").TargetKeyId'`"
+
+The same command, run from the same directory with the same relevant
+environment (AWS_* variables, `env`, `stack`, and any variable the command
+mentions), only runs once per plan, however many stacks use it. Options
+can be given by passing a dict instead of a string:
+
+    !bash_resolver
+      command: ./scripts/slow-lookup.sh
+      timeout: 30
+
+Commands whose output changes from run to run (or that have side effects)
+should opt out of sharing with `cache: false`:
+
+    !bash_resolver
+      command: date +%s
+      cache: false
+
+Environment variables:
+
+    SCEPTRE_BASH_RESOLVER_CONCURRENCY: the most commands run at once (4)
+    SCEPTRE_BASH_RESOLVER_TIMEOUT: seconds before a command is killed (none)
+    SCEPTRE_BASH_RESOLVER_CACHE_TTL: seconds to also keep results on disk,
+        in SCEPTRE_BASH_RESOLVER_CACHE_DIR, across runs (off). results are
+        written readable only by the current user, but only turn this on
+        for commands whose output isn't secret. set when sceptre starts.
 """
 from __future__ import absolute_import
 import os
+import re
 import subprocess
+import threading
+import time
 from sceptre.resolvers import Resolver
+from sceptre.resolvers.cache import CacheScope, ResolverCache
+from sceptre.resolvers.profiler import resolver_profiler
 
 # from devops import (util, )
 
-SCEPTRE_ROOT = os.environ["SCEPTRE_ROOT"]
+CONCURRENCY_ENV = "SCEPTRE_BASH_RESOLVER_CONCURRENCY"
+DEFAULT_CONCURRENCY = 4
+TIMEOUT_ENV = "SCEPTRE_BASH_RESOLVER_TIMEOUT"
+CACHE_TTL_ENV = "SCEPTRE_BASH_RESOLVER_CACHE_TTL"
+CACHE_DIR_ENV = "SCEPTRE_BASH_RESOLVER_CACHE_DIR"
+
+# environment variables that change what commands do without being mentioned
+RELEVANT_ENV = ("env", "stack")
+RELEVANT_ENV_PREFIXES = ("AWS_",)
+ENV_REFERENCE = re.compile(r"\$\{?([A-Za-z_][A-Za-z0-9_]*)")
+
+
+def _results_cache():
+    """
+    results by (command, cwd, relevant env), for the plan, and on disk too
+    when SCEPTRE_BASH_RESOLVER_CACHE_TTL is set
+    """
+    ttl = float(os.environ.get(CACHE_TTL_ENV) or 0)
+    if ttl <= 0:
+        return ResolverCache(CacheScope.plan, name="bash_resolver")
+    return ResolverCache(
+        CacheScope.disk,
+        ttl=ttl,
+        directory=os.environ.get(CACHE_DIR_ENV),
+        name="bash_resolver",
+    )
+
+
+RESULTS = _results_cache()
+# counts and timings of the commands actually run, for the report
+STATS = dict(runs=0, seconds=0.0)
+STATS_LOCK = threading.Lock()
+_semaphore = None
+
+
+def stats():
+    """a copy of the counts and timings, for the resolver profile report"""
+    with STATS_LOCK:
+        return dict(STATS, seconds=round(STATS["seconds"], 4))
+
+
+resolver_profiler.add_source("bash_resolver", stats)
+
+
+def semaphore():
+    """the semaphore bounding how many commands run at once, in any thread"""
+    global _semaphore
+    with STATS_LOCK:
+        if _semaphore is None:
+            limit = int(os.environ.get(CONCURRENCY_ENV) or DEFAULT_CONCURRENCY)
+            _semaphore = threading.BoundedSemaphore(max(limit, 1))
+        return _semaphore
+
+
+def relevant_env(cmd):
+    """the environment variables that may change the output of cmd"""
+    names = set(ENV_REFERENCE.findall(cmd)).union(RELEVANT_ENV)
+    return tuple(
+        sorted(
+            (name, value)
+            for name, value in os.environ.items()
+            if name in names or name.startswith(RELEVANT_ENV_PREFIXES)
+        )
+    )
+
+
+def execute(cmd, cwd, timeout=None):
+    """
+    chains to bash and returns the result, running at most
+    SCEPTRE_BASH_RESOLVER_CONCURRENCY commands at a time
+    """
+    with semaphore():
+        start = time.time()
+        try:
+            result = subprocess.run(
+                ["bash", "-c", cmd],
+                cwd=cwd,
+                check=True,
+                stdout=subprocess.PIPE,
+                timeout=timeout,
+            ).stdout
+        finally:
+            with STATS_LOCK:
+                STATS["runs"] += 1
+                STATS["seconds"] += time.time() - start
+    result = result.strip()
+    if isinstance(result, bytes):
+        result = result.decode("utf-8")
+    return result
+
+
+def run(cmd, cwd, timeout=None):
+    """
+    chains to bash and returns the result, running each distinct command
+    (see relevant_env) once per plan. failures aren't remembered, the next
+    resolve tries again
+    """
+    key = (cmd, cwd, relevant_env(cmd))
+    return RESULTS.lookup(key, lambda: execute(cmd, cwd, timeout))
 
 
 class bash_resolver(Resolver):
     def __init__(self, *args, **kwargs):
         super(bash_resolver, self).__init__(*args, **kwargs)
 
+    @property
+    def command(self):
+        if isinstance(self.argument, dict):
+            return self.argument["command"]
+        return self.argument
+
+    @property
+    def shared(self):
+        """whether the result is shared with identical commands (see run)"""
+        if isinstance(self.argument, dict):
+            cache = str(self.argument.get("cache", True)).lower()
+            return cache not in ("false", "no", "0")
+        return True
+
+    @property
+    def timeout(self):
+        timeout = os.environ.get(TIMEOUT_ENV)
+        if isinstance(self.argument, dict):
+            timeout = self.argument.get("timeout", timeout)
+        return float(timeout) if timeout else None
+
     def exec_cmd(self, cmd):
-        """chains to bash and returns the result"""
-        result = subprocess.check_output(
-            ["bash", "-c", cmd], cwd=SCEPTRE_ROOT).strip()
-        if isinstance(result, bytes):
-            return result.decode("utf-8")
-        else:
-            return result
+        """chains to bash and returns the (shared) result"""
+        timeout = self.timeout
+        try:
+            if not self.shared:
+                return execute(cmd, os.environ["SCEPTRE_ROOT"], timeout)
+            return run(cmd, os.environ["SCEPTRE_ROOT"], timeout)
+        except subprocess.TimeoutExpired:
+            raise RuntimeError(
+                "{}: timed out after {}s: {}".format(
+                    self.__class__.__name__, timeout, cmd
+                )
+            )
 
     def resolve(self):
         """main entry point, overridden from Resolver class"""
         msg = "{}: \n  {}".format(
-            self.__class__.__name__, self.argument).strip()
+            self.__class__.__name__, self.command).strip()
         self.logger.info(msg.strip())
-        tmp = self.exec_cmd(self.argument)
+        tmp = self.exec_cmd(self.command)
         self.logger.info("  {}{}".format((" ⇢  "), tmp))
         return tmp
@@ -0,0 +1,426 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.resolvers.cache
+
+This module implements declarative caching of resolver results. A Resolver subclass opts in by
+declaring a ResolverCache as its ``cache`` class attribute (or with the cache_resolver class
+decorator), which sets how long results are kept and which stack attributes, besides the
+argument, they depend on::
+
+    class my_lookup(Resolver):
+        cache = ResolverCache(CacheScope.disk, stack_attributes=("region",), ttl=3600)
+
+        def resolve(self):
+            ...
+
+Concurrent resolves of the same key share a single call to resolve, and failures are never
+cached.
+
+Stack and plan scoped results are kept in the PlanCaches of the plan they were resolved for,
+which a SceptrePlan activates while it loads and executes its stacks, so that plans running in
+the same process neither share nor clear each other's results.
+
+Resolvers whose results are built from lookups shared across arguments (e.g. one listing of an
+account's buckets, filtered differently by each resolver) can instead keep a named ResolverCache
+and look their own keys up in it with ResolverCache.lookup::
+
+    LISTINGS = ResolverCache(CacheScope.process, ttl=300, name="bucket_listings")
+
+    def list_buckets(account, connection_manager):
+        return LISTINGS.lookup(("buckets", account), lambda: ...)
+"""
+
+import contextlib
+import contextvars
+import functools
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sceptre.resolvers.profiler import resolver_profiler
+
+if TYPE_CHECKING:
+    from sceptre import resolvers
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIRECTORY = os.path.join("~", ".cache", "sceptre", "resolvers")
+
+
+class CacheScope(Enum):
+    stack = 1  # Shared by the resolvers of one stack, for one plan
+    plan = 2  # Shared by every stack, for one plan
+    process = 3  # Shared by every stack, for the life of the process
+    disk = 4  # Like process, and also kept on disk for ttl seconds across runs
+
+
+class ResolverCache(object):
+    """
+    Declares how the results of a Resolver subclass (and its subclasses) are cached.
+
+    :param scope: How long, and by which stacks, results are shared.
+    :param stack_attributes: The names of stack attributes the result depends on, besides the
+        resolver's argument, e.g. "region". A dotted name looks up keys in dict attributes, e.g.
+        "stack_group_config.project_code".
+    :param ttl: The seconds results are kept, or None to keep them for the whole scope. Required
+        for the disk scope.
+    :param max_size: The most results kept in memory, the least recently used being evicted first.
+    :param directory: The directory disk-scoped results are kept in, under a subdirectory for each
+        resolver class.
+    :param name: The name the cache is reported and kept on disk under; defaults to the name of
+        the resolver class it is declared on.
+    """
+
+    #: When True, as set by ``--refresh-resolver-cache``, results kept on disk by earlier runs are
+    #: ignored (and replaced). Results are still shared within the run.
+    refresh = False
+
+    def __init__(
+        self,
+        scope: CacheScope = CacheScope.plan,
+        stack_attributes: Iterable[str] = (),
+        ttl: Optional[float] = None,
+        max_size: int = 1024,
+        directory: Optional[str] = None,
+        name: Optional[str] = None,
+    ):
+        if scope is CacheScope.disk and not ttl:
+            raise ValueError("Disk-scoped resolver caches require a ttl")
+        self.scope = scope
+        self.stack_attributes = tuple(stack_attributes)
+        self.ttl = ttl
+        self.max_size = max_size
+        self.directory = directory
+        self.name = name
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, _Entry]" = OrderedDict()
+        self._stats = dict(hits=0, misses=0, disk_hits=0, evictions=0, errors=0)
+        _caches.add(self)
+
+    def __set_name__(self, owner: type, name: str):
+        self.name = self.name or owner.__name__
+
+    def get(
+        self, resolver: "resolvers.Resolver", owner: type, resolve: Callable[[], Any]
+    ) -> Any:
+        """
+        Returns the cached result for the resolver, calling resolve to get it unless it is
+        cached.
+
+        :param resolver: The resolver being resolved.
+        :param owner: The class whose resolve method is being called, which is part of the key so
+            that a subclass's resolve can call its parent's.
+        :param resolve: Returns the resolver's result.
+        """
+        return self.lookup(self.key(resolver, owner), resolve)
+
+    def lookup(self, key: tuple, load: Callable[[], Any]) -> Any:
+        """
+        Returns the result cached under a key, calling load to get it unless it is cached.
+        Concurrent lookups of the same key share a single call to load.
+
+        :param key: The key, which must be JSON-able for results to be kept on disk.
+        :param load: Returns the result.
+        """
+        entries = self._scope_entries()
+        with self._lock:
+            entry = entries.get(key)
+            if entry is not None and entry.expired(self.ttl):
+                del entries[key]
+                entry = None
+            is_owner = entry is None
+            if is_owner:
+                entry = entries[key] = _Entry()
+                self._stats["misses"] += 1
+                self._evict(entries)
+            else:
+                entries.move_to_end(key)
+                self._stats["hits"] += 1
+
+        if not is_owner:
+            resolver_profiler.record_cache_hit()
+            return entry.future.result()
+
+        try:
+            value, age = self._read_disk(key)
+            if value is _MISSING:
+                value = load()
+                self._write_disk(key, value)
+            else:
+                # Expires from memory when it does on disk
+                entry.created -= age
+        except Exception as error:
+            with self._lock:
+                self._stats["errors"] += 1
+                if entries.get(key) is entry:
+                    del entries[key]
+            entry.future.set_exception(error)
+            raise
+        entry.future.set_result(value)
+        return value
+
+    def key(self, resolver: "resolvers.Resolver", owner: type) -> tuple:
+        """
+        Returns the key the resolver's result is cached by: the resolver and owner classes, the
+        resolved argument, the declared stack attributes and, for the stack scope, the stack.
+        """
+        stack = resolver.stack
+        context = tuple(
+            _freeze(_lookup(stack, attribute)) for attribute in self.stack_attributes
+        )
+        key = (
+            _qualified_name(type(resolver)),
+            _qualified_name(owner),
+            _freeze(resolver.argument),
+            context,
+        )
+        if self.scope is CacheScope.stack:
+            key += (id(stack),)
+        return key
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the cache's hit, miss, disk hit, eviction and error counts."""
+        entries = self._scope_entries()
+        with self._lock:
+            return dict(self._stats, size=len(entries))
+
+    def clear(self):
+        """
+        Forgets all results kept in memory (for the active plan, if stack or plan scoped), and
+        resets the stats.
+        """
+        entries = self._scope_entries()
+        with self._lock:
+            entries.clear()
+            for name in self._stats:
+                self._stats[name] = 0
+
+    def _scope_entries(self) -> "OrderedDict[tuple, _Entry]":
+        if self.scope in (CacheScope.stack, CacheScope.plan):
+            return active_plan_caches().entries(self)
+        return self._entries
+
+    def _evict(self, entries: "OrderedDict[tuple, _Entry]"):
+        while len(entries) > self.max_size:
+            entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _disk_path(self, key: tuple) -> Optional[str]:
+        if self.scope is not CacheScope.disk:
+            return None
+        try:
+            dumped = json.dumps(key)
+        except (TypeError, ValueError):
+            return None
+        directory = os.path.expanduser(self.directory or DEFAULT_DIRECTORY)
+        digest = hashlib.sha256(dumped.encode("utf-8")).hexdigest()
+        return os.path.join(directory, self.name or str(key[0]), digest + ".json")
+
+    def _read_disk(self, key: tuple) -> Tuple[Any, float]:
+        path = self._disk_path(key)
+        if path is None or ResolverCache.refresh:
+            return _MISSING, 0.0
+        try:
+            with open(path) as fhandle:
+                cached = json.load(fhandle)
+            age = time.time() - cached["time"]
+            value = cached["value"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return _MISSING, 0.0
+        if age > self.ttl:
+            return _MISSING, 0.0
+        with self._lock:
+            self._stats["disk_hits"] += 1
+        resolver_profiler.record_cache_hit()
+        return value, max(age, 0.0)
+
+    def _write_disk(self, key: tuple, value: Any):
+        path = self._disk_path(key)
+        if path is None:
+            return
+        try:
+            dumped = json.dumps({"time": time.time(), "value": value})
+        except (TypeError, ValueError):
+            logger.debug("Not caching a result of %s on disk: not JSON", self.name)
+            return
+        try:
+            os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+            tmp_path = "{}.{}.tmp".format(path, threading.get_ident())
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as fhandle:
+                fhandle.write(dumped)
+            os.replace(tmp_path, path)
+        except OSError as error:
+            logger.debug("Could not cache a result of %s on disk: %s", self.name, error)
+
+
+class _Entry(object):
+    __slots__ = ("future", "created")
+
+    def __init__(self):
+        self.future = Future()
+        self.created = time.monotonic()
+
+    def expired(self, ttl: Optional[float]) -> bool:
+        return (
+            bool(ttl) and self.future.done() and time.monotonic() - self.created > ttl
+        )
+
+
+class PlanCaches(object):
+    """
+    Keeps the stack and plan scoped results of every ResolverCache, and any other state a
+    resolver keeps for one plan (see plan_local), for one plan. A SceptrePlan activates its own
+    while it loads and executes its stacks; the executor's threads run in copies of that context.
+    Outside of any plan, a process-wide default is used.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: "weakref.WeakKeyDictionary[ResolverCache, OrderedDict]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._locals: Dict[str, Any] = {}
+
+    def entries(self, cache: ResolverCache) -> "OrderedDict[tuple, _Entry]":
+        """Returns the plan's entries for a cache, which the cache guards with its own lock."""
+        with self._lock:
+            entries = self._entries.get(cache)
+            if entries is None:
+                entries = self._entries[cache] = OrderedDict()
+            return entries
+
+    def local(self, name: str, factory: Callable[[], Any]) -> Any:
+        """Returns the plan's object kept under a name, creating it with factory the first time."""
+        with self._lock:
+            if name not in self._locals:
+                self._locals[name] = factory()
+            return self._locals[name]
+
+    def clear(self):
+        """Forgets everything kept for the plan."""
+        with self._lock:
+            self._entries.clear()
+            self._locals.clear()
+
+    @contextlib.contextmanager
+    def activate(self):
+        """Makes these the active plan caches in the current context, within the with block."""
+        token = _active_plan_caches.set(self)
+        try:
+            yield self
+        finally:
+            _active_plan_caches.reset(token)
+
+
+_MISSING = object()
+_caches: "weakref.WeakSet[ResolverCache]" = weakref.WeakSet()
+_active_plan_caches: contextvars.ContextVar = contextvars.ContextVar(
+    "_active_plan_caches", default=PlanCaches()
+)
+
+
+def cache_resolver(
+    scope: CacheScope = CacheScope.plan,
+    stack_attributes: Iterable[str] = (),
+    ttl: Optional[float] = None,
+    max_size: int = 1024,
+    directory: Optional[str] = None,
+) -> Callable[[type], type]:
+    """
+    A class decorator declaring a ResolverCache for a Resolver subclass; see ResolverCache for
+    the parameters.
+    """
+
+    def decorate(resolver_class: type) -> type:
+        cache = ResolverCache(scope, stack_attributes, ttl, max_size, directory)
+        cache.__set_name__(resolver_class, "cache")
+        resolver_class.cache = cache
+        return resolver_class
+
+    return decorate
+
+
+def cached_resolve(owner: type, resolve: Callable) -> Callable:
+    """
+    Wraps a Resolver subclass's resolve method so that it goes through the class's cache, if
+    it declares one.
+
+    :param owner: The class defining the resolve method.
+    :param resolve: The resolve method.
+    """
+
+    @functools.wraps(resolve)
+    def decorated(self, *args, **kwargs):
+        cache = type(self).cache
+        if cache is None or args or kwargs:
+            return resolve(self, *args, **kwargs)
+        return cache.get(self, owner, lambda: resolve(self))
+
+    return decorated
+
+
+def active_plan_caches() -> PlanCaches:
+    """Returns the caches of the plan active in the current context."""
+    return _active_plan_caches.get()
+
+
+def plan_local(name: str, factory: Callable[[], Any]) -> Any:
+    """
+    Returns an object a resolver keeps outside of ResolverCaches for the active plan (e.g. values
+    fetched in batches for the whole plan), calling factory to create it for each plan.
+
+    :param name: The name the object is kept under, e.g. the resolver's module name.
+    :param factory: Returns a new object.
+    """
+    return active_plan_caches().local(name, factory)
+
+
+def clear_plan_caches():
+    """Forgets the stack and plan scoped results of every resolver for the active plan."""
+    active_plan_caches().clear()
+
+
+def cache_stats() -> List[Dict[str, Any]]:
+    """Returns the stats of every resolver cache that has been used, by resolver class."""
+    stats = []
+    for cache in list(_caches):
+        cache_stats = cache.stats()
+        if cache_stats["hits"] or cache_stats["misses"]:
+            stats.append(dict(cache_stats, resolver=cache.name, scope=cache.scope.name))
+    return sorted(stats, key=lambda item: item["resolver"] or "")
+
+
+def _qualified_name(cls: type) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def _lookup(stack, attribute: str) -> Any:
+    if stack is None:
+        return None
+    name, *keys = attribute.split(".")
+    value = getattr(stack, name, None)
+    for key in keys:
+        value = value.get(key) if isinstance(value, dict) else None
+    return value
+
+
+def _freeze(value: Any) -> Any:
+    """Returns a hashable (and, for plain data, JSON-able) equivalent of the value."""
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return repr(value)
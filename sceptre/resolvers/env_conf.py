@@ -1,19 +1,13 @@
 """
 """
 from __future__ import absolute_import
-import os
-import yaml
+from sceptre.env_config import env_config_store
 from sceptre.resolvers.stack_output import Resolver
-from sceptre.context import SceptreContext
 
 from devops import (
     util,
 )
 
-ENV_CACHE = {}
-CM_CACHE = {}
-RESULTS_CACHE = {}
-
 # use our  logger, the formatter is nicer than sceptre
 LOGGER = util.get_logger(__name__)
 
@@ -25,9 +19,6 @@ class EnvConf(Resolver):
         !env_conf env_name::var_name
     """
 
-    env_cache = {}
-    cm_cache = {}
-
     def __init__(self, *args, **kwargs):
         # argument = kwargs.pop('argument', None)
         super(EnvConf, self).__init__(*args, **kwargs)
@@ -61,22 +52,7 @@ class EnvConf(Resolver):
         returns an object for the external environment we care
         about to resolve the export mentioned by self.argument
         """
-        s = SceptreContext(
-            command_path=os.environ["SCEPTRE_ROOT"],
-            project_path=os.environ["SCEPTRE_ROOT"],
-        )
-        conf_file = os.path.join(s.full_config_path(),
-                                 self.env_name, "config.yaml")
-        with open(conf_file, "r") as fhandle:
-            return yaml.load(fhandle.read(), Loader=yaml.FullLoader)
-        # if self.env_name not in ENV_CACHE:
-        #     # block duplicated in hooks/provision.py; this is ugly but
-        #     # prevents further divergence from upstream in our sceptre fork
-        #     assert sceptre.__version__ == '1.3.4'
-        #     ENV_CACHE[self.env_name] = cli.get_env(
-        #         os.environ['SCEPTRE_ROOT'],
-        #         self.env_name, {})
-        # return ENV_CACHE[self.env_name]
+        return env_config_store.get(self.env_name)
 
     @property
     def env_config(self):
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 
+from sceptre.file_cache import file_contents_cache
 from sceptre.resolvers import Resolver
 
 
@@ -16,13 +17,13 @@ class FileContents(Resolver):
 
     def resolve(self):
         """
-        Retrieves the contents of a file at a given absolute file path.
+        Retrieves the contents of a file at a given absolute file path. Contents are shared
+        through the process-wide file contents cache until the file changes.
 
         :returns: Contents of file.
         :rtype: str
         """
         try:
-            with open(self.argument, "r") as file:
-                return file.read()
+            return file_contents_cache.read(self.argument)
         except (EnvironmentError, TypeError) as e:
             raise e
@@ -1,11 +1,129 @@
 """ filter_buckets_by_tag
+
+the bucket list, and the tags of every bucket, of each account are fetched
+once and shared by every !all_buckets and !filter_buckets resolver (and
+every thread) for SCEPTRE_BUCKET_CACHE_TTL seconds. the tags of an
+account's buckets are fetched concurrently, with at most
+SCEPTRE_BUCKET_TAGS_CONCURRENCY get_bucket_tagging calls at a time.
+
+Environment variables:
+
+    SCEPTRE_BUCKET_CACHE_TTL: seconds bucket lists and tags are reused (300)
+    SCEPTRE_BUCKET_CACHE_DIR: also keep them on disk, in this directory, so
+        later runs (e.g. the next CI step) reuse them within the ttl (off).
+        listings made with default credentials (no profile or role) are
+        never kept on disk, as the next run's may be another account's
+    SCEPTRE_BUCKET_TAGS_CONCURRENCY: the most get_bucket_tagging calls made
+        at once (10)
 """
 from __future__ import absolute_import
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import ClientError
+from sceptre.env_config import env_config_store
+from sceptre.outputs_cache import account_key
+from sceptre.resolvers.cache import CacheScope, ResolverCache
+from sceptre.resolvers.profiler import resolver_profiler
+from sceptre.resolvers.stack_export import external_connection_manager
 from sceptre.resolvers.stack_output import Resolver
 from devops import api, util
 
 LOGGER = util.get_logger(__name__)
 
+TTL_ENV = "SCEPTRE_BUCKET_CACHE_TTL"
+DEFAULT_TTL = 300
+CACHE_DIR_ENV = "SCEPTRE_BUCKET_CACHE_DIR"
+CONCURRENCY_ENV = "SCEPTRE_BUCKET_TAGS_CONCURRENCY"
+DEFAULT_CONCURRENCY = 10
+# get_bucket_tagging errors that mean the bucket has no tags (or is gone)
+UNTAGGED_ERRORS = ("NoSuchTagSet", "NoSuchBucket")
+
+
+def _listings_cache():
+    """
+    bucket lists and tags by (what, account), for the process, and on disk
+    too when SCEPTRE_BUCKET_CACHE_DIR is set
+    """
+    ttl = float(os.environ.get(TTL_ENV) or DEFAULT_TTL)
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if not cache_dir:
+        return ResolverCache(CacheScope.process, ttl=ttl, name="buckets")
+    return ResolverCache(
+        CacheScope.disk, ttl=ttl, directory=cache_dir, name="buckets"
+    )
+
+
+LISTINGS = _listings_cache()
+# default credentials may be another account's on the next run
+DEFAULT_CREDENTIALS_LISTINGS = ResolverCache(
+    CacheScope.process, ttl=LISTINGS.ttl, name="buckets (default credentials)"
+)
+# get_bucket_tagging calls made, for the report
+STATS = dict(tag_calls=0)
+STATS_LOCK = threading.Lock()
+
+
+def stats():
+    """a copy of the counts, for the resolver profile report"""
+    with STATS_LOCK:
+        return dict(STATS)
+
+
+resolver_profiler.add_source("buckets", stats)
+
+
+def _listings(account):
+    """the cache an account's bucket lists and tags are kept in"""
+    if account is None and LISTINGS.scope is CacheScope.disk:
+        return DEFAULT_CREDENTIALS_LISTINGS
+    return LISTINGS
+
+
+def list_buckets(account, connection_manager):
+    """the names of the account's buckets"""
+    def load():
+        resp = connection_manager.call(service="s3", command="list_buckets")
+        return [x["Name"] for x in resp["Buckets"]]
+
+    return _listings(account).lookup(("buckets", account), load)
+
+
+def bucket_tags(account, connection_manager):
+    """the tags of each of the account's buckets, by bucket name"""
+    def tags_of(bucket):
+        with STATS_LOCK:
+            STATS["tag_calls"] += 1
+        try:
+            resp = connection_manager.call(
+                service="s3",
+                command="get_bucket_tagging",
+                kwargs={"Bucket": bucket},
+            )
+        except ClientError as err:
+            code = err.response["Error"]["Code"]
+            if code not in UNTAGGED_ERRORS:
+                # e.g. AccessDenied, or a bucket in another region: the
+                # bucket is left out rather than failing every filter
+                LOGGER.error(
+                    "could not get the tags of {} ({}), treating it as untagged".format(
+                        bucket, code
+                    )
+                )
+            return {}
+        return {tag["Key"]: tag["Value"] for tag in resp.get("TagSet", [])}
+
+    def load():
+        buckets = list_buckets(account, connection_manager)
+        if not buckets:
+            return {}
+        limit = int(os.environ.get(CONCURRENCY_ENV) or DEFAULT_CONCURRENCY)
+        workers = min(max(limit, 1), len(buckets))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(buckets, executor.map(tags_of, buckets)))
+
+    return _listings(account).lookup(("tags", account), load)
+
 
 class FilterBuckets(Resolver):
     """Returns all exports for a given stack
@@ -15,8 +133,26 @@ class FilterBuckets(Resolver):
 
         # get buckets by environment that have the given tag value
         !filter_buckets env=legacy, tag=DevReadOnly, value=...
+
+    with env, the env's buckets are listed and tagged once and shared by
+    every resolver; without it, devops.api.bucket_tags filters as it always
+    has
     """
 
+    def account(self):
+        """the account key and connection manager buckets are listed with"""
+        return (
+            account_key(self.stack.profile, self.stack.sceptre_role),
+            self.stack.connection_manager,
+        )
+
+    def env_account(self, env_name):
+        config = env_config_store.get(env_name)
+        return (
+            account_key(config.get("profile"), config.get("iam_role")),
+            external_connection_manager(env_name),
+        )
+
     def resolve(self):
         """main method for resolver"""
         tmp = self.argument.split(",")
@@ -28,7 +164,16 @@ class FilterBuckets(Resolver):
             LOGGER.critical("error converting to dict: {}".format(tmp))
             raise
         LOGGER.debug("dispatching with {}".format(kwargs))
-        result = api.bucket_tags(**kwargs)
+        if kwargs.get("env"):
+            account, connection_manager = self.env_account(kwargs["env"])
+            tag, value = kwargs["tag"], kwargs.get("value")
+            result = [
+                bucket
+                for bucket, tags in bucket_tags(account, connection_manager).items()
+                if tag in tags and (value is None or tags[tag] == value)
+            ]
+        else:
+            result = api.bucket_tags(**kwargs)
         LOGGER.debug("resolved: {}".format(result))
         if not result:
             err = (
@@ -50,6 +195,4 @@ class AllBuckets(FilterBuckets):
     """
 
     def resolve(self):
-        resp = self.stack.connection_manager.call(
-            service="s3", command="list_buckets")
-        return [x["Name"] for x in resp["Buckets"]]
+        return list(list_buckets(*self.account()))
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.resolvers.highlighting
+
+This module implements the syntax highlighting the 605 resolvers colour their log messages with.
+pygments is slow to import and set up, so it is only imported, and each lexer and formatter only
+built, the first time a message is highlighted.
+"""
+
+import functools
+from typing import Callable
+
+
+@functools.lru_cache(maxsize=None)
+def _pygments_highlighter(lexer_name: str, style: str) -> Callable[[str], str]:
+    from pygments import formatters, highlight, lexers
+
+    lexer = lexers.get_lexer_by_name(lexer_name)
+    formatter = formatters.Terminal256Formatter(style=style)
+    return lambda x: highlight(x, lexer, formatter)
+
+
+def highlighter(x: str, lexer_name: str = "python", style: str = "rrt") -> str:
+    """
+    Returns the text highlighted for a 256 colour terminal.
+
+    :param x: The text.
+    :param lexer_name: The name of the pygments lexer to highlight it with.
+    :param style: The name of the pygments style to colour it with.
+    """
+    return _pygments_highlighter(lexer_name, style)(x)
@@ -4,8 +4,10 @@ and inserts it into sceptre (and therefore cloudformation) runtimes
 """
 from __future__ import absolute_import
 import os
-import boto3
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from sceptre.resolvers import Resolver
+from sceptre.resolvers.cache import CacheScope, ResolverCache
 from dateutil import parser
 from devops import (
     util,
@@ -26,10 +28,47 @@ AWS_PROFILE = ["605-management", "605-legacy"]
 # use our logger, the formatter is nicer than sceptre
 LOGGER = util.get_logger("resolvers." + __name__)
 
+# Set SCEPTRE_LOOKUP_AMI_CACHE_TTL to a number of seconds to also keep query
+# results on disk (in SCEPTRE_LOOKUP_AMI_CACHE_DIR), so that runs close
+# together don't repeat the slow describe_images calls.
+CACHE_TTL_ENV = "SCEPTRE_LOOKUP_AMI_CACHE_TTL"
+CACHE_DIR_ENV = "SCEPTRE_LOOKUP_AMI_CACHE_DIR"
+
+# shared by every lookup_ami in the process: ec2 clients by (profile, region)
+CLIENTS = {}
+CACHE_LOCK = threading.Lock()
+# (profile, region) of the management queries that failed (most users
+# can't query management): they aren't tried again for the process
+FAILED_MANAGEMENT_QUERIES = set()
+
+
+def _queries_cache():
+    """
+    describe_images results by (region, account, normalized filters), for
+    the process, and on disk too when SCEPTRE_LOOKUP_AMI_CACHE_TTL is set
+    """
+    ttl = float(os.environ.get(CACHE_TTL_ENV) or 0)
+    if ttl <= 0:
+        return ResolverCache(CacheScope.process, name="lookup_ami")
+    return ResolverCache(
+        CacheScope.disk,
+        ttl=ttl,
+        directory=os.environ.get(CACHE_DIR_ENV),
+        name="lookup_ami",
+    )
+
+
+QUERIES = _queries_cache()
 
-class lookup_ami(Resolver):
-    session_cache = {}
 
+def normalize_filters(filters):
+    """a hashable form of describe_images filters, ignoring their order"""
+    return tuple(
+        sorted((f["Name"], tuple(sorted(f["Values"]))) for f in filters)
+    )
+
+
+class lookup_ami(Resolver):
     def __init__(self, *args, **kwargs):
         super(lookup_ami, self).__init__(*args, **kwargs)
 
@@ -59,10 +98,60 @@ class lookup_ami(Resolver):
 
     def client(self, profile):
         """give back an EC2 client to run our AMI query against"""
-        session = boto3.session.Session(
-            region_name=self.stack.region, profile_name=profile
-        )
-        return session.client("ec2")
+        key = (profile, self.stack.region)
+        with CACHE_LOCK:
+            if key not in CLIENTS:
+                import boto3
+
+                session = boto3.session.Session(
+                    region_name=self.stack.region, profile_name=profile
+                )
+                CLIENTS[key] = session.client("ec2")
+            return CLIENTS[key]
+
+    def describe_images(self, profile, account_id, filters):
+        """
+        the images matching filters, queried once per process (and per
+        SCEPTRE_LOOKUP_AMI_CACHE_TTL, if set) for each region, account and
+        set of filters. failures aren't remembered, the next lookup tries
+        again
+        """
+        key = (self.stack.region, account_id, normalize_filters(filters))
+
+        def query():
+            images = self.client(profile).describe_images(Filters=filters)["Images"]
+            # only what resolving needs is kept
+            return [
+                {"ImageId": x["ImageId"], "CreationDate": x["CreationDate"]}
+                for x in images
+            ]
+
+        return QUERIES.lookup(key, query)
+
+    def management_images(self, filters):
+        """
+        the images matching filters in management, or none if querying
+        management failed, which is remembered for the process rather than
+        tried again on every lookup
+        """
+        from botocore.exceptions import ClientError
+
+        key = (AWS_PROFILE[0], self.stack.region)
+        with CACHE_LOCK:
+            if key in FAILED_MANAGEMENT_QUERIES:
+                return []
+        try:
+            # only works for devops
+            return self.describe_images(AWS_PROFILE[0], AWS_ACCOUNT_ID[0], filters)
+        except ClientError as exc:
+            LOGGER.info(
+                "{}: error querying management occurred (this is normal for most users) {}".format(
+                    __name__, exc
+                )
+            )
+            with CACHE_LOCK:
+                FAILED_MANAGEMENT_QUERIES.add(key)
+            return []
 
     def resolve(self):
         """
@@ -105,23 +194,16 @@ class lookup_ami(Resolver):
         # this way we can see tags created in image baking process
         # If we would extend AWS profiles list, we should refactor sections to loops.
         # since possible scenario of checking only current/management account for AMI
-        from botocore.exceptions import ClientError
-
-        try:
-            # only works for devops
-            response_mngmnt = self.client(AWS_PROFILE[0]).describe_images(
-                Filters=self.filters(AWS_ACCOUNT_ID[0])
-            )
-        except ClientError as exc:
-            LOGGER.info(
-                "{}: error querying management occurred (this is normal for most users) {}".format(
-                    __name__, exc
-                )
+        filters_mngmnt = self.filters(AWS_ACCOUNT_ID[0])
+        filters_legacy = self.filters(AWS_ACCOUNT_ID[1])
+        # both accounts are queried at the same time
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            future_mngmnt = executor.submit(self.management_images, filters_mngmnt)
+            future_legacy = executor.submit(
+                self.describe_images, AWS_PROFILE[1], AWS_ACCOUNT_ID[1], filters_legacy
             )
-            response_mngmnt = dict(Images=[])
-        response_legacy = self.client(AWS_PROFILE[1]).describe_images(
-            Filters=self.filters(AWS_ACCOUNT_ID[1])
-        )
+            response_mngmnt = dict(Images=future_mngmnt.result())
+            response_legacy = dict(Images=future_legacy.result())
         # We sort responses and log info on query results.
         list_of_images_mngmnt = sorted(
             response_mngmnt["Images"], key=lambda img: img["CreationDate"]
@@ -144,8 +226,7 @@ class lookup_ami(Resolver):
         if not (list_of_images_legacy or list_of_images_mngmnt):
             raise ValueError(
                 "query on legacy and management account returns no AMIs! Filters:\n{}\n{}".format(
-                    self.filters(AWS_ACCOUNT_ID[0]), self.filters(
-                        AWS_ACCOUNT_ID[1])
+                    filters_mngmnt, filters_legacy
                 )
             )
         elif not list_of_images_legacy:
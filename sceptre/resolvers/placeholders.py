@@ -1,16 +1,21 @@
+import contextvars
 from contextlib import contextmanager
 from enum import Enum
-from threading import Lock
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from sceptre import resolvers
 
-# This is a toggle used for globally enabling placeholder values out of resolvers when they error
-# while resolving. This is important when performing actions on stacks like validation or generation
+# This is a toggle used for enabling placeholder values out of resolvers when they error while
+# resolving. This is important when performing actions on stacks like validation or generation
 # when their dependencies have not been deployed yet and those dependencies are expressed in stack
-# resolvers that are used in those actions, especially sceptre_user_data.
-_RESOLVE_PLACEHOLDER_ON_ERROR = False
+# resolvers that are used in those actions, especially sceptre_user_data. It is context-local, so
+# it is read without a lock and concurrent plans in one process don't affect each other; work
+# handed to other threads must be run in a copy of the context (see contextvars.copy_context) to
+# see it.
+_resolve_placeholder_on_error: contextvars.ContextVar = contextvars.ContextVar(
+    "_resolve_placeholder_on_error", default=False
+)
 
 
 class PlaceholderType(Enum):
@@ -19,31 +24,26 @@ class PlaceholderType(Enum):
     none = 3  # Resolves to None
 
 
-_placeholder_lock = Lock()
-
-
 @contextmanager
 def use_resolver_placeholders_on_error():
     """A context manager that toggles on placeholders for resolvers that error out. This should NOT
     be used while creating/launching stacks, but it is often required when validating or diffing
     stacks whose dependencies haven't yet been deployed and that reference those dependencies with
     resolvers, especially in the sceptre_user_data.
-    """
-    global _RESOLVE_PLACEHOLDER_ON_ERROR
 
+    Placeholders are only enabled in the current context (and so thread), and in the copies of it
+    that plans run their stacks' actions and resolvers in.
+    """
+    token = _resolve_placeholder_on_error.set(True)
     try:
-        with _placeholder_lock:
-            _RESOLVE_PLACEHOLDER_ON_ERROR = True
         yield
     finally:
-        with _placeholder_lock:
-            _RESOLVE_PLACEHOLDER_ON_ERROR = False
+        _resolve_placeholder_on_error.reset(token)
 
 
 def are_placeholders_enabled() -> bool:
-    """Indicates whether placeholders have been globally enabled or not."""
-    with _placeholder_lock:
-        return _RESOLVE_PLACEHOLDER_ON_ERROR
+    """Indicates whether placeholders have been enabled in the current context or not."""
+    return _resolve_placeholder_on_error.get()
 
 
 def create_placeholder_value(
@@ -13,17 +13,20 @@ If you pass a filename ending in .j2, it will render the json before minificatio
 from __future__ import absolute_import
 from __future__ import division
 
+import functools
 import imp
 import glob
 import json
+import logging
 import os
 
 import demjson3
 from devops import (
     util,
 )
+from sceptre.file_cache import file_contents_cache
 from sceptre.resolvers import Resolver
-from sceptre.template import Template
+from sceptre.resolvers.highlighting import highlighter
 
 from jinja2 import (
     Environment,
@@ -32,10 +35,6 @@ from jinja2 import (
     # UndefinedError,
 )
 
-from pygments import highlight, lexers, formatters
-
-PYGMENTS_LEXER = lexers.JsonLexer()
-PYGMENTS_FORMATTER = formatters.Terminal256Formatter(style="algol")
 
 FIRST_INIT = True
 SCEPTRE_DIR = os.environ["SCEPTRE_ROOT"]
@@ -47,11 +46,50 @@ DEFAULT_POLICY_LENGTH_LIMIT = 10240.0
 LOGGER = util.get_logger("resolvers." + __name__)
 
 # quiet logs if running from atlantis
-if os.environ.get("ATLANTIS_LOG_LEVEL"):
+QUIET = bool(os.environ.get("ATLANTIS_LOG_LEVEL"))
+if QUIET:
     LOGGER.info = lambda *args, **kwargs: None
     LOGGER.debug = lambda *args, **kwargs: None
 
 
+def log_lazily(level, build_msg):
+    """
+    logs build_msg() at level, only building the message (e.g. running
+    pygments over it) when the record will actually be emitted
+    """
+    if QUIET and level <= logging.INFO:
+        return
+    if LOGGER.isEnabledFor(level):
+        LOGGER.log(level, build_msg())
+
+
+@functools.lru_cache(maxsize=None)
+def get_jinja_env(policy_root):
+    """
+    one jinja environment shared by every !policy, so compiled templates
+    are cached (and recompiled when their files change) across stacks.
+    we use FileSystemLoader so that templates may use {% include %}
+    """
+    jinja_env = Environment(
+        loader=FileSystemLoader(policy_root), undefined=StrictUndefined
+    )
+    # allow the !policy decorator to support the same
+    # jinja filters  that the rest of sceptre supports
+    jinja_env.filters.update(get_jinja_filters())
+    return jinja_env
+
+
+def decode_policy(policy_content):
+    """
+    decodes policy json, with the (fast) json module when it is strict json,
+    and otherwise with demjson3, so we can tolerate trailing commas, etc
+    """
+    try:
+        return json.loads(policy_content)
+    except ValueError:
+        return demjson3.decode(policy_content)
+
+
 def get_jinja_filters():
     """
     Returns cached jinja filters if already computed, or loads/caches
@@ -114,14 +152,7 @@ class policy(Resolver):
             err = "missing policy directory: " + POLICY_DIR
             raise RuntimeError(err)
         self.policy_root = POLICY_DIR
-        # we use FileSystemLoader so that templates may use {% include %}
-        self.jinja_env = Environment(
-            loader=FileSystemLoader(self.policy_root), undefined=StrictUndefined
-        )
-        # allow the !policy decorator to support the same
-        # jinja filters  that the rest of sceptre supports
-        tmp = Template("junk data, we just need a object", {})
-        self.jinja_env.filters.update(get_jinja_filters())
+        self.jinja_env = get_jinja_env(self.policy_root)
         # FIXME: avoid this hack with __new__?
         global FIRST_INIT
         if FIRST_INIT:
@@ -186,10 +217,7 @@ class policy(Resolver):
         context = (
             {}
         )  # might stay empty if we're not actually rendering (i.e. if no .j2)
-        with open(path, "r") as fhandle:
-            policy_content = fhandle.read()
         if path.endswith(".j2"):
-            LOGGER.info("rendering: {}".format(shortpath(path)))
             # we render policy content with a context where
             # stack-config overrides environment-config overrides
             # any local variables so that policies themselves may
@@ -201,8 +229,6 @@ class policy(Resolver):
                 # sceptre_user_data=stack.sceptre_user_data,
                 sceptre_user_data=stack.__dict__["__sceptre_user_data"],
             )
-            policy_content = jinja_env.from_string(
-                policy_content).render(**context)
 
         # we determine policy length limits based on some hints,
         # because aws supports different lengths depending on
@@ -217,35 +243,13 @@ class policy(Resolver):
         else:
             policy_char_limit = DEFAULT_POLICY_LENGTH_LIMIT
 
-        # minify policy before we return it.  use demjson3 here
-        # so we can tolerate json with trailing commas, etc
-        try:
-            policy_content = demjson3.decode(policy_content)
-        except (ValueError, demjson3.JSONDecodeError) as exc:
-            err = "{}\n\nCannot load policy content: {}"
-            raise ValueError(err.format(exc, policy_content))
-
-        # maybe validate policy principals.  this is heuristic,
-        # but still useful because errors in this can be hard to
-        # track down.. i.e. one bad user ARN out of dozens or huundreds
-        if VALIDATE:
-            from devops.abcs.policy import Policy
-
-            policy = Policy(policy_content)
-            policy.validate()
-
-        log_chan = LOGGER.info
-        result = json.dumps(policy_content)
-        msg = highlight(
-            json.dumps(policy_content,
-                       indent=2), PYGMENTS_LEXER, PYGMENTS_FORMATTER
-        )
-
-        # show (rendered) policy on default log channel
-        log_chan("{}".format(msg))
+        # rendered every time (templates may {% include %} others), but
+        # from compiled templates and file contents shared by every stack
+        result = render_policy(path, context, jinja_env)
 
         # detect policies over or nearly over threshhold,
         # changing log channel to notify if necessary
+        log_level = logging.INFO
         policy_length = len(result.encode("utf-8"))
         percent = (policy_length / policy_char_limit) * 100
         warn_thresh, crit_thresh = 30, 80  # threshholds for logging output
@@ -254,14 +258,14 @@ class policy(Resolver):
             return x
 
         if percent > warn_thresh:
-            log_chan = LOGGER.warning
+            log_level = logging.WARNING
             color_fxn = util.blue  # noqa
         if percent > crit_thresh:
-            log_chan = LOGGER.critical
+            log_level = logging.CRITICAL
             color_fxn = util.red  # noqa
             if percent > 100:
-                log_chan = LOGGER.error
-                log_chan(
+                log_level = logging.ERROR
+                LOGGER.error(
                     "policy too long, this will probably"
                     "break if update is attempted!"
                 )
@@ -269,11 +273,56 @@ class policy(Resolver):
         msg = "policy renders to {} bytes, {} of the hard limit at {}".format(
             policy_length, percent, policy_char_limit
         )
-        msg = highlight(
-            msg, lexers.PythonLexer(), formatters.Terminal256Formatter(style="native")
+        log_lazily(
+            log_level,
+            lambda: highlighter(msg, lexer_name="python", style="native").strip(),
         )
-        log_chan(msg.strip())
 
         # give back the rendered, minified policy, usually so
         # that it may then be inlined into cloudformation templates
         return result
+
+
+def render_policy(path, context, jinja_env):
+    """renders (if it's a .j2 template), decodes, validates and minifies a policy"""
+    policy_root = jinja_env.loader.searchpath[0]
+    template_name = os.path.relpath(path, policy_root)
+    if not path.endswith(".j2"):
+        # shared with !file_contents (see sceptre.file_cache)
+        policy_content = file_contents_cache.read(path)
+    elif template_name.startswith(os.pardir):
+        # outside the policy root, so the loader can't cache it
+        LOGGER.info("rendering: {}".format(shortpath(path)))
+        policy_content = jinja_env.from_string(file_contents_cache.read(path)).render(
+            **context
+        )
+    else:
+        LOGGER.info("rendering: {}".format(shortpath(path)))
+        # compiled templates are cached by the shared environment
+        template = jinja_env.get_template(template_name.replace(os.sep, "/"))
+        policy_content = template.render(**context)
+
+    # minify policy before we return it
+    try:
+        policy_content = decode_policy(policy_content)
+    except (ValueError, demjson3.JSONDecodeError) as exc:
+        err = "{}\n\nCannot load policy content: {}"
+        raise ValueError(err.format(exc, policy_content))
+
+    # maybe validate policy principals.  this is heuristic,
+    # but still useful because errors in this can be hard to
+    # track down.. i.e. one bad user ARN out of dozens or huundreds
+    if VALIDATE:
+        from devops.abcs.policy import Policy
+
+        policy = Policy(policy_content)
+        policy.validate()
+
+    # show (rendered) policy on default log channel
+    log_lazily(
+        logging.INFO,
+        lambda: highlighter(
+            json.dumps(policy_content, indent=2), lexer_name="json", style="algol"
+        ),
+    )
+    return json.dumps(policy_content)
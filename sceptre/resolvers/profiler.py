@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.resolvers.profiler
+
+This module implements an in-memory profiler for resolvers, recording the wall time spent
+resolving each resolver class, argument and stack (including resolvers nested in other resolvers'
+arguments), and the report that can be produced from it at the end of a run.
+"""
+
+import contextvars
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Callable, Dict, Tuple
+
+if TYPE_CHECKING:
+    from sceptre import resolvers
+
+NO_STACK = "<no stack>"
+MAX_ARGUMENT_LENGTH = 80
+
+# The resolve in progress in the current context, whose nested resolves' time is subtracted from
+# its own.
+_current_frame: contextvars.ContextVar = contextvars.ContextVar(
+    "_current_frame", default=None
+)
+
+
+class _Frame(object):
+    __slots__ = ("nested_seconds", "cache_hit")
+
+    def __init__(self):
+        self.nested_seconds = 0.0
+        self.cache_hit = False
+
+
+class ResolverTiming(object):
+    """
+    The aggregated resolves of a resolver class with one argument, for one stack.
+    """
+
+    __slots__ = ("calls", "total_seconds", "self_seconds", "cache_hits", "errors")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.self_seconds = 0.0
+        self.cache_hits = 0
+        self.errors = 0
+
+
+class ResolverProfiler(object):
+    """
+    Records the time taken by resolves. Nothing is recorded unless the profiler has been enabled.
+
+    :param top_entries: The number of resolver, argument and stack entries listed in the report,
+        ordered by total time.
+    """
+
+    def __init__(self, top_entries: int = 25):
+        self.enabled = False
+        self.top_entries = top_entries
+        self._lock = threading.Lock()
+        self._timings: Dict[Tuple[str, str, str], ResolverTiming] = defaultdict(
+            ResolverTiming
+        )
+        self._sources: Dict[str, Callable[[], Any]] = {}
+
+    def reset(self):
+        with self._lock:
+            self._timings.clear()
+
+    @contextmanager
+    def profile(self, resolver: "resolvers.Resolver"):
+        """
+        Records the resolve made within the context. The time spent in resolves nested within it
+        is counted in their own entries, and only in this entry's total time.
+
+        :param resolver: The resolver being resolved.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        frame = _Frame()
+        token = _current_frame.set(frame)
+        failed = False
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            _current_frame.reset(token)
+            parent = _current_frame.get()
+            with self._lock:
+                if parent is not None:
+                    parent.nested_seconds += elapsed
+                timing = self._timings[self._key(resolver)]
+                timing.calls += 1
+                timing.total_seconds += elapsed
+                timing.self_seconds += max(elapsed - frame.nested_seconds, 0.0)
+                timing.cache_hits += frame.cache_hit
+                timing.errors += failed
+
+    def record_cache_hit(self):
+        """Marks the resolve currently recorded as having been answered from a cache."""
+        frame = _current_frame.get()
+        if frame is not None:
+            frame.cache_hit = True
+
+    def add_source(self, name: str, stats: Callable[[], Any]):
+        """
+        Adds the stats of a resolver's own cache or runner (e.g. commands run by !bash_resolver)
+        to the report.
+
+        :param name: The name the stats are listed under.
+        :param stats: Returns the stats, as JSON-able data.
+        """
+        self._sources[name] = stats
+
+    def summary(self) -> Dict:
+        """
+        Aggregates the recorded resolves.
+
+        :returns: Calls, time and cache hits per resolver class, the resolver, argument and stack
+            entries that took the longest, and the stats of resolver caches.
+        """
+        # Imported here, since the cache module imports this one.
+        from sceptre.resolvers.cache import cache_stats
+
+        with self._lock:
+            timings = {key: _copy(timing) for key, timing in self._timings.items()}
+
+        by_resolver = defaultdict(ResolverTiming)
+        for (resolver, _, _), timing in timings.items():
+            total = by_resolver[resolver]
+            total.calls += timing.calls
+            total.total_seconds += timing.total_seconds
+            total.self_seconds += timing.self_seconds
+            total.cache_hits += timing.cache_hits
+            total.errors += timing.errors
+
+        entries = sorted(timings.items(), key=lambda item: -item[1].total_seconds)
+        return {
+            "total_resolves": sum(timing.calls for timing in timings.values()),
+            "total_self_seconds": round(
+                sum(timing.self_seconds for timing in timings.values()), 4
+            ),
+            "resolvers": [
+                dict(resolver=name, **_as_dict(timing))
+                for name, timing in sorted(
+                    by_resolver.items(), key=lambda item: -item[1].total_seconds
+                )
+            ],
+            "top_entries": [
+                dict(
+                    resolver=resolver,
+                    stack=stack,
+                    argument=argument,
+                    **_as_dict(timing)
+                )
+                for (resolver, argument, stack), timing in entries[: self.top_entries]
+            ],
+            "caches": cache_stats(),
+            "sources": {name: stats() for name, stats in sorted(self._sources.items())},
+        }
+
+    def report(self, output_format: str = "text") -> str:
+        """
+        Returns the summary, as JSON if ``output_format`` is "json" and otherwise as text tables.
+        """
+        summary = self.summary()
+        if output_format == "json":
+            return json.dumps(summary, indent=4)
+
+        lines = [
+            "Resolver profile: {} resolves, {:.3f}s".format(
+                summary["total_resolves"], summary["total_self_seconds"]
+            ),
+            "",
+            "{:>10} {:>10} {:>7} {:>6}  {}".format(
+                "total (s)", "self (s)", "calls", "hits", "resolver"
+            ),
+        ]
+        for item in summary["resolvers"]:
+            lines.append(_format_row(item, item["resolver"]))
+        lines += [
+            "",
+            "{:>10} {:>10} {:>7} {:>6}  {}".format(
+                "total (s)", "self (s)", "calls", "hits", "resolver argument [stack]"
+            ),
+        ]
+        for item in summary["top_entries"]:
+            label = "!{} {} [{}]".format(
+                item["resolver"], item["argument"], item["stack"]
+            )
+            lines.append(_format_row(item, label))
+        for item in summary["caches"]:
+            lines.append(
+                "cache {resolver} ({scope}): {hits} hits, {misses} misses, "
+                "{disk_hits} disk hits, {evictions} evictions".format(**item)
+            )
+        for name, stats in summary["sources"].items():
+            lines.append("{}: {}".format(name, json.dumps(stats, sort_keys=True)))
+        return "\n".join(lines)
+
+    @staticmethod
+    def _key(resolver: "resolvers.Resolver") -> Tuple[str, str, str]:
+        argument = repr(resolver._argument)
+        if len(argument) > MAX_ARGUMENT_LENGTH:
+            argument = argument[: MAX_ARGUMENT_LENGTH - 3] + "..."
+        stack = resolver.stack
+        return (
+            type(resolver).__name__,
+            argument,
+            getattr(stack, "name", None) or NO_STACK,
+        )
+
+
+def _copy(timing: ResolverTiming) -> ResolverTiming:
+    copy = ResolverTiming()
+    for name in ResolverTiming.__slots__:
+        setattr(copy, name, getattr(timing, name))
+    return copy
+
+
+def _as_dict(timing: ResolverTiming) -> Dict[str, Any]:
+    return {
+        "calls": timing.calls,
+        "total_seconds": round(timing.total_seconds, 4),
+        "self_seconds": round(timing.self_seconds, 4),
+        "cache_hits": timing.cache_hits,
+        "errors": timing.errors,
+    }
+
+
+def _format_row(item: Dict[str, Any], label: str) -> str:
+    return "{:>10.3f} {:>10.3f} {:>7} {:>6}  {}".format(
+        item["total_seconds"],
+        item["self_seconds"],
+        item["calls"],
+        item["cache_hits"],
+        label,
+    )
+
+
+resolver_profiler = ResolverProfiler()
@@ -1,11 +1,16 @@
 """
 """
+
 from __future__ import absolute_import
 import os
 import subprocess
 from sceptre.resolvers import Resolver
+from sceptre.vcs_metadata import git_metadata
+
 
-SCEPTRE_ROOT = os.environ["SCEPTRE_ROOT"]
+def sceptre_root():
+    """read when resolving rather than at import, so it can be set late"""
+    return os.environ["SCEPTRE_ROOT"]
 
 
 class project_metadata(Resolver):
@@ -13,25 +18,37 @@ class project_metadata(Resolver):
         super(project_metadata, self).__init__(*args, **kwargs)
 
     def exec_cmd(self, cmd):
-        result = subprocess.check_output(cmd.split(), cwd=SCEPTRE_ROOT).strip()
+        result = subprocess.check_output(cmd.split(), cwd=sceptre_root()).strip()
         if isinstance(result, bytes):
             return result.decode("utf-8")
         else:
             return result
 
     def resolve(self):
-        """ """
+        """
+        `__repo__` and `__sha__` are read from the process-wide git metadata
+        cache, so tagging every stack with them doesn't fork git per stack
+        """
         # self.logger.debug('resolving project metadata')
         if self.argument == "__file__":
             return os.path.join(
-                SCEPTRE_ROOT, "config", os.environ["env"], os.environ["stack"] + ".yaml"
+                sceptre_root(),
+                "config",
+                os.environ["env"],
+                os.environ["stack"] + ".yaml",
             )
         if self.argument == "__repo__":
             # something like git@github.com:605data/stack-core.git
-            remote = self.exec_cmd("git config --get remote.origin.url")
+            remote = git_metadata.remote_url(sceptre_root())
+            if remote is None:
+                # raises git's own error
+                remote = self.exec_cmd("git config --get remote.origin.url")
             return os.path.splitext(os.path.basename(remote))[0]
         if self.argument == "__sha__":
-            return self.exec_cmd("git rev-parse HEAD")
+            sha = git_metadata.head(sceptre_root())
+            if sha is None:
+                sha = self.exec_cmd("git rev-parse HEAD")
+            return sha
         if self.argument == "__stack_name__":
             return "!Ref AWS::StackName"
         raise ValueError("unsupported argument: {0}".format(self.argument))
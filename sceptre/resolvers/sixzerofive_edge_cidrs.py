@@ -5,12 +5,19 @@ See https://github.com/605data/infra-docs/blob/master/iam.md#ip-source-restricti
 
 This sceptre resolver is basically just a proxy to devops.netops.api.describe_edge_cidrs
 See also: python-devops.git/devops/netops/api
+
+The edge cidrs are only looked up once per run, and are also kept on disk
+(in ~/.cache/sceptre/resolvers) for SCEPTRE_EDGE_CIDRS_CACHE_TTL seconds
+(6 hours by default), so later runs don't look them up at all. Pass
+--refresh-resolver-cache to look them up again regardless.
 """
 
 from __future__ import absolute_import
 import json
+import os
 
 from sceptre.resolvers import Resolver
+from sceptre.resolvers.cache import CacheScope, ResolverCache
 
 from devops import (
     util,
@@ -19,8 +26,17 @@ from devops.netops import api
 
 LOGGER = util.get_logger(__name__)
 
+CACHE_TTL_ENV = "SCEPTRE_EDGE_CIDRS_CACHE_TTL"
+DEFAULT_CACHE_TTL = 6 * 60 * 60
+
 
 class sixzerofive_edge_cidrs(Resolver):
+    # the result is the rendered json, so it's only dumped once too
+    cache = ResolverCache(
+        CacheScope.disk,
+        ttl=float(os.environ.get(CACHE_TTL_ENV) or DEFAULT_CACHE_TTL),
+    )
+
     def resolve(self):
         """get the policy file from `policy_root`, and return it,
         rendering it with the standard context if applicable
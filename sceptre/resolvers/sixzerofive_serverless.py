@@ -14,20 +14,14 @@
 from __future__ import absolute_import
 import os
 import subprocess
+from botocore.exceptions import ClientError
+from sceptre.exceptions import StackDoesNotExistError
 from sceptre.resolvers import Resolver
+from sceptre.resolvers.highlighting import highlighter
+from sceptre.resolvers.stack_export import external_stack_outputs
 from devops import (
     util,
 )
-from devops.environment import Environment
-
-from pygments import highlight, lexers, formatters
-
-PYGMENTS_LEXER = lexers.PythonLexer()
-PYGMENTS_FORMATTER = formatters.Terminal256Formatter(style="rrt")
-
-
-def highlighter(x):
-    return highlight(x, PYGMENTS_LEXER, PYGMENTS_FORMATTER)
 
 
 def snake(name):
@@ -82,26 +76,23 @@ class serverless(Resolver):
         )
         self.logger.info(
             "serverless stack is: {}".format(serverless_stack_name))
-        env_obj = Environment.from_name(env_name)
-        client = env_obj.cloudformation
-        serverless_stacks = client.describe_stacks(StackName=serverless_stack_name)[
-            "Stacks"
-        ]
+        # the serverless stack's outputs are described once, and shared by
+        # every key looked up from it (see stack_export.external_stack_outputs)
         try:
-            serverless_stack = serverless_stacks[0]
-        except (IndexError,):
+            outputs = external_stack_outputs(env_name, serverless_stack_name)
+        except (ClientError, StackDoesNotExistError) as exc:
+            # StackDoesNotExistError is raised reading an outputs snapshot
+            missing = isinstance(exc, StackDoesNotExistError)
+            if not missing and "does not exist" not in str(exc):
+                raise
             err = "No serverless stack named {} could be found in environment {}"
             self.logger.warning(err.format(serverless_stack_name, env_name))
             raise
-        result = None
-        for output in serverless_stack["Outputs"]:
-            if output["OutputKey"] == export_key:
-                result = output
-                break
+        result = {output["OutputKey"]: output for output in outputs}.get(export_key)
         if result is None:
             err = "No output named {} was found in serverless stack named {} inside environment {}"
-            self.logger.warning(err.format(
-                export_key, serverless_stack_name, env_name))
+            err = err.format(export_key, serverless_stack_name, env_name)
+            self.logger.warning(err)
             raise ValueError(err)
         result = result["OutputValue"]
         if export_key == "MainLambdaFunctionQualifiedArn":
@@ -5,26 +5,90 @@ from devops import (
 import os
 import json
 import re
-import yaml
 from six.moves import filter
 
-from sceptre.context import SceptreContext
 from sceptre.connection_manager import ConnectionManager
+from sceptre.env_config import env_config_store
+from sceptre.exports_catalog import (
+    describe_all_stacks,
+    describe_stack,
+    export_catalogs,
+)
+from sceptre.outputs_cache import account_key, stack_outputs_cache
+from sceptre.outputs_snapshot import active_outputs_snapshot
+from sceptre.resolvers.highlighting import highlighter
 from sceptre.resolvers.stack_output import Resolver
 
-from pygments import highlight, lexers, formatters
 
-PYGMENTS_LEXER = lexers.PythonLexer()
-PYGMENTS_FORMATTER = formatters.Terminal256Formatter(style="rrt")
+def external_connection_manager(env_name):
+    """
+    get a (shared) connection manager for an external env. it is built
+    again when the env's config changes (see sceptre.env_config)
+    """
+    return env_config_store.derived(
+        env_name,
+        "ConnectionManager",
+        lambda config: ConnectionManager(
+            region=config["region"],
+            sceptre_role=config.get("iam_role"),
+            profile=config.get("profile"),
+        ),
+    )
+
+
+def external_catalog(env_name):
+    """
+    get the export catalog (see sceptre.exports_catalog) of the account and
+    region an external env is in. it is built once, with a paginated
+    describe_stacks, and shared by every resolver querying that account
+    """
+    config = env_config_store.get(env_name)
+    account = account_key(config.get("profile"), config.get("iam_role"))
+    snapshot = active_outputs_snapshot()
+    if snapshot is not None:
+        # sceptre --outputs-snapshot: no stacks are described
+        return export_catalogs.get(
+            account,
+            config["region"],
+            lambda: snapshot.stacks(account, config["region"]),
+        )
+    return export_catalogs.get(
+        account,
+        config["region"],
+        lambda: describe_all_stacks(external_connection_manager(env_name)),
+        lambda stack_name: describe_stack(
+            external_connection_manager(env_name), stack_name
+        ),
+    )
 
 
-def highlighter(x):
-    return highlight(x, PYGMENTS_LEXER, PYGMENTS_FORMATTER)
+def external_stack_outputs(env_name, stack_name):
+    """
+    get the outputs of a stack in an external env. the stack's outputs are
+    described once and shared (see sceptre.outputs_cache), however many keys
+    are looked up from it and from however many threads, or read from the
+    outputs snapshot in use (see sceptre.outputs_snapshot)
+    """
+    config = env_config_store.get(env_name)
+    cache_key = (
+        account_key(config.get("profile"), config.get("iam_role")),
+        config["region"],
+        stack_name,
+    )
+    snapshot = active_outputs_snapshot()
+    if snapshot is not None:
+        # sceptre --outputs-snapshot: no stacks are described
+        return stack_outputs_cache.get(*cache_key, lambda: snapshot.outputs(*cache_key))
 
+    def describe():
+        response = external_connection_manager(env_name).call(
+            service="cloudformation",
+            command="describe_stacks",
+            kwargs={"StackName": stack_name},
+        )
+        return response.get("Stacks", [{}])[0].get("Outputs", [])
 
-ENV_CACHE = {}
-CM_CACHE = {}
-RESULTS_CACHE = {}
+    return stack_outputs_cache.get(*cache_key, describe)
 
 
 def snake(name):
@@ -39,9 +103,6 @@ class StackExports(Resolver):
         !stack_exports env_name/stack_name
     """
 
-    env_cache = {}
-    cm_cache = {}
-
     def __init__(self, *args, **kwargs):
         argument = kwargs.pop("argument", None)
         if argument and not argument.endswith("::"):
@@ -83,28 +144,12 @@ class StackExports(Resolver):
     @property
     def external_config(self):
         """get the full env-config for the external environment object"""
-        s = SceptreContext(
-            command_path=os.environ["SCEPTRE_ROOT"],
-            project_path=os.environ["SCEPTRE_ROOT"],
-        )
-        conf_file = os.path.join(s.full_config_path(),
-                                 self.env_name, "config.yaml")
-        with open(conf_file, "r") as fhandle:
-            return yaml.load(fhandle.read(), Loader=yaml.FullLoader)
+        return env_config_store.get(self.env_name)
 
     @property
     def external_connection_manager(self):
         """get a connection manager for the external env"""
-        if self.env_name in CM_CACHE:
-            return CM_CACHE[self.env_name]
-        else:
-            config = self.external_config
-            CM_CACHE[self.env_name] = ConnectionManager(
-                region=config["region"],
-                iam_role=config.get("iam_role"),
-                profile=config.get("profile"),
-            )
-            return self.external_connection_manager
+        return external_connection_manager(self.env_name)
 
     @property
     def full_stackname(self):
@@ -123,17 +168,12 @@ class StackExports(Resolver):
 
     @property
     def external_exports(self):
-        """get all the cf exports for the external stack"""
-        cm = self.external_connection_manager
-        all_exports = cm.call(
-            service="cloudformation",
-            command="describe_stacks",
-            kwargs={"StackName": self.full_stackname},
-        )
-        all_exports = all_exports.get("Stacks", [{}])[0]
-        all_exports = all_exports.get("Outputs", [])
+        """
+        get all the cf exports for the external stack (see
+        external_stack_outputs)
+        """
         tmp = {}
-        for dct in all_exports:
+        for dct in external_stack_outputs(self.env_name, self.full_stackname):
             tmp[dct["OutputKey"]] = dct["OutputValue"]
         return tmp
 
@@ -155,14 +195,12 @@ class StackExport(StackExports):
         return tmp
 
     def resolve(self):
-        """main method for resolver"""
-        from_cache = RESULTS_CACHE.get(self.cache_key)
-        if not from_cache:
-            msg = "resolving: {}".format((self.cache_key))
-            self.logger.info(highlighter(msg).strip())
-        if from_cache:
-            # self.logger.debug("returning from cache")
-            return from_cache
+        """
+        main method for resolver. the stack's outputs are described once
+        and shared (see external_stack_outputs), until the stack changes
+        """
+        msg = "resolving: {}".format((self.cache_key))
+        self.logger.info(highlighter(msg).strip())
         try:
             result = self.external_exports[self.key_name]
         except KeyError:
@@ -173,7 +211,6 @@ class StackExport(StackExports):
         if "," in result:
             pretty_result = json.dumps(result.split(","), indent=2)
         self.logger.info("  {}{}".format(util.bold(" ⇢  "), pretty_result))
-        RESULTS_CACHE[self.cache_key] = result
         return result
 
     __str__ = resolve
@@ -256,6 +293,8 @@ class StackOutputValuesFilter(StackExport):
         ).strip()
         self.logger.info(highlighter(msg).strip())
         # self.logger.debug('{}: external environment: {}'.format(__name__, self.env))
+        # only this stack is described, and its outputs shared with every
+        # other resolver looking it up
         all_exports = list(self.external_exports.values())
         arn_exports = list(filter(self.filters[self.filter_name], all_exports))
         return json.dumps(arn_exports)
@@ -1,4 +1,8 @@
 """ stack_exports_filter
+
+stacks and exports are filtered in memory, from the export catalog (see
+sceptre.exports_catalog) of the env's account and region, which is built
+once and shared by every resolver querying that account
 """
 from __future__ import absolute_import
 from functools import reduce
@@ -6,7 +10,8 @@ from sceptre.resolvers.stack_output import Resolver
 from devops import (
     util,
 )
-from devops.environment import Environment
+from sceptre.env_config import env_config_store
+from sceptre.resolvers.stack_export import external_catalog
 
 # use our  logger, the formatter is nicer than sceptre
 LOGGER = util.get_logger(__name__)
@@ -15,7 +20,12 @@ LOGGER = util.get_logger(__name__)
 class StackExportFilter(Resolver):
     """Returns all exports for a given stack
     Usage:
-        !stack_exports_filter env_name/stack_regex::key_regex
+        !stack_exports_filter env_name/stack_regex::key_regex [tag=regex ..]
+
+    stack_regex is searched for in the names of the env's stacks (less the
+    `project_code-env_name-` prefix) and key_regex in their output keys.
+    any extra filters must match a stack tag, or describe_stacks field, of
+    that name
     """
 
     @property
@@ -53,11 +63,11 @@ class StackExportFilter(Resolver):
                     self.key_regex, self.extra_filters],
             )
         )
-        env = Environment.from_name(self.env_name)
-        # LOGGER.debug('{}: external environment: {}'.format(__name__, env))
-        stack_matches = env.stacks.filter(self.stack_regex)
-        stack_matches = stack_matches.filter(**self.extra_filters)
-        export_matches = stack_matches.exports.filter(self.key_regex)
+        config = env_config_store.get(self.env_name)
+        prefix = "{}-{}-".format(config["project_code"], self.env_name)
+        export_matches = external_catalog(self.env_name).filter_outputs(
+            self.stack_regex, self.key_regex, prefix, **self.extra_filters
+        )
         export_lists = [list(export_dict.values())
                         for export_dict in export_matches]
         if not export_lists:
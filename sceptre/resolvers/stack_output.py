@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
 
-import functools
 import logging
 import shlex
 
@@ -13,6 +12,8 @@ from sceptre.exceptions import (
 )
 
 from sceptre.helpers import normalise_path, sceptreise_path
+from sceptre.outputs_cache import account_key, stack_outputs_cache
+from sceptre.outputs_snapshot import active_outputs_snapshot
 from sceptre.resolvers import Resolver
 
 TEMPLATE_EXTENSION = ".yaml"
@@ -52,13 +53,13 @@ class StackOutputBase(Resolver):
                 )
             )
 
-    @functools.lru_cache(maxsize=4096)
     def _get_stack_outputs(
         self, stack_name, profile=None, region=None, sceptre_role=None
     ):
         """
         Communicates with AWS CloudFormation to fetch outputs from a specific
-        Stack.
+        Stack, or reads them from the outputs snapshot in use. Outputs are shared through the
+        process-wide stack outputs cache.
 
         :param stack_name: Name of the Stack to collect output for.
         :type stack_name: str
@@ -66,6 +67,47 @@ class StackOutputBase(Resolver):
         :rtype: dict
         :raises: sceptre.stack.DependencyStackNotLaunchedException
         """
+        cache_key = self._outputs_cache_key(stack_name, profile, region, sceptre_role)
+        snapshot = active_outputs_snapshot()
+        if snapshot is not None:
+            # sceptre --outputs-snapshot: no stacks are described
+            outputs = stack_outputs_cache.get(
+                *cache_key, lambda: snapshot.outputs(*cache_key)
+            )
+        else:
+            outputs = stack_outputs_cache.get(
+                *cache_key,
+                lambda: self._describe_stack_outputs(
+                    stack_name, profile, region, sceptre_role
+                ),
+            )
+
+        formatted_outputs = dict(
+            (output["OutputKey"], output["OutputValue"]) for output in outputs
+        )
+
+        return formatted_outputs
+
+    def _outputs_cache_key(
+        self, stack_name, profile=None, region=None, sceptre_role=None
+    ):
+        """
+        Returns the key the Stack's outputs are cached under in the stack outputs cache, using the
+        profile, region and sceptre_role the outputs would be described with.
+
+        :param stack_name: Name of the Stack to collect output for.
+        :type stack_name: str
+        :returns: The account, region and name of the Stack.
+        :rtype: tuple
+        """
+        profile, region, sceptre_role = (
+            self.stack.connection_manager.resolve_session_args(
+                profile, region, sceptre_role, stack_name
+            )
+        )
+        return account_key(profile, sceptre_role), region, stack_name
+
+    def _describe_stack_outputs(self, stack_name, profile, region, sceptre_role):
         self.logger.debug("Collecting outputs from '{0}'...".format(stack_name))
         connection_manager = self.stack.connection_manager
 
@@ -85,15 +127,10 @@ class StackOutputBase(Resolver):
             else:
                 raise e
         else:
-            outputs = response["Stacks"][0].get("Outputs", {})
+            outputs = response["Stacks"][0].get("Outputs", [])
 
         self.logger.debug("Outputs: {0}".format(outputs))
-
-        formatted_outputs = dict(
-            (output["OutputKey"], output["OutputValue"]) for output in outputs
-        )
-
-        return formatted_outputs
+        return outputs
 
 
 class StackOutput(StackOutputBase):
@@ -131,6 +168,22 @@ class StackOutput(StackOutputBase):
         :rtype: str
         """
         self.logger.debug("Resolving Stack output: {0}".format(self.argument))
+        stack_name, output_key, profile, region, sceptre_role = self.output_target()
+        return self._get_output_value(
+            stack_name,
+            output_key,
+            profile=profile,
+            region=region,
+            sceptre_role=sceptre_role,
+        )
+
+    def output_target(self):
+        """
+        Identifies the output this resolver resolves, and the configuration it is described with.
+
+        :returns: The external Stack name, output key, profile, region and sceptre_role.
+        :rtype: tuple
+        """
         friendly_stack_name = self.dependency_stack_name.replace(TEMPLATE_EXTENSION, "")
 
         stack = next(
@@ -143,12 +196,12 @@ class StackOutput(StackOutputBase):
             [stack.project_code, friendly_stack_name.replace("/", "-")]
         )
 
-        return self._get_output_value(
+        return (
             stack_name,
             self.output_key,
-            profile=stack.profile,
-            region=stack.region,
-            sceptre_role=stack.sceptre_role,
+            stack.profile,
+            stack.region,
+            stack.sceptre_role,
         )
 
 
@@ -1,18 +1,209 @@
 """
 this file implements `!value_from_ssm`, which resolves secrets from SSM
 and inserts them into sceptre (and therefore cloudformation) runtimes
+
+parameter names are collected from every `!value_from_ssm` in the plan as
+stacks are loaded, and fetched with `get_parameters` in batches of 10, so
+a stack with dozens of secrets makes a few calls rather than dozens. set
+SCEPTRE_SSM_PATH_THRESHOLD=N to fetch a whole path with
+`get_parameters_by_path` instead, once N pending names share that path.
+
+decrypted values are kept in memory for the plan they were resolved for
+and are never logged; only parameter names and counts are.
 """
 from __future__ import absolute_import
-import boto3
+import os
+import posixpath
+import threading
+
+from botocore.exceptions import ClientError
+from sceptre.connection_manager import ConnectionManager
 from sceptre.resolvers import Resolver
+from sceptre.resolvers.cache import plan_local
 
+# the most names get_parameters accepts in one call
+BATCH_SIZE = 10
 
-class value_from_ssm(Resolver):
-    session_cache = {}
 
+class ParameterStore(object):
+    """
+    a thread-safe cache of decrypted SSM parameter values, keyed by
+    (profile, region, name), with one client per (profile, region)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fetch_locks = {}
+        self._clients = {}
+        self._wanted = {}
+        self._values = {}
+        self.calls = 0
+
+    def want(self, profile, region, name):
+        """registers a name to fetch in the next batch for its profile and region"""
+        with self._lock:
+            if (profile, region, name) not in self._values:
+                self._wanted.setdefault((profile, region), {})[name] = None
+
+    def get(self, profile, region, name, logger):
+        """returns a parameter's decrypted value, fetching it with other wanted names"""
+        value_key = (profile, region, name)
+        with self._lock:
+            if value_key in self._values:
+                return self._values[value_key]
+            fetch_lock = self._fetch_locks.setdefault(
+                (profile, region), threading.Lock()
+            )
+
+        # one fetch at a time per profile and region; whoever waited for
+        # the lock will usually find their name in the batch just fetched
+        with fetch_lock:
+            with self._lock:
+                if value_key in self._values:
+                    return self._values[value_key]
+                wanted = self._wanted.setdefault((profile, region), {})
+                wanted.pop(name, None)
+                pending = [name] + list(wanted)
+            client = self._client(profile, region)
+            fetched, attempted = self._fetch(client, pending, logger)
+            with self._lock:
+                for fetched_name, value in fetched.items():
+                    self._values[(profile, region, fetched_name)] = value
+                # names that weren't returned (missing, or not allowed) are
+                # looked up on their own when they're resolved, rather than
+                # failing every later batch. the store may have been cleared
+                # meanwhile, so its wanted names are looked up again
+                wanted = self._wanted.get((profile, region), {})
+                for attempted_name in attempted:
+                    wanted.pop(attempted_name, None)
+            if name in fetched:
+                return fetched[name]
+
+            # not found, or not allowed: let get_parameter raise the same
+            # error it always has for this name
+            self._count_call()
+            value = client.get_parameter(Name=name, WithDecryption=True)[
+                "Parameter"
+            ]["Value"]
+            with self._lock:
+                self._values[value_key] = value
+            return value
+
+    def clear(self):
+        """forgets all values, clients and wanted names"""
+        with self._lock:
+            self._clients.clear()
+            self._wanted.clear()
+            self._values.clear()
+            self.calls = 0
+
+    def _count_call(self):
+        with self._lock:
+            self.calls += 1
+
+    def _client(self, profile, region):
+        session_class = ConnectionManager.default_session_class
+        if session_class is None:
+            import boto3
+
+            session_class = boto3.session.Session
+        key = (session_class, profile, region)
+        with self._lock:
+            if key not in self._clients:
+                session = session_class(region_name=region, profile_name=profile)
+                self._clients[key] = session.client("ssm")
+            return self._clients[key]
+
+    def _fetch(self, client, pending, logger):
+        """
+        fetches the first name in pending, along with as many others as fit,
+        returning the values fetched and the names that were asked for
+        """
+        name = pending[0]
+        path = posixpath.dirname(name)
+        threshold = int(os.environ.get("SCEPTRE_SSM_PATH_THRESHOLD") or 0)
+        same_path = [x for x in pending if posixpath.dirname(x) == path]
+        if threshold and path != "/" and len(same_path) >= threshold:
+            logger.info(
+                "fetching {} parameters under {}".format(len(same_path), path)
+            )
+            try:
+                values = self._fetch_path(client, path)
+            except ClientError as exc:
+                logger.info("could not fetch {}: {}".format(path, exc))
+            else:
+                return values, [name] + list(values)
+        batch = pending[:BATCH_SIZE]
+        logger.info("fetching {} parameters: {}".format(len(batch), batch))
+        return self._fetch_batch(client, batch, logger), batch
+
+    def _fetch_batch(self, client, batch, logger):
+        """
+        fetches a batch of names. access denied to one name fails the whole
+        call, so a failed batch is split in halves and each retried, until
+        the names that fail are on their own
+        """
+        self._count_call()
+        try:
+            response = client.get_parameters(Names=batch, WithDecryption=True)
+        except ClientError as exc:
+            if len(batch) == 1:
+                logger.info("could not fetch {}: {}".format(batch[0], exc))
+                return {}
+            half = len(batch) // 2
+            values = self._fetch_batch(client, batch[:half], logger)
+            values.update(self._fetch_batch(client, batch[half:], logger))
+            return values
+        return {x["Name"]: x["Value"] for x in response["Parameters"]}
+
+    def _fetch_path(self, client, path):
+        values = {}
+        kwargs = dict(Path=path, WithDecryption=True)
+        while True:
+            self._count_call()
+            response = client.get_parameters_by_path(**kwargs)
+            for parameter in response["Parameters"]:
+                values[parameter["Name"]] = parameter["Value"]
+            if not response.get("NextToken"):
+                return values
+            kwargs["NextToken"] = response["NextToken"]
+
+
+def parameter_store():
+    """
+    returns the parameter store of the active plan, so that values don't
+    outlive (or leak between) the plans they were resolved for
+    """
+    return plan_local(__name__, ParameterStore)
+
+
+class value_from_ssm(Resolver):
     def __init__(self, *args, **kwargs):
         super(value_from_ssm, self).__init__(*args, **kwargs)
 
+    def setup(self):
+        """
+        registers the parameter with the store as each stack is loaded, so
+        that it can be fetched along with the rest of the plan's parameters
+        """
+        try:
+            parameter_store().want(*self._parse_argument())
+        except ValueError:
+            # reported when resolved
+            pass
+
+    def _parse_argument(self):
+        try:
+            profile, path = self.argument.split()
+            profile, region = profile.split("@")
+        except (AttributeError, ValueError):
+            raise ValueError(
+                "Bad syntax for the !value_from_ssm "
+                " resolver. Use it like this: '!value_from_ssm "
+                "profile_name@region /some/ssm/path'"
+            )
+        return profile, region, path
+
     def resolve(self):
         """
         resolve is the method called by Sceptre. It should carry out the work
@@ -26,27 +217,10 @@ class value_from_ssm(Resolver):
         self.stack.raw_config  (A dict of data from <stack_name>.yaml)
         self.stack.connection_manager (A connection_manager)
         """
-        try:
-            profile, path = self.argument.split()
-            profile, region = profile.split("@")
-        except ValueError:
-            raise ValueError(
-                "Bad syntax for the !value_from_ssm "
-                " resolver. Use it like this: '!value_from_ssm "
-                "profile_name@region /some/ssm/path'"
-            )
+        profile, region, path = self._parse_argument()
         self.logger.info("resolving {0} with {1}".format(path, profile))
-        if profile not in self.session_cache:
-            self.logger.info("caching session for profile {}".format(profile))
-            self.session_cache[profile] = boto3.session.Session(
-                region_name=region, profile_name=profile
-            )
-        session = self.session_cache[profile]
-        client = session.client("ssm")
         try:
-            return client.get_parameter(Name=path, WithDecryption=True)["Parameter"][
-                "Value"
-            ]
+            return parameter_store().get(profile, region, path, self.logger)
         except Exception as exc:
             # Prevents sceptre from doing something wonky that obscures
             # how this error is coming from this resolver
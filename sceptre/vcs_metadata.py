@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+
+"""
+sceptre.vcs_metadata
+
+This module implements a process-wide cache of git metadata (the HEAD commit, the current branch
+and remote URLs) for project directories. Metadata is read directly from the repository's files
+where possible, falling back to running git, so that resolvers and hooks which tag every stack
+with it don't fork git for each stack.
+"""
+
+import logging
+import os
+import re
+import subprocess
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+SECTION_PATTERN = re.compile(r'^\s*\[\s*([^\s\]"]+)(?:\s+"((?:[^"\\]|\\.)*)")?\s*\]')
+VARIABLE_PATTERN = re.compile(r"^\s*([A-Za-z][A-Za-z0-9-]*)\s*=\s*(.*?)\s*$")
+SHA_PATTERN = re.compile(r"^[0-9a-f]{40}([0-9a-f]{24})?$")
+
+logger = logging.getLogger(__name__)
+
+
+def run_git(args: List[str], cwd: str) -> Optional[str]:
+    """
+    Runs git, returning its stripped output, or None if it fails.
+
+    :param args: The arguments to git.
+    :param cwd: The directory to run git in.
+    """
+    # GIT_DIR would point git somewhere other than the directory we're asking about
+    env = {key: value for key, value in os.environ.items() if key != "GIT_DIR"}
+    try:
+        output = subprocess.check_output(
+            ["git"] + args, cwd=cwd, env=env, stderr=subprocess.DEVNULL
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.decode("utf-8").strip()
+
+
+class GitMetadata(object):
+    """
+    A thread-safe cache of git metadata, keyed by project directory.
+
+    :param run_git: Runs git when the metadata can't be read from the repository's files.
+    """
+
+    def __init__(self, run_git: Callable[[List[str], str], Optional[str]] = run_git):
+        self._run_git = run_git
+        self._lock = threading.Lock()
+        self._cache: Dict[Tuple[str, str], Optional[str]] = {}
+
+    def head(self, root: str) -> Optional[str]:
+        """
+        Returns the commit checked out in the repository containing root, like
+        ``git rev-parse HEAD``.
+
+        :param root: A directory in the repository.
+        :returns: The commit SHA, or None if root isn't in a git repository.
+        """
+        return self._cached(
+            root,
+            "head",
+            self._read_head,
+            ["rev-parse", "HEAD"],
+        )
+
+    def branch(self, root: str) -> Optional[str]:
+        """
+        Returns the branch checked out in the repository containing root, like
+        ``git rev-parse --abbrev-ref HEAD``; i.e. "HEAD" when no branch is checked out.
+
+        :param root: A directory in the repository.
+        :returns: The branch name, or None if root isn't in a git repository.
+        """
+        return self._cached(
+            root,
+            "branch",
+            self._read_branch,
+            ["rev-parse", "--abbrev-ref", "HEAD"],
+        )
+
+    def remote_url(self, root: str, remote: str = "origin") -> Optional[str]:
+        """
+        Returns the URL of a remote of the repository containing root, like
+        ``git config --get remote.<remote>.url``.
+
+        :param root: A directory in the repository.
+        :param remote: The name of the remote.
+        :returns: The URL, or None if there isn't one.
+        """
+        return self._cached(
+            root,
+            "remote_url:" + remote,
+            lambda git_dirs: self._read_config(git_dirs, "remote", remote, "url"),
+            ["config", "--get", "remote.{0}.url".format(remote)],
+        )
+
+    def clear(self):
+        """Forgets all cached metadata."""
+        with self._lock:
+            self._cache.clear()
+
+    def _cached(self, root, name, read, git_args):
+        key = (os.path.abspath(root), name)
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+
+        value = None
+        git_dirs = self._find_git_dirs(key[0])
+        if git_dirs is not None:
+            try:
+                value = read(git_dirs)
+            except (OSError, ValueError) as err:
+                logger.debug("Could not read %s from %s: %s", name, git_dirs[0], err)
+        if value is None:
+            value = self._run_git(git_args, key[0])
+
+        with self._lock:
+            return self._cache.setdefault(key, value)
+
+    def _find_git_dirs(self, root: str) -> Optional[Tuple[str, str]]:
+        """Returns the git directory holding HEAD and the common directory holding refs and config."""
+        directory = root
+        while True:
+            dot_git = os.path.join(directory, ".git")
+            if os.path.isdir(dot_git):
+                git_dir = dot_git
+                break
+            if os.path.isfile(dot_git):
+                # A worktree or submodule, whose .git file points at its git directory
+                with open(dot_git) as fhandle:
+                    content = fhandle.read().strip()
+                if not content.startswith("gitdir:"):
+                    return None
+                git_dir = os.path.join(directory, content[len("gitdir:") :].strip())
+                break
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                return None
+            directory = parent
+
+        common_dir = git_dir
+        commondir_file = os.path.join(git_dir, "commondir")
+        if os.path.isfile(commondir_file):
+            with open(commondir_file) as fhandle:
+                common_dir = os.path.join(git_dir, fhandle.read().strip())
+        return os.path.normpath(git_dir), os.path.normpath(common_dir)
+
+    def _read_head_ref(self, git_dir: str) -> str:
+        with open(os.path.join(git_dir, "HEAD")) as fhandle:
+            return fhandle.read().strip()
+
+    def _read_head(self, git_dirs: Tuple[str, str]) -> Optional[str]:
+        git_dir, common_dir = git_dirs
+        head = self._read_head_ref(git_dir)
+        if not head.startswith("ref:"):
+            return head if SHA_PATTERN.match(head) else None
+        return self._resolve_ref(common_dir, head[len("ref:") :].strip())
+
+    def _read_branch(self, git_dirs: Tuple[str, str]) -> Optional[str]:
+        head = self._read_head_ref(git_dirs[0])
+        if not head.startswith("ref:"):
+            return "HEAD"
+        ref = head[len("ref:") :].strip()
+        if not ref.startswith("refs/heads/"):
+            return None
+        return ref[len("refs/heads/") :]
+
+    def _resolve_ref(self, common_dir: str, ref: str) -> Optional[str]:
+        loose_ref = os.path.join(common_dir, *ref.split("/"))
+        if os.path.isfile(loose_ref):
+            with open(loose_ref) as fhandle:
+                value = fhandle.read().strip()
+            if value.startswith("ref:"):
+                return self._resolve_ref(common_dir, value[len("ref:") :].strip())
+            return value if SHA_PATTERN.match(value) else None
+
+        packed_refs = os.path.join(common_dir, "packed-refs")
+        if os.path.isfile(packed_refs):
+            with open(packed_refs) as fhandle:
+                for line in fhandle:
+                    if line.startswith(("#", "^")):
+                        continue
+                    parts = line.split()
+                    if len(parts) == 2 and parts[1] == ref:
+                        return parts[0]
+        # e.g. a branch without any commits yet
+        return None
+
+    def _read_config(self, git_dirs, section, subsection, variable) -> Optional[str]:
+        # This covers the plain "key = value" lines git itself writes for remotes; anything
+        # fancier (includes, quoting, continuation lines) is left to git.
+        value = None
+        in_section = False
+        with open(os.path.join(git_dirs[1], "config")) as fhandle:
+            for line in fhandle:
+                section_match = SECTION_PATTERN.match(line)
+                if section_match:
+                    in_section = (
+                        section_match.group(1).lower() == section
+                        and section_match.group(2) == subsection
+                    )
+                    continue
+                if in_section:
+                    variable_match = VARIABLE_PATTERN.match(line)
+                    if variable_match and variable_match.group(1).lower() == variable:
+                        value = variable_match.group(2)
+                        if (
+                            value.startswith('"')
+                            or "\\" in value
+                            or value.endswith(";")
+                        ):
+                            return None
+        return value
+
+
+git_metadata = GitMetadata()
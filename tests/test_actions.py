@@ -15,6 +15,7 @@ from sceptre.exceptions import (
     UnknownStackChangeSetStatusError,
     UnknownStackStatusError,
 )
+from sceptre.outputs_cache import account_key, stack_outputs_cache
 from sceptre.plan.actions import StackActions
 from sceptre.stack import Stack
 from sceptre.stack_status import StackChangeSetStatus, StackStatus
@@ -23,6 +24,7 @@ from sceptre.template import Template
 
 class TestStackActions(object):
     def setup_method(self, test_method):
+        stack_outputs_cache.clear()
         self.patcher_connection_manager = patch(
             "sceptre.plan.actions.ConnectionManager"
         )
@@ -131,6 +133,24 @@ class TestStackActions(object):
         )
         mock_wait_for_completion.assert_called_once_with(boto_response=ANY)
 
+    @patch("sceptre.plan.actions.export_catalogs")
+    @patch("sceptre.plan.actions.StackActions._wait_for_completion")
+    @patch("sceptre.plan.actions.StackActions._get_stack_timeout")
+    def test_create_invalidates_only_the_stack_in_its_account_catalog(
+        self, mock_get_stack_timeout, mock_wait_for_completion, mock_export_catalogs
+    ):
+        self.template._body = sentinel.template
+        mock_get_stack_timeout.return_value = {"TimeoutInMinutes": sentinel.timeout}
+
+        self.actions.create()
+
+        account = account_key(self.stack.profile, self.stack.sceptre_role)
+        assert (
+            mock_export_catalogs.invalidate_stack.call_args_list
+            == [call(account, sentinel.region, sentinel.external_name)] * 2
+        )
+        mock_export_catalogs.invalidate.assert_not_called()
+
     @patch("sceptre.plan.actions.StackActions._wait_for_completion")
     @patch("sceptre.plan.actions.StackActions._get_stack_timeout")
     def test_create_disable_rollback_overrides_on_failure(
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+import json
+import threading
+
+from unittest.mock import patch
+
+from sceptre.api_metrics import ApiCallCollector, NO_STACK
+
+
+class TestApiCallCollector(object):
+    def setup_method(self, test_method):
+        self.collector = ApiCallCollector(top_stacks=2)
+
+    def record(
+        self, service, command, stack_name, latency, throttles=(), coalesced=False
+    ):
+        with patch("sceptre.api_metrics.time.perf_counter", side_effect=[0, latency]):
+            with self.collector.record(service, command, stack_name):
+                for delay in throttles:
+                    self.collector.record_throttle(delay)
+                if coalesced:
+                    self.collector.record_coalesced()
+
+    def test_record__records_call_details(self):
+        self.record("cloudformation", "describe_stacks", "prj-vpc", 0.5, [1, 2.5])
+
+        (call,) = self.collector.calls
+        assert call.service == "cloudformation"
+        assert call.command == "describe_stacks"
+        assert call.stack_name == "prj-vpc"
+        assert call.latency == 0.5
+        assert call.retries == 2
+        assert call.throttle_seconds == 3.5
+
+    def test_record__no_stack_name__uses_placeholder_name(self):
+        self.record("s3", "list_buckets", None, 0.1)
+
+        assert self.collector.calls[0].stack_name == NO_STACK
+
+    def test_record_throttle__outside_of_recorded_call__is_ignored(self):
+        self.collector.record_throttle(1)
+        self.collector.record_coalesced()
+
+        assert self.collector.calls == []
+
+    def test_record__calls_on_other_threads__are_recorded_separately(self):
+        def record_with_throttle():
+            with self.collector.record("s3", "get_bucket_location", "prj-b"):
+                self.collector.record_throttle(1)
+
+        with self.collector.record("s3", "list_buckets", "prj-a"):
+            thread = threading.Thread(target=record_with_throttle)
+            thread.start()
+            thread.join()
+
+        calls = {call.command: call for call in self.collector.calls}
+        assert calls["list_buckets"].retries == 0
+        assert calls["get_bucket_location"].retries == 1
+
+    def test_summary__aggregates_calls_per_command_and_stack(self):
+        for latency in [0.1, 0.2, 0.3, 0.4, 1.0]:
+            self.record("cloudformation", "describe_stacks", "prj-vpc", latency)
+        self.record("cloudformation", "describe_stacks", "prj-app", 0.2, coalesced=True)
+        self.record("s3", "list_buckets", "prj-app", 0.3, [1.5])
+        self.record("s3", "list_buckets", "prj-db", 0.3)
+
+        summary = self.collector.summary()
+
+        assert summary["total_calls"] == 8
+        assert summary["total_retries"] == 1
+        assert summary["total_throttle_seconds"] == 1.5
+        assert list(summary["commands"]) == [
+            "cloudformation.describe_stacks",
+            "s3.list_buckets",
+        ]
+        assert summary["commands"]["cloudformation.describe_stacks"] == {
+            "calls": 6,
+            "coalesced": 1,
+            "p50_latency_seconds": 0.2,
+            "p95_latency_seconds": 1.0,
+            "total_latency_seconds": 2.2,
+            "retries": 0,
+            "throttle_seconds": 0,
+        }
+        assert summary["top_stacks"] == [
+            {"stack": "prj-vpc", "calls": 5},
+            {"stack": "prj-app", "calls": 2},
+        ]
+
+    def test_report__returns_summary_as_json(self):
+        self.record("s3", "list_buckets", "prj-app", 0.3)
+
+        assert json.loads(self.collector.report()) == self.collector.summary()
+
+    def test_reset__clears_calls(self):
+        self.record("s3", "list_buckets", "prj-app", 0.3)
+        self.collector.reset()
+
+        assert self.collector.summary()["total_calls"] == 0
@@ -701,6 +701,29 @@ class TestCli:
         assert result.exit_code == 0
         assert result.output == '{\n    "mock-stack": "status"\n}\n'
 
+    def test_api_report_file__writes_report_after_command(self, tmp_path):
+        self.mock_stack_actions.get_status.return_value = "status"
+        report_path = tmp_path / "reports" / "api.json"
+
+        result = self.runner.invoke(
+            cli, ["--api-report-file", str(report_path), "status", "dev/vpc.yaml"]
+        )
+
+        assert result.exit_code == 0
+        assert json.loads(report_path.read_text())["total_calls"] == 0
+
+    def test_resolver_profile_file__writes_report_after_command(self, tmp_path):
+        self.mock_stack_actions.get_status.return_value = "status"
+        report_path = tmp_path / "reports" / "resolvers.json"
+
+        result = self.runner.invoke(
+            cli,
+            ["--resolver-profile-file", str(report_path), "status", "dev/vpc.yaml"],
+        )
+
+        assert result.exit_code == 0
+        assert json.loads(report_path.read_text())["total_resolves"] == 0
+
     def test_new_project_non_existant(self):
         with self.runner.isolated_filesystem():
             project_path = os.path.abspath("./example")
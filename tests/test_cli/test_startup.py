@@ -0,0 +1,93 @@
+import subprocess
+import sys
+
+import pytest
+
+# These are slow to import and are not needed to parse the command line, so importing
+# sceptre.cli should not pull them in. Each subcommand imports what it needs when it is run.
+DEFERRED_MODULES = [
+    "boto3",
+    "cfn_flip",
+    "deepdiff",
+    "jinja2",
+    "networkx",
+    "sceptre.plan.plan",
+    "sceptre.config.reader",
+]
+
+
+def imported_modules(statement):
+    """
+    Runs the statement in a fresh interpreter with ``-X importtime``.
+
+    :param statement: The Python statement to run.
+    :returns: The names of the modules imported, mapped to their cumulative import time in
+        microseconds.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+class TestStartup:
+    def setup_method(self, test_method):
+        self.modules = imported_modules("from sceptre.cli import cli")
+
+    @pytest.mark.parametrize("module", DEFERRED_MODULES)
+    def test_importing_cli__does_not_import_heavy_module(self, module):
+        assert module not in self.modules
+
+    def test_getting_subcommand__imports_only_its_module(self):
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys; from sceptre.cli import cli; cli.get_command(None, 'launch'); "
+                "print('sceptre.cli.launch' in sys.modules, 'sceptre.cli.diff' in sys.modules)",
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert result.stdout.split() == ["True", "False"]
+
+    @pytest.mark.parametrize("module", DEFERRED_MODULES + ["sceptre.cli.diff"])
+    def test_help__does_not_import_subcommands(self, module):
+        modules = imported_modules(
+            "from sceptre.cli import cli\n"
+            "try:\n"
+            "    cli(['--help'])\n"
+            "except SystemExit:\n"
+            "    pass"
+        )
+
+        assert "sceptre.cli" in modules
+        assert module not in modules
+
+    def test_lazy_commands__short_help_matches_the_commands(self):
+        from sceptre.cli import LAZY_COMMANDS, cli
+
+        for cmd_name, (_, short_help) in LAZY_COMMANDS.items():
+            command = cli.get_command(None, cmd_name)
+            assert command.get_short_help_str(limit=1000) == short_help, cmd_name
+
+
+if __name__ == "__main__":
+    # Prints the slowest imports made when starting the CLI, e.g.
+    # python tests/test_cli/test_startup.py | head
+    for name, microseconds in sorted(
+        imported_modules("from sceptre.cli import cli").items(),
+        key=lambda item: -item[1],
+    )[:25]:
+        print(f"{microseconds / 1000:10.1f}ms  {name}")
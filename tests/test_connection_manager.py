@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
+import threading
 import warnings
 import pytest
 
@@ -10,6 +11,7 @@ from deprecation import fail_if_not_removed
 from boto3.session import Session
 from botocore.exceptions import ClientError
 
+from sceptre.api_metrics import api_call_collector
 from sceptre.connection_manager import (
     ConnectionManager,
     _retry_boto_call,
@@ -288,7 +290,7 @@ class TestConnectionManager(object):
         assert client_1 == client_2
         assert self.mock_session.client.call_count == 1
 
-    @patch("sceptre.connection_manager.boto3.session.Session.get_credentials")
+    @patch("boto3.session.Session.get_credentials")
     def test_get_client_with_existing_client_and_profile_none(
         self, mock_get_credentials
     ):
@@ -803,6 +805,199 @@ class TestConnectionManager(object):
         assert connection_manager.iam_role == "sceptre_role"
         assert connection_manager.iam_role_session_duration == 123456
 
+    def test_call__coalescing_disabled__does_not_share_responses(self):
+        expected_client = self.set_up_expected_client(
+            "cloudformation", None, None, self.region, None
+        )
+        expected_client.describe_stacks.side_effect = lambda **kwargs: {"Stacks": []}
+
+        first = self.connection_manager.call("cloudformation", "describe_stacks")
+        second = self.connection_manager.call("cloudformation", "describe_stacks")
+
+        assert expected_client.describe_stacks.call_count == 2
+        assert first is not second
+
+
+class TestCallRecording:
+    def setup_method(self, test_method):
+        ConnectionManager._boto_sessions = {}
+        ConnectionManager._clients = clients = defaultdict(Mock)
+        ConnectionManager._stack_keys = {}
+        api_call_collector.reset()
+
+        self.client = clients[("cloudformation", "eu-west-1", None, "prj-vpc", None)]
+        self.connection_manager = ConnectionManager(
+            region="eu-west-1", stack_name="prj-vpc"
+        )
+
+    def teardown_method(self, test_method):
+        api_call_collector.enabled = False
+        api_call_collector.reset()
+
+    def test_call__collector_disabled__records_nothing(self):
+        self.connection_manager.call(
+            "cloudformation", "describe_stacks", stack_name="prj-vpc"
+        )
+
+        assert api_call_collector.calls == []
+
+    @patch("sceptre.connection_manager.time.sleep")
+    def test_call__collector_enabled__records_call_with_retries(self, mock_sleep):
+        api_call_collector.enabled = True
+        self.client.describe_stacks.side_effect = [
+            ClientError({"Error": {"Code": "Throttling", "Message": "Slow"}}, "op"),
+            {"Stacks": []},
+        ]
+
+        self.connection_manager.call(
+            service="cloudformation",
+            command="describe_stacks",
+            stack_name="prj-vpc",
+        )
+
+        (call,) = api_call_collector.calls
+        assert (call.service, call.command, call.stack_name) == (
+            "cloudformation",
+            "describe_stacks",
+            "prj-vpc",
+        )
+        assert call.retries == 1
+        assert call.throttle_seconds == 1
+        assert call.coalesced is False
+
+
+class TestCallCoalescing:
+    def setup_method(self, test_method):
+        ConnectionManager._boto_sessions = {}
+        ConnectionManager._clients = clients = defaultdict(Mock)
+        ConnectionManager._stack_keys = {}
+        ConnectionManager._inflight_calls = {}
+        ConnectionManager.coalesce_calls = True
+        ConnectionManager.coalesce_ttl = 0
+
+        self.region = "eu-west-1"
+        self.client = clients[("cloudformation", self.region, None, None, None)]
+        self.connection_manager = ConnectionManager(region=self.region)
+
+    def teardown_method(self, test_method):
+        ConnectionManager.coalesce_calls = False
+        ConnectionManager.coalesce_ttl = 0
+        ConnectionManager._inflight_calls = {}
+
+    def call_concurrently(self, count, command="describe_stacks", kwargs=None):
+        results = [None] * count
+
+        def call(index):
+            results[index] = self.connection_manager.call(
+                "cloudformation", command, kwargs or {"StackName": "vpc"}
+            )
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        return threads, results
+
+    def block_client_command(self, command, response):
+        release = threading.Event()
+        started = threading.Event()
+
+        def blocking_call(**kwargs):
+            started.set()
+            release.wait(5)
+            return response
+
+        getattr(self.client, command).side_effect = blocking_call
+        return started, release
+
+    def test_call__concurrent_identical_calls__share_one_request(self):
+        response = {"Stacks": [{"StackName": "vpc"}]}
+        started, release = self.block_client_command("describe_stacks", response)
+        threads, results = self.call_concurrently(1)
+        started.wait(5)
+        in_flight = next(iter(ConnectionManager._inflight_calls.values()))
+        waiting = threading.Semaphore(0)
+        wait = in_flight.done.wait
+
+        def counting_wait(*args):
+            waiting.release()
+            return wait(*args)
+
+        in_flight.done.wait = counting_wait
+        follower_threads, follower_results = self.call_concurrently(3)
+        for _ in range(3):
+            assert waiting.acquire(timeout=5)
+        release.set()
+        for thread in threads + follower_threads:
+            thread.join(5)
+
+        self.client.describe_stacks.assert_called_once_with(StackName="vpc")
+        for result in follower_results:
+            assert result == results[0]
+            assert result is not results[0]
+        assert results[0] is not response
+        assert ConnectionManager._inflight_calls == {}
+
+    def test_call__command_not_coalescible__makes_every_request(self):
+        self.connection_manager.call("cloudformation", "update_stack", {"A": "b"})
+        self.connection_manager.call("cloudformation", "update_stack", {"A": "b"})
+
+        assert self.client.update_stack.call_count == 2
+
+    def test_call__different_kwargs__are_not_shared(self):
+        self.connection_manager.call("cloudformation", "describe_stacks", {"S": "a"})
+        self.connection_manager.call("cloudformation", "describe_stacks", {"S": "b"})
+
+        assert self.client.describe_stacks.call_count == 2
+
+    def test_call__ttl_set__reuses_completed_response(self):
+        ConnectionManager.coalesce_ttl = 60
+        self.client.describe_stacks.return_value = {"Stacks": []}
+
+        first = self.connection_manager.call("cloudformation", "describe_stacks")
+        second = self.connection_manager.call("cloudformation", "describe_stacks")
+
+        self.client.describe_stacks.assert_called_once_with()
+        assert first == second
+
+    def test_call__ttl_set__leader_changes_do_not_leak_to_later_callers(self):
+        ConnectionManager.coalesce_ttl = 60
+        self.client.describe_stacks.return_value = {"Stacks": []}
+
+        first = self.connection_manager.call("cloudformation", "describe_stacks")
+        first["Stacks"].append({"StackName": "changed"})
+        second = self.connection_manager.call("cloudformation", "describe_stacks")
+
+        assert second == {"Stacks": []}
+
+    def test_call__no_ttl_and_no_followers__leader_gets_the_response(self):
+        response = {"Stacks": []}
+        self.client.describe_stacks.return_value = response
+
+        result = self.connection_manager.call("cloudformation", "describe_stacks")
+
+        assert result is response
+
+    @patch("sceptre.connection_manager.time.monotonic")
+    def test_call__ttl_expired__makes_new_request(self, mock_monotonic):
+        ConnectionManager.coalesce_ttl = 60
+        mock_monotonic.side_effect = [0, 61, 61]
+
+        self.connection_manager.call("cloudformation", "describe_stacks")
+        self.connection_manager.call("cloudformation", "describe_stacks")
+
+        assert self.client.describe_stacks.call_count == 2
+
+    def test_call__request_raises__error_is_not_cached(self):
+        ConnectionManager.coalesce_ttl = 60
+        error = ClientError({"Error": {"Code": "500", "Message": "Boom!"}}, "op")
+        self.client.describe_stacks.side_effect = [error, {"Stacks": []}]
+
+        with pytest.raises(ClientError):
+            self.connection_manager.call("cloudformation", "describe_stacks")
+        response = self.connection_manager.call("cloudformation", "describe_stacks")
+
+        assert response == {"Stacks": []}
+
 
 class TestRetry:
     def test_retry_boto_call_returns_response_correctly(self):
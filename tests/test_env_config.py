@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+import os
+import threading
+import time
+
+import yaml
+
+from sceptre.env_config import EnvConfigStore
+
+
+def write_config(project_path, env_name, config):
+    env_dir = os.path.join(str(project_path), "config", env_name)
+    os.makedirs(env_dir, exist_ok=True)
+    path = os.path.join(env_dir, "config.yaml")
+    with open(path, "w") as fhandle:
+        yaml.safe_dump(config, fhandle)
+    return path
+
+
+class TestEnvConfigStore(object):
+    def setup_method(self, test_method):
+        self.store = EnvConfigStore()
+
+    def test_get__parses_config_once(self, tmp_path):
+        write_config(tmp_path, "dev", {"region": "eu-west-1"})
+
+        first = self.store.get("dev", str(tmp_path))
+        second = self.store.get("dev", str(tmp_path))
+
+        assert first == second == {"region": "eu-west-1"}
+        assert (self.store.loads, self.store.hits) == (1, 1)
+
+    def test_get__defaults_to_sceptre_root(self, tmp_path, monkeypatch):
+        write_config(tmp_path, "dev", {"region": "eu-west-1"})
+        monkeypatch.setenv("SCEPTRE_ROOT", str(tmp_path))
+
+        assert self.store.get("dev") == {"region": "eu-west-1"}
+
+    def test_get__config_changes__parses_it_again(self, tmp_path):
+        path = write_config(tmp_path, "dev", {"region": "eu-west-1"})
+        self.store.get("dev", str(tmp_path))
+
+        write_config(tmp_path, "dev", {"region": "us-east-1"})
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+
+        assert self.store.get("dev", str(tmp_path)) == {"region": "us-east-1"}
+        assert self.store.loads == 2
+
+    def test_get__concurrent_callers__parse_once(self, tmp_path):
+        write_config(tmp_path, "dev", {"region": "eu-west-1"})
+        results = []
+
+        def get():
+            results.append(self.store.get("dev", str(tmp_path)))
+
+        threads = [threading.Thread(target=get) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        assert results == [{"region": "eu-west-1"}] * 10
+        assert self.store.loads == 1
+
+    def test_derived__builds_once_per_config_version(self, tmp_path):
+        path = write_config(tmp_path, "dev", {"region": "eu-west-1"})
+        builds = []
+
+        def build(config):
+            builds.append(config["region"])
+            return config["region"].upper()
+
+        assert self.store.derived("dev", "upper", build, str(tmp_path)) == "EU-WEST-1"
+        assert self.store.derived("dev", "upper", build, str(tmp_path)) == "EU-WEST-1"
+
+        write_config(tmp_path, "dev", {"region": "us-east-1"})
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+
+        assert self.store.derived("dev", "upper", build, str(tmp_path)) == "US-EAST-1"
+        assert builds == ["eu-west-1", "us-east-1"]
+
+
+def benchmark(project_path, env_count=20, references=500):
+    """
+    Times reading the env configs of ``references`` cross-env references spread over ``env_count``
+    environments, parsing each config every time (as the resolvers used to) and through the store.
+    """
+    env_names = [f"env{index}" for index in range(env_count)]
+    for env_name in env_names:
+        write_config(
+            project_path,
+            env_name,
+            {
+                "project_code": "prj",
+                "region": "eu-west-1",
+                "profile": env_name,
+                "tags": {f"Tag{index}": f"value{index}" for index in range(50)},
+            },
+        )
+    lookups = [env_names[index % env_count] for index in range(references)]
+
+    start = time.perf_counter()
+    for env_name in lookups:
+        path = os.path.join(project_path, "config", env_name, "config.yaml")
+        with open(path, "r") as fhandle:
+            yaml.load(fhandle.read(), Loader=yaml.FullLoader)
+    uncached = time.perf_counter() - start
+
+    store = EnvConfigStore()
+    start = time.perf_counter()
+    for env_name in lookups:
+        store.get(env_name, project_path)
+    cached = time.perf_counter() - start
+
+    return uncached, cached
+
+
+if __name__ == "__main__":
+    # Compares parsing env configs on every lookup with the store, e.g.
+    # python tests/test_env_config.py
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as project_path:
+        for references in (100, 500, 2000):
+            uncached, cached = benchmark(project_path, references=references)
+            print(
+                f"{references:5d} references: {uncached * 1000:8.1f}ms parsing each time, "
+                f"{cached * 1000:6.1f}ms through the store"
+            )
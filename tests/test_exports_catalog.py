@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from sceptre.exports_catalog import (
+    ExportCatalog,
+    ExportCatalogStore,
+    describe_all_stacks,
+    describe_stack,
+)
+from sceptre.outputs_cache import stack_outputs_cache
+
+
+def stack(name, outputs=None, tags=None, **fields):
+    description = {
+        "StackName": name,
+        "Outputs": [
+            dict(
+                {"OutputKey": key, "OutputValue": value},
+                **({"ExportName": name + "-" + key} if key.endswith("Arn") else {}),
+            )
+            for key, value in (outputs or {}).items()
+        ],
+        "Tags": [{"Key": key, "Value": value} for key, value in (tags or {}).items()],
+    }
+    description.update(fields)
+    return description
+
+
+STACKS = [
+    stack(
+        "prj-dev-queues",
+        {"JobsArn": "arn:aws:sqs:jobs", "JobsUrl": "https://jobs"},
+        {"Team": "data"},
+        StackStatus="UPDATE_COMPLETE",
+    ),
+    stack(
+        "prj-dev-queues-extra",
+        {"ExtraArn": "arn:aws:sqs:extra"},
+        {"Team": "web"},
+        StackStatus="CREATE_COMPLETE",
+    ),
+    stack("prj-qa-queues", {"QaArn": "arn:aws:sqs:qa"}),
+    stack("prj-dev-vpc"),
+]
+
+
+class TestExportCatalog(object):
+    def setup_method(self, test_method):
+        self.catalog = ExportCatalog(STACKS)
+
+    def test_outputs(self):
+        assert self.catalog.outputs("prj-dev-vpc") == []
+        assert self.catalog.outputs("prj-dev-missing") is None
+        assert [x["OutputKey"] for x in self.catalog.outputs("prj-dev-queues")] == [
+            "JobsArn",
+            "JobsUrl",
+        ]
+
+    def test_export(self):
+        assert self.catalog.export("prj-qa-queues-QaArn") == "arn:aws:sqs:qa"
+        assert self.catalog.export("prj-dev-queues-JobsUrl") is None
+
+    def test_filter_stacks__prefix_and_pattern(self):
+        names = [
+            x["StackName"] for x in self.catalog.filter_stacks("^queues", "prj-dev-")
+        ]
+
+        assert names == ["prj-dev-queues", "prj-dev-queues-extra"]
+
+    def test_filter_stacks__tag_and_field_filters(self):
+        assert [
+            x["StackName"]
+            for x in self.catalog.filter_stacks("queues", "prj-dev-", Team="^data$")
+        ] == ["prj-dev-queues"]
+        assert [
+            x["StackName"]
+            for x in self.catalog.filter_stacks(
+                "queues", "prj-dev-", StackStatus="^CREATE"
+            )
+        ] == ["prj-dev-queues-extra"]
+        assert self.catalog.filter_stacks("queues", "prj-dev-", Missing=".*") == []
+
+    def test_filter_outputs(self):
+        assert self.catalog.filter_outputs("queues", "Arn$", "prj-dev-") == [
+            {"JobsArn": "arn:aws:sqs:jobs"},
+            {"ExtraArn": "arn:aws:sqs:extra"},
+        ]
+
+    def test_filter_outputs__stack_pattern_is_matched_without_the_prefix(self):
+        assert self.catalog.filter_outputs("^queues$", ".*", "prj-dev-") == [
+            {"JobsArn": "arn:aws:sqs:jobs"}
+        ]
+        assert self.catalog.filter_outputs("^prj-dev-queues$", ".*", "prj-dev-") == []
+
+    def test_filter_outputs__prefix_selects_the_env(self):
+        assert self.catalog.filter_outputs("queues", ".*", "prj-qa-") == [
+            {"QaArn": "arn:aws:sqs:qa"}
+        ]
+
+    def test_filter_outputs__key_pattern(self):
+        assert self.catalog.filter_outputs(".*", "^Extra", "prj-") == [
+            {"ExtraArn": "arn:aws:sqs:extra"}
+        ]
+
+    def test_filter_outputs__unexported_outputs_are_left_out(self):
+        assert self.catalog.filter_outputs(".*", "Url$", "prj-") == []
+        assert self.catalog.filter_outputs("^dev-queues$", "^Jobs", "prj-") == [
+            {"JobsArn": "arn:aws:sqs:jobs"}
+        ]
+
+    def test_with_stack__replaces_adds_and_removes_stacks(self):
+        changed = stack("prj-qa-queues", {"QaArn": "arn:aws:sqs:qa2"})
+
+        replaced = self.catalog.with_stack("prj-qa-queues", changed)
+        added = self.catalog.with_stack("prj-qa-new", stack("prj-qa-new"))
+        removed = self.catalog.with_stack("prj-dev-vpc", None)
+
+        assert replaced.export("prj-qa-queues-QaArn") == "arn:aws:sqs:qa2"
+        assert self.catalog.export("prj-qa-queues-QaArn") == "arn:aws:sqs:qa"
+        assert added.stack_names()[-1] == "prj-qa-new"
+        assert "prj-dev-vpc" not in removed.stack_names()
+        assert len(self.catalog) == 4
+
+
+class TestExportCatalogStore(object):
+    def setup_method(self, test_method):
+        stack_outputs_cache.clear()
+        self.store = ExportCatalogStore()
+
+    def teardown_method(self, test_method):
+        stack_outputs_cache.clear()
+
+    def test_get__builds_once(self):
+        list_stacks = MagicMock(return_value=STACKS)
+
+        first = self.store.get("123", "eu-west-1", list_stacks)
+        second = self.store.get("123", "eu-west-1", list_stacks)
+
+        assert first is second
+        assert len(first) == 4
+        list_stacks.assert_called_once_with()
+        assert self.store.builds == 1
+
+    def test_get__caches_every_stacks_outputs(self):
+        self.store.get("123", "eu-west-1", lambda: STACKS)
+
+        assert stack_outputs_cache.get(
+            "123", "eu-west-1", "prj-qa-queues", lambda: pytest.fail("described")
+        ) == [
+            {
+                "OutputKey": "QaArn",
+                "OutputValue": "arn:aws:sqs:qa",
+                "ExportName": "prj-qa-queues-QaArn",
+            }
+        ]
+
+    def test_get__accounts_and_regions_have_their_own_catalogs(self):
+        self.store.get("123", "eu-west-1", lambda: STACKS)
+        catalog = self.store.get("456", "eu-west-1", lambda: STACKS[:1])
+
+        assert len(catalog) == 1
+        assert self.store.builds == 2
+
+    def test_get__concurrent_callers__build_once(self):
+        started = threading.Event()
+        release = threading.Event()
+        list_stacks = MagicMock()
+
+        def slow_list_stacks():
+            started.set()
+            release.wait(5)
+            return STACKS
+
+        list_stacks.side_effect = slow_list_stacks
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    self.store.get("123", "eu-west-1", list_stacks)
+                )
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        started.wait(5)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert len(results) == 5
+        assert all(result is results[0] for result in results)
+        assert list_stacks.call_count == 1
+
+    def test_get__failed_build__is_not_kept(self):
+        with pytest.raises(RuntimeError):
+            self.store.get(
+                "123", "eu-west-1", MagicMock(side_effect=RuntimeError("denied"))
+            )
+
+        assert not self.store.contains("123", "eu-west-1")
+        assert len(self.store.get("123", "eu-west-1", lambda: STACKS)) == 4
+
+    def test_invalidate__region(self):
+        self.store.get("123", "eu-west-1", lambda: STACKS)
+        self.store.get("123", "us-east-1", lambda: STACKS)
+
+        self.store.invalidate("eu-west-1")
+
+        assert not self.store.contains("123", "eu-west-1")
+        assert self.store.contains("123", "us-east-1")
+
+    def test_invalidate_stack__only_that_stack_is_described_again(self):
+        list_stacks = MagicMock(return_value=STACKS)
+        self.store.get("123", "eu-west-1", list_stacks)
+        changed = stack("prj-qa-queues", {"QaArn": "arn:aws:sqs:qa2"})
+        describe = MagicMock(return_value=changed)
+
+        self.store.invalidate_stack("123", "eu-west-1", "prj-qa-queues")
+        catalog = self.store.get("123", "eu-west-1", list_stacks, describe)
+        again = self.store.get("123", "eu-west-1", list_stacks, describe)
+
+        assert catalog.export("prj-qa-queues-QaArn") == "arn:aws:sqs:qa2"
+        assert again is catalog
+        assert len(catalog) == 4
+        describe.assert_called_once_with("prj-qa-queues")
+        list_stacks.assert_called_once_with()
+        assert (
+            stack_outputs_cache.get(
+                "123", "eu-west-1", "prj-qa-queues", lambda: pytest.fail("described")
+            )
+            == changed["Outputs"]
+        )
+
+    def test_invalidate_stack__deleted_stack__is_removed(self):
+        self.store.get("123", "eu-west-1", lambda: STACKS)
+
+        self.store.invalidate_stack("123", "eu-west-1", "prj-dev-vpc")
+        catalog = self.store.get("123", "eu-west-1", lambda: STACKS, lambda name: None)
+
+        assert catalog.outputs("prj-dev-vpc") is None
+        assert len(catalog) == 3
+
+    def test_invalidate_stack__other_accounts_and_regions_are_kept(self):
+        first = self.store.get("123", "eu-west-1", lambda: STACKS)
+        other_account = self.store.get("456", "eu-west-1", lambda: STACKS)
+        other_region = self.store.get("123", "us-east-1", lambda: STACKS)
+        describe = MagicMock()
+
+        self.store.invalidate_stack("123", "eu-west-1", "prj-dev-vpc")
+
+        assert self.store.get("456", "eu-west-1", lambda: [], describe) is other_account
+        assert self.store.get("123", "us-east-1", lambda: [], describe) is other_region
+        assert self.store.get("123", "eu-west-1", lambda: [], describe) is not first
+        describe.assert_called_once_with("prj-dev-vpc")
+
+    def test_invalidate_stack__without_describe_stack__rebuilds_the_catalog(self):
+        self.store.get("123", "eu-west-1", lambda: STACKS)
+
+        self.store.invalidate_stack("123", "eu-west-1", "prj-dev-vpc")
+        catalog = self.store.get("123", "eu-west-1", lambda: STACKS[:1])
+
+        assert len(catalog) == 1
+        assert self.store.builds == 2
+
+    def test_invalidate_stack__while_waiting_without_describe_stack__rebuilds(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_list_stacks():
+            started.set()
+            release.wait(5)
+            return STACKS
+
+        builder = threading.Thread(
+            target=self.store.get, args=("123", "eu-west-1", slow_list_stacks)
+        )
+        builder.start()
+        started.wait(5)
+        results = []
+        waiter = threading.Thread(
+            target=lambda: results.append(
+                self.store.get("123", "eu-west-1", lambda: STACKS[:1])
+            )
+        )
+        waiter.start()
+        time.sleep(0.05)  # the waiter is waiting for the build
+        self.store.invalidate_stack("123", "eu-west-1", "prj-dev-vpc")
+        release.set()
+        builder.join(5)
+        waiter.join(5)
+
+        [catalog] = results
+        assert len(catalog) == 1
+        assert self.store.builds == 2
+
+    def test_invalidate_stack__failed_describe__is_retried(self):
+        self.store.get("123", "eu-west-1", lambda: STACKS)
+        self.store.invalidate_stack("123", "eu-west-1", "prj-dev-vpc")
+
+        with pytest.raises(RuntimeError):
+            self.store.get(
+                "123", "eu-west-1", lambda: STACKS, MagicMock(side_effect=RuntimeError)
+            )
+        catalog = self.store.get("123", "eu-west-1", lambda: STACKS, lambda name: None)
+
+        assert len(catalog) == 3
+
+
+def test_describe_stack():
+    connection_manager = MagicMock()
+    connection_manager.call.return_value = {"Stacks": STACKS[:1]}
+
+    assert describe_stack(connection_manager, "prj-dev-queues") == STACKS[0]
+    assert connection_manager.call.call_args.kwargs["kwargs"] == {
+        "StackName": "prj-dev-queues"
+    }
+
+
+def test_describe_stack__missing_stack__returns_none():
+    connection_manager = MagicMock()
+    connection_manager.call.side_effect = ClientError(
+        {"Error": {"Code": "ValidationError", "Message": "Stack x does not exist"}},
+        "DescribeStacks",
+    )
+
+    assert describe_stack(connection_manager, "x") is None
+
+
+def test_describe_all_stacks__pages_through_describe_stacks():
+    connection_manager = MagicMock()
+    connection_manager.call.side_effect = [
+        {"Stacks": STACKS[:2], "NextToken": "token"},
+        {"Stacks": STACKS[2:]},
+    ]
+
+    assert describe_all_stacks(connection_manager, region="eu-west-1") == STACKS
+    assert [
+        (call.kwargs["kwargs"], call.kwargs["region"])
+        for call in connection_manager.call.call_args_list
+    ] == [({}, "eu-west-1"), ({"NextToken": "token"}, "eu-west-1")]
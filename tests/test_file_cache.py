@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import pytest
+
+from sceptre.file_cache import FileContentsCache
+
+
+class TestFileContentsCache(object):
+    def setup_method(self, test_method):
+        self.cache = FileContentsCache(max_bytes=10)
+
+    def write(self, path, contents, mtime_ns=None):
+        path.write_bytes(contents)
+        if mtime_ns is not None:
+            os.utime(str(path), ns=(mtime_ns, mtime_ns))
+        return str(path)
+
+    def test_read__cached_until_file_changes(self, tmp_path):
+        path = self.write(tmp_path / "a", b"one", mtime_ns=10**18)
+
+        assert self.cache.read(path) == "one"
+        assert self.cache.read(path) == "one"
+        self.write(tmp_path / "a", b"two", mtime_ns=10**18 + 1)
+
+        assert self.cache.read(path) == "two"
+        assert self.cache.stats()["hits"] == 1
+        assert self.cache.stats()["misses"] == 2
+
+    def test_read__relative_and_absolute_paths_share_entries(
+        self, tmp_path, monkeypatch
+    ):
+        path = self.write(tmp_path / "a", b"one")
+        monkeypatch.chdir(str(tmp_path))
+
+        self.cache.read("a")
+        self.cache.read(path)
+
+        assert self.cache.stats()["hits"] == 1
+
+    def test_read__evicts_least_recently_read_files_over_max_bytes(self, tmp_path):
+        a = self.write(tmp_path / "a", b"aaaa")
+        b = self.write(tmp_path / "b", b"bbbb")
+        c = self.write(tmp_path / "c", b"cccc")
+
+        for path in (a, b, a, c):
+            self.cache.read(path)
+
+        stats = self.cache.stats()
+        assert stats["evictions"] == 1
+        assert stats["bytes"] == 8
+        self.cache.read(a)
+        assert self.cache.stats()["hits"] == 2
+
+    def test_read__files_over_max_bytes_are_not_cached(self, tmp_path):
+        path = self.write(tmp_path / "big", b"x" * 11)
+
+        self.cache.read(path)
+        self.cache.read(path)
+
+        assert self.cache.stats()["files"] == 0
+
+    def test_read__memory_mapped__matches_text_mode_read(self, tmp_path):
+        self.cache = FileContentsCache(mmap_threshold=4)
+        path = self.write(tmp_path / "a", "line\r\nnext\rlast\n".encode())
+
+        with open(path) as fhandle:
+            assert self.cache.read(path) == fhandle.read()
+
+    def test_read__missing_file__raises(self):
+        with pytest.raises(IOError):
+            self.cache.read("/non_existant_file")
@@ -0,0 +1,354 @@
+from unittest.mock import Mock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from sceptre.connection_manager import ConnectionManager
+from sceptre.exceptions import RetryLimitExceededError
+from sceptre.offline_backend import (
+    OfflineBackend,
+    OfflineBackendConfig,
+    OfflineSession,
+    use_aws_backend,
+    use_offline_backend,
+)
+
+REGION = "eu-west-1"
+
+TEMPLATE = """
+Parameters:
+  Cidr:
+    Type: String
+    Default: 10.0.0.0/16
+Resources:
+  Vpc:
+    Type: AWS::EC2::VPC
+    Properties:
+      CidrBlock: !Ref Cidr
+Outputs:
+  VpcId:
+    Value: !Ref Vpc
+    Export:
+      Name: !Sub "${AWS::StackName}-VpcId"
+  Cidr:
+    Value: !Ref Cidr
+  Arn:
+    Value: !GetAtt Vpc.Arn
+"""
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1700000000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestOfflineBackend:
+    def setup_method(self, test_method):
+        self.clock = FakeClock()
+        self.config = OfflineBackendConfig(
+            operation_durations={"create": 30, "update": 20, "delete": 10}
+        )
+        self.backend = OfflineBackend(self.config, clock=self.clock, sleep=Mock())
+
+    def call(self, service, command, **kwargs):
+        return self.backend.call(service, command, REGION, kwargs)
+
+    def create_stack(self, name="vpc", **kwargs):
+        kwargs.setdefault("TemplateBody", TEMPLATE)
+        kwargs.setdefault(
+            "Parameters", [{"ParameterKey": "Cidr", "ParameterValue": "10.1.0.0/16"}]
+        )
+        return self.call("cloudformation", "create_stack", StackName=name, **kwargs)
+
+    def status(self, name="vpc"):
+        response = self.call("cloudformation", "describe_stacks", StackName=name)
+        return response["Stacks"][0]["StackStatus"]
+
+    def test_create_stack__completes_after_operation_duration(self):
+        self.create_stack()
+        assert self.status() == "CREATE_IN_PROGRESS"
+
+        self.clock.now += 30
+        assert self.status() == "CREATE_COMPLETE"
+
+    def test_create_stack__logs_events_most_recent_first(self):
+        self.create_stack()
+        self.clock.now += 30
+        events = self.call("cloudformation", "describe_stack_events", StackName="vpc")[
+            "StackEvents"
+        ]
+        assert [event["ResourceStatus"] for event in events] == [
+            "CREATE_COMPLETE",
+            "CREATE_IN_PROGRESS",
+        ]
+        assert events[0]["Timestamp"] > events[1]["Timestamp"]
+
+    def test_create_stack__existing_stack__raises_already_exists(self):
+        self.create_stack()
+        with pytest.raises(ClientError) as error:
+            self.create_stack()
+        assert error.value.response["Error"]["Code"] == "AlreadyExistsException"
+
+    def test_describe_stacks__unknown_stack__raises_does_not_exist(self):
+        with pytest.raises(ClientError) as error:
+            self.status("missing")
+        assert error.value.response["Error"]["Message"].endswith("does not exist")
+
+    def test_describe_stacks__renders_outputs(self):
+        self.create_stack()
+        outputs = {
+            output["OutputKey"]: output
+            for output in self.call(
+                "cloudformation", "describe_stacks", StackName="vpc"
+            )["Stacks"][0]["Outputs"]
+        }
+        assert outputs["Cidr"]["OutputValue"] == "10.1.0.0/16"
+        assert outputs["VpcId"]["OutputValue"].startswith("vpc-Vpc-")
+        assert outputs["VpcId"]["ExportName"] == "vpc-VpcId"
+        assert outputs["Arn"]["OutputValue"] == (
+            outputs["VpcId"]["OutputValue"] + ".Arn"
+        )
+
+    def test_describe_stacks__without_stack_name__paginates(self):
+        for index in range(150):
+            self.create_stack("stack-{0}".format(index))
+
+        first = self.call("cloudformation", "describe_stacks")
+        second = self.call(
+            "cloudformation", "describe_stacks", NextToken=first["NextToken"]
+        )
+        assert len(first["Stacks"]) == 100
+        assert len(second["Stacks"]) == 50
+        assert "NextToken" not in second
+
+    def test_list_exports__lists_exports_of_created_stacks(self):
+        self.create_stack()
+        assert self.call("cloudformation", "list_exports")["Exports"] == []
+
+        self.clock.now += 30
+        exports = self.call("cloudformation", "list_exports")["Exports"]
+        assert [export["Name"] for export in exports] == ["vpc-VpcId"]
+
+    def test_update_stack__without_changes__raises_no_updates(self):
+        self.create_stack()
+        self.clock.now += 30
+        with pytest.raises(ClientError) as error:
+            self.call(
+                "cloudformation",
+                "update_stack",
+                StackName="vpc",
+                TemplateBody=TEMPLATE,
+                Parameters=[{"ParameterKey": "Cidr", "UsePreviousValue": True}],
+            )
+        assert error.value.response["Error"]["Message"] == (
+            "No updates are to be performed."
+        )
+
+    def test_update_stack__in_progress__raises_validation_error(self):
+        self.create_stack()
+        with pytest.raises(ClientError) as error:
+            self.call(
+                "cloudformation",
+                "update_stack",
+                StackName="vpc",
+                TemplateBody=TEMPLATE + "\n",
+            )
+        assert "CREATE_IN_PROGRESS state" in error.value.response["Error"]["Message"]
+
+    def test_delete_stack__removes_stack_after_operation_duration(self):
+        self.create_stack()
+        self.clock.now += 30
+        self.call("cloudformation", "delete_stack", StackName="vpc")
+        assert self.status() == "DELETE_IN_PROGRESS"
+
+        self.clock.now += 10
+        with pytest.raises(ClientError):
+            self.status()
+
+    def test_change_set__no_changes__fails_with_no_changes_reason(self):
+        self.create_stack()
+        self.clock.now += 30
+        self.call(
+            "cloudformation",
+            "create_change_set",
+            StackName="vpc",
+            ChangeSetName="cs",
+            ChangeSetType="UPDATE",
+            TemplateBody=TEMPLATE,
+            Parameters=[{"ParameterKey": "Cidr", "UsePreviousValue": True}],
+        )
+        change_set = self.call(
+            "cloudformation", "describe_change_set", StackName="vpc", ChangeSetName="cs"
+        )
+        assert change_set["Status"] == "FAILED"
+        assert "didn't contain changes" in change_set["StatusReason"]
+
+    def test_change_set__create_and_execute__creates_stack(self):
+        self.call(
+            "cloudformation",
+            "create_change_set",
+            StackName="vpc",
+            ChangeSetName="cs",
+            ChangeSetType="CREATE",
+            TemplateBody=TEMPLATE,
+        )
+        assert self.status() == "REVIEW_IN_PROGRESS"
+        change_set = self.call(
+            "cloudformation", "describe_change_set", StackName="vpc", ChangeSetName="cs"
+        )
+        assert (change_set["Status"], change_set["ExecutionStatus"]) == (
+            "CREATE_COMPLETE",
+            "AVAILABLE",
+        )
+
+        self.call(
+            "cloudformation", "execute_change_set", StackName="vpc", ChangeSetName="cs"
+        )
+        assert self.status() == "CREATE_IN_PROGRESS"
+
+    def test_template_url__reads_template_uploaded_to_s3(self):
+        self.call(
+            "s3",
+            "create_bucket",
+            Bucket="templates",
+            CreateBucketConfiguration={"LocationConstraint": REGION},
+        )
+        self.call(
+            "s3", "put_object", Bucket="templates", Key="a/vpc.yaml", Body=TEMPLATE
+        )
+        self.call(
+            "cloudformation",
+            "create_stack",
+            StackName="vpc",
+            TemplateURL="https://templates.s3.eu-west-1.amazonaws.com/a/vpc.yaml",
+        )
+        template = self.call("cloudformation", "get_template", StackName="vpc")
+        assert template["TemplateBody"] == TEMPLATE
+
+    def test_head_bucket__unknown_bucket__raises_not_found(self):
+        with pytest.raises(ClientError) as error:
+            self.call("s3", "head_bucket", Bucket="missing")
+        assert error.value.response["Error"]["Message"] == "Not Found"
+
+    def test_ssm__get_parameters_reports_invalid_parameters(self):
+        self.call("ssm", "put_parameter", Name="/a/b", Value="1", Type="String")
+        response = self.call("ssm", "get_parameters", Names=["/a/b", "/a/c"])
+        assert [parameter["Value"] for parameter in response["Parameters"]] == ["1"]
+        assert response["InvalidParameters"] == ["/a/c"]
+
+    def test_seeded_stack__has_outputs_and_exports(self):
+        backend = OfflineBackend(
+            OfflineBackendConfig(
+                stacks=[
+                    {
+                        "StackName": "shared",
+                        "Region": REGION,
+                        "Outputs": {"VpcId": "vpc-1"},
+                        "Exports": {"shared-VpcId": "vpc-1"},
+                    }
+                ]
+            )
+        )
+        stack = backend.call(
+            "cloudformation", "describe_stacks", REGION, {"StackName": "shared"}
+        )["Stacks"][0]
+        assert stack["StackStatus"] == "CREATE_COMPLETE"
+        assert stack["Outputs"] == [
+            {"OutputKey": "VpcId", "OutputValue": "vpc-1", "ExportName": "shared-VpcId"}
+        ]
+
+    def test_call__adds_latency(self):
+        self.config.latency = 0.5
+        self.config.command_latency = {"sts.get_caller_identity": 2}
+        self.call("s3", "list_buckets")
+        self.call("sts", "get_caller_identity")
+        assert [call.args[0] for call in self.backend.sleep.call_args_list] == [0.5, 2]
+
+    def test_call__throttled__raises_throttling_error(self):
+        self.config.throttle_rate = 1
+        with pytest.raises(ClientError) as error:
+            self.call("sts", "get_caller_identity")
+        assert error.value.response["Error"]["Code"] == "Throttling"
+
+    def test_call__unsupported_command__raises_not_implemented(self):
+        with pytest.raises(NotImplementedError):
+            self.call("cloudformation", "create_stack_set")
+
+    def test_config__from_file(self, tmp_path):
+        path = tmp_path / "offline.yaml"
+        path.write_text("latency: 0.1\noperation_durations:\n  create: 5\n")
+        config = OfflineBackendConfig.from_file(str(path))
+        assert config.latency == 0.1
+        assert config.operation_durations["create"] == 5
+        assert config.operation_durations["delete"] == 0
+
+
+class TestOfflineConnectionManager:
+    def teardown_method(self, test_method):
+        use_aws_backend()
+
+    def test_use_offline_backend__connection_managers_call_backend(self):
+        backend = use_offline_backend()
+        connection_manager = ConnectionManager(REGION, "profile", "stack")
+
+        response = connection_manager.call("sts", "get_caller_identity")
+
+        assert response["Account"] == backend.config.account_id
+        assert isinstance(connection_manager.get_session(), OfflineSession)
+
+    def test_use_offline_backend__sceptre_role__is_assumed(self):
+        use_offline_backend()
+        connection_manager = ConnectionManager(
+            REGION, None, "stack", "arn:aws:iam::123456789012:role/deploy"
+        )
+        envs = connection_manager.create_session_environment_variables(
+            include_system_envs=False
+        )
+        assert envs["AWS_ACCESS_KEY_ID"] == "ASIAOFFLINE"
+        assert envs["AWS_DEFAULT_REGION"] == REGION
+
+    @patch("sceptre.connection_manager.time.sleep")
+    def test_throttling__is_retried_by_connection_manager(self, mock_sleep):
+        use_offline_backend(OfflineBackendConfig(throttle_rate=1))
+        connection_manager = ConnectionManager(REGION, None, "stack")
+        with pytest.raises(RetryLimitExceededError):
+            connection_manager.call("s3", "list_buckets")
+        assert mock_sleep.call_count == 29
+
+    def test_use_aws_backend__restores_boto3_sessions(self):
+        use_offline_backend()
+        use_aws_backend()
+        connection_manager = ConnectionManager(REGION, None, "stack")
+        assert connection_manager._session_class.__module__.startswith("boto3")
+
+    def test_stack_actions__launch_against_offline_backend(self):
+        from sceptre.plan.actions import StackActions
+        from sceptre.stack import Stack
+        from sceptre.stack_status import StackStatus
+
+        use_offline_backend()
+        stack = Stack(
+            name="dev/vpc",
+            project_code="prj",
+            template_handler_config={"type": "file", "path": "vpc.yaml"},
+            region=REGION,
+        )
+        stack._template = Mock()
+        stack._template.get_boto_call_parameter.return_value = {
+            "TemplateBody": TEMPLATE
+        }
+        actions = StackActions(stack)
+
+        with patch("sceptre.plan.actions.time.sleep"):
+            assert actions.launch() == StackStatus.COMPLETE
+
+        assert actions.get_status() == "CREATE_COMPLETE"
+        outputs = actions.describe_outputs()["dev/vpc"]
+        assert sorted(output["OutputKey"] for output in outputs) == [
+            "Arn",
+            "Cidr",
+            "VpcId",
+        ]
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+import threading
+
+import pytest
+
+from sceptre.outputs_cache import StackOutputsCache, account_key
+
+
+class TestAccountKey(object):
+    def test_account_key__role__returns_account_id(self):
+        role = "arn:aws:iam::123456789012:role/deploy"
+        assert account_key("profile", role) == "123456789012"
+
+    def test_account_key__no_role__returns_profile(self):
+        assert account_key("profile", None) == "profile"
+
+    def test_account_key__nothing__returns_none(self):
+        assert account_key(None, None) is None
+
+
+class TestStackOutputsCache(object):
+    def setup_method(self, test_method):
+        self.cache = StackOutputsCache()
+        self.outputs = [{"OutputKey": "Key", "OutputValue": "Value"}]
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+        return self.outputs
+
+    def test_get__loads_once(self):
+        first = self.cache.get("account", "region", "stack", self.load)
+        second = self.cache.get("account", "region", "stack", self.load)
+
+        assert first == second == self.outputs
+        assert self.loads == 1
+
+    def test_get__different_accounts__loads_each(self):
+        self.cache.get("account", "region", "stack", self.load)
+        self.cache.get("other", "region", "stack", self.load)
+
+        assert self.loads == 2
+
+    def test_get__load_fails__error_is_not_cached(self):
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            self.cache.get("account", "region", "stack", fail)
+
+        assert self.cache.get("account", "region", "stack", self.load) == self.outputs
+
+    def test_get__concurrent_callers__share_one_load(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_load():
+            started.set()
+            release.wait(5)
+            return self.load()
+
+        results = []
+
+        def get():
+            results.append(self.cache.get("account", "region", "stack", slow_load))
+
+        threads = [threading.Thread(target=get) for _ in range(5)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert self.loads == 1
+        assert results == [self.outputs] * 5
+
+    def test_put__is_returned_by_get(self):
+        self.cache.put("account", "region", "stack", self.outputs)
+
+        assert self.cache.get("account", "region", "stack", self.load) == self.outputs
+        assert self.loads == 0
+
+    def test_invalidate__forgets_stack_in_every_account(self):
+        self.cache.get("account", "region", "stack", self.load)
+        self.cache.get("other", "region", "stack", self.load)
+        self.cache.get("account", "region", "unrelated", self.load)
+
+        self.cache.invalidate("stack")
+        self.cache.get("account", "region", "stack", self.load)
+        self.cache.get("other", "region", "stack", self.load)
+        self.cache.get("account", "region", "unrelated", self.load)
+
+        assert self.loads == 5
+
+    def test_invalidate__region__only_forgets_that_region(self):
+        self.cache.get("account", "region", "stack", self.load)
+        self.cache.get("account", "other", "stack", self.load)
+
+        self.cache.invalidate("stack", region="other")
+        self.cache.get("account", "region", "stack", self.load)
+        self.cache.get("account", "other", "stack", self.load)
+
+        assert self.loads == 3
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+import json
+
+import pytest
+
+from sceptre.exceptions import StackDoesNotExistError
+from sceptre.outputs_snapshot import (
+    OutputsSnapshot,
+    active_outputs_snapshot,
+    use_outputs_snapshot,
+)
+
+
+def make_stack(name, outputs=None, **fields):
+    stack = {"StackName": name, "StackStatus": "CREATE_COMPLETE", **fields}
+    if outputs is not None:
+        stack["Outputs"] = [
+            {"OutputKey": key, "OutputValue": value, "ExportName": f"{name}-{key}"}
+            for key, value in outputs.items()
+        ]
+    return stack
+
+
+class TestOutputsSnapshot(object):
+    def setup_method(self, test_method):
+        self.snapshot = OutputsSnapshot.from_catalogs(
+            [
+                (
+                    "dev",
+                    "eu-west-1",
+                    [
+                        make_stack("prj-vpc", {"VpcId": "vpc-1"}, Description="x"),
+                        make_stack("prj-empty"),
+                    ],
+                ),
+                ("prod", "eu-west-1", [make_stack("prj-vpc", {"VpcId": "vpc-2"})]),
+                ("prod", "us-east-1", [make_stack("prj-dns", {"ZoneId": "z-1"})]),
+            ]
+        )
+
+    def test_from_catalogs__keeps_snapshot_fields_only(self):
+        stack = self.snapshot.find("dev", "eu-west-1", "prj-vpc")
+
+        assert stack["Account"] == "dev"
+        assert stack["Region"] == "eu-west-1"
+        assert "Description" not in stack
+
+    def test_write__round_trips(self, tmp_path):
+        path = str(tmp_path / "outputs.json")
+
+        self.snapshot.write(path)
+        snapshot = OutputsSnapshot.from_file(path)
+
+        assert len(snapshot) == 4
+        assert (
+            snapshot.outputs("prod", "eu-west-1", "prj-vpc")[0]["OutputValue"]
+            == "vpc-2"
+        )
+
+    def test_from_file__other_version__raises(self, tmp_path):
+        path = tmp_path / "outputs.json"
+        path.write_text(json.dumps({"Version": 99, "Stacks": []}))
+
+        with pytest.raises(ValueError):
+            OutputsSnapshot.from_file(str(path))
+
+    def test_find__other_account__matches_unique_stack_in_region(self):
+        assert self.snapshot.find("ci", "us-east-1", "prj-dns") is not None
+        assert self.snapshot.find("ci", "eu-west-1", "prj-vpc") is None
+
+    def test_outputs__stack_without_outputs__returns_empty_list(self):
+        assert self.snapshot.outputs("dev", "eu-west-1", "prj-empty") == []
+
+    def test_outputs__missing_stack__raises(self):
+        with pytest.raises(StackDoesNotExistError):
+            self.snapshot.outputs("dev", "eu-west-1", "prj-missing")
+
+    def test_stacks__prefers_the_account(self):
+        names = [s["StackName"] for s in self.snapshot.stacks("dev", "eu-west-1")]
+        other = self.snapshot.stacks("ci", "us-east-1")
+
+        assert names == ["prj-vpc", "prj-empty"]
+        assert [s["StackName"] for s in other] == ["prj-dns"]
+
+    def test_stacks__other_account__region_with_several_accounts__returns_none(self):
+        assert self.snapshot.stacks("ci", "eu-west-1") == []
+        assert self.snapshot.stacks("ci", "ap-south-1") == []
+
+    def test_use_outputs_snapshot(self):
+        use_outputs_snapshot(self.snapshot)
+        try:
+            assert active_outputs_snapshot() is self.snapshot
+        finally:
+            use_outputs_snapshot(None)
+        assert active_outputs_snapshot() is None
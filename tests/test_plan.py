@@ -5,6 +5,7 @@ from sceptre.context import SceptreContext
 from sceptre.stack import Stack
 from sceptre.config.reader import ConfigReader
 from sceptre.plan.plan import SceptrePlan
+from sceptre.resolvers.cache import active_plan_caches, plan_local
 
 
 class TestSceptrePlan(object):
@@ -61,3 +62,38 @@ class TestSceptrePlan(object):
             plan = MagicMock(spec=SceptrePlan)
             plan.context = self.mock_context
             plan.invalid_command()
+
+    @patch("sceptre.plan.plan.ConfigReader")
+    def test_init__does_not_clear_the_caches_of_other_plans(self, mock_ConfigReader):
+        mock_ConfigReader.return_value.construct_stacks.return_value = (set(), set())
+        first = SceptrePlan(self.mock_context)
+        with first.caches.activate():
+            plan_local("name", lambda: sentinel.value)
+
+        SceptrePlan(self.mock_context)
+
+        with first.caches.activate():
+            assert plan_local("name", object) is sentinel.value
+
+    @patch("sceptre.plan.plan.SceptrePlanExecutor")
+    @patch("sceptre.plan.plan.ConfigReader")
+    def test_stacks_are_loaded_and_executed_with_the_plans_caches(
+        self, mock_ConfigReader, mock_SceptrePlanExecutor
+    ):
+        active = []
+
+        def construct_stacks():
+            active.append(active_plan_caches())
+            return set(), set()
+
+        def execute(*args):
+            active.append(active_plan_caches())
+
+        mock_ConfigReader.return_value.construct_stacks.side_effect = construct_stacks
+        mock_SceptrePlanExecutor.return_value.execute.side_effect = execute
+        plan = SceptrePlan(self.mock_context)
+        plan.launch_order = []
+        plan._execute()
+
+        assert active == [plan.caches, plan.caches]
+        assert active_plan_caches() is not plan.caches
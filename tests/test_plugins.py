@@ -0,0 +1,109 @@
+import json
+from unittest.mock import patch
+
+from sceptre.hooks.cmd import Cmd
+from sceptre.plugins import (
+    HOOKS,
+    RESOLVERS,
+    TEMPLATE_HANDLERS,
+    PluginRegistry,
+    _distributions_fingerprint,
+)
+from sceptre.template_handlers.file import File
+
+
+class TestPluginRegistry:
+    def setup_method(self, test_method):
+        self.registry = PluginRegistry()
+
+    def test_entry_points__returns_installed_plugins(self):
+        assert self.registry.entry_points(TEMPLATE_HANDLERS)["file"] == (
+            "sceptre.template_handlers.file:File"
+        )
+        assert "cmd" in self.registry.entry_points(HOOKS)
+        assert "stack_output" in self.registry.entry_points(RESOLVERS)
+
+    def test_entry_points__unknown_group__returns_empty_dict(self):
+        assert self.registry.entry_points("not.a.group") == {}
+
+    def test_load__returns_plugin_class(self):
+        assert self.registry.load(TEMPLATE_HANDLERS, "file") is File
+        assert self.registry.load(HOOKS, "cmd") is Cmd
+
+    def test_load__unknown_name__returns_none(self):
+        assert self.registry.load(TEMPLATE_HANDLERS, "not_a_handler") is None
+
+    @patch("sceptre.plugins.metadata.entry_points")
+    def test_discovery__scans_distributions_once(self, mock_entry_points):
+        mock_entry_points.return_value = {}
+        for group in (TEMPLATE_HANDLERS, RESOLVERS, HOOKS):
+            self.registry.entry_points(group)
+            self.registry.load(group, "anything")
+
+        mock_entry_points.assert_called_once_with()
+
+    def test_load_group__loads_every_plugin(self):
+        handlers = self.registry.load_group(TEMPLATE_HANDLERS)
+        assert handlers["file"] is File
+        assert set(handlers) == set(self.registry.entry_points(TEMPLATE_HANDLERS))
+
+    def test_reset__rediscovers_entry_points(self):
+        self.registry.entry_points(HOOKS)
+        with patch("sceptre.plugins.metadata.entry_points") as mock_entry_points:
+            mock_entry_points.return_value = {}
+            self.registry.reset()
+            assert self.registry.entry_points(HOOKS) == {}
+
+
+class TestPluginRegistrySnapshot:
+    def setup_method(self, test_method):
+        self.entry_points = {
+            TEMPLATE_HANDLERS: {"file": "sceptre.template_handlers.file:File"},
+            RESOLVERS: {},
+            HOOKS: {},
+        }
+
+    def test_discovery__writes_snapshot(self, tmp_path):
+        snapshot_path = tmp_path / "cache" / "plugins.json"
+        registry = PluginRegistry(snapshot_path=str(snapshot_path))
+
+        registry.entry_points(HOOKS)
+
+        snapshot = json.loads(snapshot_path.read_text())
+        assert snapshot["fingerprint"] == _distributions_fingerprint()
+        assert snapshot["entry_points"][HOOKS] == registry.entry_points(HOOKS)
+
+    @patch("sceptre.plugins.metadata.entry_points")
+    def test_discovery__fresh_snapshot__skips_scan(self, mock_entry_points, tmp_path):
+        snapshot_path = tmp_path / "plugins.json"
+        snapshot_path.write_text(
+            json.dumps(
+                {
+                    "fingerprint": _distributions_fingerprint(),
+                    "entry_points": self.entry_points,
+                }
+            )
+        )
+        registry = PluginRegistry(snapshot_path=str(snapshot_path))
+
+        assert registry.load(TEMPLATE_HANDLERS, "file") is File
+        mock_entry_points.assert_not_called()
+
+    @patch("sceptre.plugins.metadata.entry_points")
+    def test_discovery__stale_snapshot__rescans(self, mock_entry_points, tmp_path):
+        mock_entry_points.return_value = {}
+        snapshot_path = tmp_path / "plugins.json"
+        snapshot_path.write_text(
+            json.dumps({"fingerprint": "stale", "entry_points": self.entry_points})
+        )
+        registry = PluginRegistry(snapshot_path=str(snapshot_path))
+
+        assert registry.load(TEMPLATE_HANDLERS, "file") is None
+        mock_entry_points.assert_called_once_with()
+
+    def test_discovery__unwritable_snapshot__still_discovers(self, tmp_path):
+        snapshot_path = tmp_path / "file"
+        snapshot_path.write_text("")
+        registry = PluginRegistry(snapshot_path=str(snapshot_path / "plugins.json"))
+
+        assert registry.load(TEMPLATE_HANDLERS, "file") is File
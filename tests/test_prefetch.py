@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+
+from sceptre.exports_catalog import export_catalogs
+from sceptre.outputs_cache import stack_outputs_cache
+from sceptre.plan.executor import SceptrePlanExecutor
+from sceptre.plan.prefetch import prefetch_described_outputs, prefetch_stack_outputs
+from sceptre.resolvers import ResolvableContainerProperty
+from sceptre.resolvers.stack_output import StackOutput
+
+
+class FakeStack(object):
+    parameters = ResolvableContainerProperty("parameters")
+
+    def __init__(self, name, parameters):
+        self.name = name
+        self.dependencies = []
+        self.connection_manager = MagicMock()
+        self.connection_manager.resolve_session_args.side_effect = (
+            lambda profile, region, sceptre_role, stack_name: (
+                profile,
+                region,
+                sceptre_role,
+            )
+        )
+        self.parameters = parameters
+
+
+def dependency(name):
+    stack = MagicMock()
+    stack.name = name
+    stack.project_code = "prj"
+    stack.profile = None
+    stack.region = "eu-west-1"
+    stack.sceptre_role = None
+    return stack
+
+
+def describe_stacks_response(*names):
+    return {
+        "Stacks": [
+            {
+                "StackName": "prj-" + name,
+                "Outputs": [{"OutputKey": "Key", "OutputValue": name}],
+            }
+            for name in names
+        ]
+    }
+
+
+class TestPrefetchStackOutputs(object):
+    def setup_method(self, test_method):
+        stack_outputs_cache.clear()
+        export_catalogs.clear()
+        self.dependencies = [dependency("vpc"), dependency("db")]
+        self.stack = FakeStack(
+            "app",
+            {
+                "VpcId": StackOutput("vpc::Key"),
+                "Nested": [{"DbName": StackOutput("db::Key")}],
+                "Plain": "value",
+            },
+        )
+        self.stack.dependencies = self.dependencies
+        self.call = self.stack.connection_manager.call
+
+    def test_prefetch__describes_each_referenced_stack(self):
+        self.call.side_effect = lambda **kwargs: describe_stacks_response(
+            kwargs["kwargs"]["StackName"][len("prj-") :]
+        )
+
+        prefetch_stack_outputs([self.stack])
+
+        assert sorted(
+            call.kwargs["kwargs"]["StackName"] for call in self.call.call_args_list
+        ) == ["prj-db", "prj-vpc"]
+        assert self.stack.parameters == {
+            "VpcId": "vpc",
+            "Nested": [{"DbName": "db"}],
+            "Plain": "value",
+        }
+        assert self.call.call_count == 2
+
+    def test_prefetch__outputs_already_cached__does_not_describe_them(self):
+        stack_outputs_cache.put(None, "eu-west-1", "prj-vpc", [])
+        stack_outputs_cache.put(None, "eu-west-1", "prj-db", [])
+
+        prefetch_stack_outputs([self.stack])
+
+        self.call.assert_not_called()
+
+    def test_prefetch__many_stacks_in_region__pages_through_all_stacks(self):
+        self.call.side_effect = [
+            dict(describe_stacks_response("vpc", "unrelated"), NextToken="token"),
+            describe_stacks_response("db"),
+        ]
+
+        prefetch_stack_outputs([self.stack], sweep_threshold=2)
+
+        assert [call.kwargs["kwargs"] for call in self.call.call_args_list] == [
+            {},
+            {"NextToken": "token"},
+        ]
+        assert stack_outputs_cache.contains(None, "eu-west-1", "prj-vpc")
+        assert stack_outputs_cache.contains(None, "eu-west-1", "prj-db")
+        # the sweep builds the region's export catalog, which lists every stack
+        assert stack_outputs_cache.contains(None, "eu-west-1", "prj-unrelated")
+        assert export_catalogs.contains(None, "eu-west-1")
+
+    def test_prefetch__describe_fails__error_is_left_for_the_resolver(self):
+        self.call.side_effect = ClientError(
+            {"Error": {"Code": "ValidationError", "Message": "does not exist"}},
+            "DescribeStacks",
+        )
+
+        prefetch_stack_outputs([self.stack])
+
+        assert not stack_outputs_cache.contains(None, "eu-west-1", "prj-vpc")
+
+    def test_prefetch__resolved_stack__does_not_describe_anything(self):
+        self.call.side_effect = lambda **kwargs: describe_stacks_response(
+            kwargs["kwargs"]["StackName"][len("prj-") :]
+        )
+        self.stack.parameters
+        stack_outputs_cache.clear()
+        self.call.reset_mock()
+
+        prefetch_stack_outputs([self.stack])
+
+        self.call.assert_not_called()
+
+
+class TestPrefetchDescribedOutputs(object):
+    def setup_method(self, test_method):
+        stack_outputs_cache.clear()
+        export_catalogs.clear()
+        self.stacks = [dependency("vpc"), dependency("db")]
+        self.call = self.stacks[0].connection_manager.call
+        self.call.return_value = describe_stacks_response("vpc", "db")
+
+    def test_prefetch__many_stacks_in_region__pages_through_all_stacks(self):
+        prefetch_described_outputs(self.stacks, sweep_threshold=2)
+
+        self.call.assert_called_once_with(
+            service="cloudformation", command="describe_stacks", kwargs={}
+        )
+        assert stack_outputs_cache.contains(None, "eu-west-1", "prj-vpc")
+        assert stack_outputs_cache.contains(None, "eu-west-1", "prj-db")
+
+    def test_prefetch__few_stacks_in_region__does_not_describe_anything(self):
+        prefetch_described_outputs(self.stacks, sweep_threshold=3)
+
+        self.call.assert_not_called()
+
+
+class TestSceptrePlanExecutorPrefetch(object):
+    @patch("sceptre.plan.executor.StackActions")
+    @patch("sceptre.plan.executor.prefetch_stack_outputs")
+    def test_execute__resolving_command__prefetches_each_batch(
+        self, mock_prefetch, mock_actions
+    ):
+        first, second = {MagicMock()}, {MagicMock()}
+
+        SceptrePlanExecutor("launch", [first, second]).execute()
+
+        assert [call.args[0] for call in mock_prefetch.call_args_list] == [
+            first,
+            second,
+        ]
+
+    @patch("sceptre.plan.executor.StackActions")
+    @patch("sceptre.plan.executor.prefetch_stack_outputs")
+    def test_execute__other_command__does_not_prefetch(
+        self, mock_prefetch, mock_actions
+    ):
+        SceptrePlanExecutor("describe", [{MagicMock()}]).execute()
+
+        mock_prefetch.assert_not_called()
+
+    @patch("sceptre.plan.executor.StackActions")
+    @patch("sceptre.plan.executor.prefetch_described_outputs")
+    def test_execute__describe_outputs__prefetches_every_stack_once(
+        self, mock_prefetch, mock_actions
+    ):
+        first, second = MagicMock(), MagicMock()
+
+        SceptrePlanExecutor("describe_outputs", [{first}, {second}]).execute()
+
+        mock_prefetch.assert_called_once_with([first, second])
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from sceptre.resolvers import bash_resolver as module
+from sceptre.resolvers.bash_resolver import bash_resolver
+from sceptre.resolvers.cache import ResolverCache, clear_plan_caches
+
+
+class TestBashResolver(object):
+    @pytest.fixture(autouse=True)
+    def environment(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("SCEPTRE_ROOT", str(tmp_path))
+        monkeypatch.delenv(module.TIMEOUT_ENV, raising=False)
+        monkeypatch.setattr(module, "_semaphore", None)
+        module.RESULTS.clear()
+        self.root = tmp_path
+        yield
+        module.RESULTS.clear()
+        ResolverCache.refresh = False
+
+    def resolve(self, argument):
+        return bash_resolver(argument).resolve()
+
+    def test_resolve__returns_stripped_output(self):
+        assert self.resolve("echo '  hello  '") == "hello"
+
+    def test_resolve__runs_in_the_sceptre_root(self):
+        assert self.resolve("pwd") == str(self.root)
+
+    def test_resolve__identical_commands__run_once(self):
+        first = self.resolve("date +%s%N")
+        second = self.resolve("date +%s%N")
+
+        assert first == second
+        assert module.RESULTS.stats()["hits"] == 1
+
+    def test_resolve__relevant_environment_changes__runs_again(self, monkeypatch):
+        monkeypatch.setenv("AWS_PROFILE", "dev")
+        first = self.resolve("date +%s%N")
+        monkeypatch.setenv("AWS_PROFILE", "prod")
+        second = self.resolve("date +%s%N")
+        monkeypatch.setenv("UNRELATED", "value")
+        third = self.resolve("date +%s%N")
+
+        assert first != second
+        assert second == third
+
+    def test_resolve__mentioned_variable_changes__runs_again(self, monkeypatch):
+        monkeypatch.setenv("NAME", "a")
+        first = self.resolve("echo $NAME")
+        monkeypatch.setenv("NAME", "b")
+
+        assert (first, self.resolve("echo ${NAME}")) == ("a", "b")
+
+    def test_resolve__cache_false__runs_every_time(self):
+        argument = {"command": "date +%s%N", "cache": False}
+
+        assert self.resolve(argument) != self.resolve(argument)
+
+    def test_resolve__new_plan__runs_again(self):
+        first = self.resolve("date +%s%N")
+        clear_plan_caches()
+
+        assert self.resolve("date +%s%N") != first
+
+    def test_resolve__failure__is_not_remembered(self):
+        marker = self.root / "marker"
+        command = f"test -e {marker} && echo ok"
+
+        with pytest.raises(Exception):
+            self.resolve(command)
+        marker.touch()
+
+        assert self.resolve(command) == "ok"
+
+    def test_resolve__timeout__raises(self):
+        with pytest.raises(RuntimeError, match="timed out after 0.1s"):
+            self.resolve({"command": "sleep 5", "timeout": 0.1})
+
+    def test_resolve__timeout_from_environment(self, monkeypatch):
+        monkeypatch.setenv(module.TIMEOUT_ENV, "0.1")
+
+        with pytest.raises(RuntimeError):
+            self.resolve("sleep 5")
+
+    def test_execute__bounded_by_concurrency_limit(self, monkeypatch):
+        monkeypatch.setenv(module.CONCURRENCY_ENV, "2")
+        running, most = [], []
+        lock = threading.Lock()
+
+        def fake_run(*args, **kwargs):
+            with lock:
+                running.append(1)
+                most.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.pop()
+            return module.subprocess.CompletedProcess(args, 0, stdout=b"out")
+
+        with patch.object(module.subprocess, "run", side_effect=fake_run):
+            threads = [
+                threading.Thread(target=module.execute, args=(f"cmd {i}", "."))
+                for i in range(6)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(5)
+
+        assert max(most) == 2
+        assert module.stats()["runs"] >= 6
+
+
+class TestBashResolverDiskCache(object):
+    @pytest.fixture(autouse=True)
+    def disk_cache(self, monkeypatch, tmp_path):
+        monkeypatch.setenv(module.CACHE_TTL_ENV, "60")
+        monkeypatch.setenv(module.CACHE_DIR_ENV, str(tmp_path))
+        monkeypatch.setattr(module, "RESULTS", module._results_cache())
+        self.directory = tmp_path
+        yield
+        ResolverCache.refresh = False
+
+    def run_in_new_process(self):
+        # a new process starts with nothing in memory
+        module.RESULTS.clear()
+        return module.run("date +%s%N", ".")
+
+    def test_results_are_reused_within_the_ttl(self):
+        assert self.run_in_new_process() == self.run_in_new_process()
+        assert module.RESULTS.stats()["disk_hits"] == 1
+
+    def test_expired_results_are_run_again(self):
+        first = self.run_in_new_process()
+        module.RESULTS.ttl = 0.01
+        time.sleep(0.02)
+
+        assert self.run_in_new_process() != first
+
+    def test_refresh__ignores_results_on_disk(self):
+        first = self.run_in_new_process()
+        ResolverCache.refresh = True
+
+        assert self.run_in_new_process() != first
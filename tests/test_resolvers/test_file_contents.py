@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 import tempfile
+from unittest.mock import patch
 import pytest
 
 from sceptre.resolvers.file_contents import FileContents
@@ -28,3 +29,15 @@ class TestFileContentsResolver(object):
         with pytest.raises(TypeError):
             self.file_contents_resolver.argument = None
             self.file_contents_resolver.resolve()
+
+    def test_resolving_twice__reads_the_file_once(self, tmp_path):
+        path = tmp_path / "user-data.sh"
+        path.write_text("#!/bin/bash\n")
+        self.file_contents_resolver.argument = str(path)
+
+        with patch("builtins.open", wraps=open) as mock_open:
+            first = self.file_contents_resolver.resolve()
+            second = FileContents(argument=str(path)).resolve()
+
+        assert first == second == "#!/bin/bash\n"
+        assert mock_open.call_count == 1
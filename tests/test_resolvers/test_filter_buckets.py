@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+pytest.importorskip("devops")
+
+from sceptre.resolvers import filter_buckets as module  # noqa: E402
+from sceptre.resolvers.cache import CacheScope, ResolverCache  # noqa: E402
+from sceptre.resolvers.filter_buckets import AllBuckets, FilterBuckets  # noqa: E402
+
+
+class FakeS3(object):
+    def __init__(self, tags, errors=None):
+        self.tags = tags
+        self.errors = errors or {}
+        self.calls = []
+
+    def call(self, service, command, kwargs=None):
+        self.calls.append(command)
+        if command == "list_buckets":
+            return {"Buckets": [{"Name": name} for name in self.tags]}
+        bucket = kwargs["Bucket"]
+        if bucket in self.errors:
+            raise ClientError(
+                {"Error": {"Code": self.errors[bucket]}}, "GetBucketTagging"
+            )
+        return {
+            "TagSet": [
+                {"Key": key, "Value": value} for key, value in self.tags[bucket].items()
+            ]
+        }
+
+
+class TestFilterBuckets(object):
+    @pytest.fixture(autouse=True)
+    def environment(self, monkeypatch):
+        self.s3 = FakeS3(
+            {
+                "logs": {"DevReadOnly": "true"},
+                "data": {"DevReadOnly": "false", "Team": "data"},
+                "private": {},
+            }
+        )
+        monkeypatch.setattr(
+            module, "LISTINGS", ResolverCache(CacheScope.process, ttl=300)
+        )
+        monkeypatch.setattr(
+            module,
+            "DEFAULT_CREDENTIALS_LISTINGS",
+            ResolverCache(CacheScope.process, ttl=300),
+        )
+        monkeypatch.setattr(
+            FilterBuckets,
+            "env_account",
+            lambda resolver, env_name: (("profile", env_name), self.s3),
+        )
+
+    def resolve(self, argument):
+        return FilterBuckets(argument).resolve()
+
+    def test_resolve__filters_by_tag(self):
+        assert sorted(self.resolve("env=legacy, tag=DevReadOnly")) == [
+            "data",
+            "logs",
+        ]
+
+    def test_resolve__filters_by_tag_value(self):
+        assert self.resolve("env=legacy, tag=DevReadOnly, value=true") == ["logs"]
+
+    def test_resolve__nothing_matches__raises(self):
+        with pytest.raises(RuntimeError):
+            self.resolve("env=legacy, tag=Missing")
+
+    def test_resolve__listings_are_shared_between_resolvers(self):
+        self.resolve("env=legacy, tag=DevReadOnly")
+        self.resolve("env=legacy, tag=Team")
+
+        assert self.s3.calls.count("list_buckets") == 1
+        assert self.s3.calls.count("get_bucket_tagging") == 3
+
+    def test_resolve__listings_expire_after_the_ttl(self, monkeypatch):
+        monkeypatch.setattr(
+            module, "LISTINGS", ResolverCache(CacheScope.process, ttl=0.05)
+        )
+        self.resolve("env=legacy, tag=Team")
+        time.sleep(0.1)
+        self.resolve("env=legacy, tag=Team")
+
+        assert self.s3.calls.count("list_buckets") == 2
+
+    def test_resolve__untagged_and_denied_buckets__are_treated_as_untagged(self):
+        self.s3.errors = {"private": "NoSuchTagSet", "data": "AccessDenied"}
+
+        with patch.object(module, "LOGGER") as logger:
+            assert self.resolve("env=legacy, tag=DevReadOnly") == ["logs"]
+
+        [(message,), _] = logger.error.call_args
+        assert "data" in message and "AccessDenied" in message
+
+    def test_resolve__default_credentials__are_not_kept_on_disk(
+        self, monkeypatch, tmp_path
+    ):
+        monkeypatch.setattr(
+            module,
+            "LISTINGS",
+            ResolverCache(CacheScope.disk, ttl=300, directory=str(tmp_path)),
+        )
+        monkeypatch.setattr(
+            FilterBuckets,
+            "env_account",
+            lambda resolver, env_name: (None, self.s3),
+        )
+        self.resolve("env=legacy, tag=Team")
+        self.resolve("env=legacy, tag=Team")
+
+        assert list(tmp_path.iterdir()) == []
+        assert self.s3.calls.count("list_buckets") == 1
+
+    def test_resolve__named_credentials__are_kept_on_disk(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(
+            module,
+            "LISTINGS",
+            ResolverCache(
+                CacheScope.disk, ttl=300, directory=str(tmp_path), name="buckets"
+            ),
+        )
+        monkeypatch.setattr(
+            FilterBuckets,
+            "env_account",
+            lambda resolver, env_name: ("profile", self.s3),
+        )
+        self.resolve("env=legacy, tag=Team")
+
+        assert len(list((tmp_path / "buckets").iterdir())) == 2
+
+    def test_resolve__other_errors__propagate(self):
+        self.s3.call = MagicMock(side_effect=ValueError("boom"))
+
+        with pytest.raises(ValueError):
+            self.resolve("env=legacy, tag=DevReadOnly")
+
+    def test_resolve__without_env__uses_devops_bucket_tags(self):
+        with patch.object(module, "api") as api:
+            api.bucket_tags.return_value = ["logs"]
+            assert self.resolve("tag=DevReadOnly") == ["logs"]
+
+        api.bucket_tags.assert_called_once_with(tag="DevReadOnly")
+        assert self.s3.calls == []
+
+    def test_all_buckets__lists_the_stack_accounts_buckets(self, monkeypatch):
+        monkeypatch.setattr(
+            AllBuckets, "account", lambda resolver: (("profile", None), self.s3)
+        )
+
+        assert AllBuckets().resolve() == ["logs", "data", "private"]
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+
+from sceptre.resolvers import highlighting
+from sceptre.resolvers.highlighting import highlighter
+
+
+def test_highlighter__colours_the_text():
+    highlighted = highlighter("{'key': 1}")
+
+    assert "\x1b[" in highlighted
+    assert "key" in highlighted
+
+
+def test_highlighter__builds_each_lexer_and_style_once():
+    highlighting._pygments_highlighter.cache_clear()
+
+    highlighter("a = 1")
+    highlighter("b = 2")
+    highlighter('{"a": 1}', lexer_name="json", style="algol")
+
+    assert highlighting._pygments_highlighter.cache_info().misses == 2
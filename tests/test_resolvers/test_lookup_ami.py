@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from botocore.exceptions import ClientError
+
+pytest.importorskip("devops")
+
+from sceptre.resolvers import lookup_ami as module  # noqa: E402
+from sceptre.resolvers.cache import CacheScope, ResolverCache  # noqa: E402
+
+MANAGEMENT, LEGACY = module.AWS_PROFILE
+
+
+class FakeEC2(object):
+    def __init__(self, images, error=None, delay=0):
+        self.images = images
+        self.error = error
+        self.delay = delay
+        self.calls = 0
+        self.threads = set()
+
+    def describe_images(self, Filters):
+        self.calls += 1
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return {
+            "Images": [
+                dict(image, Name="unused", BlockDeviceMappings=[])
+                for image in self.images
+            ]
+        }
+
+
+class TestLookupAmi(object):
+    @pytest.fixture(autouse=True)
+    def environment(self, monkeypatch):
+        self.ec2 = {
+            MANAGEMENT: FakeEC2(
+                [
+                    {"ImageId": "ami-m1", "CreationDate": "2024-01-01T00:00:00Z"},
+                    {"ImageId": "ami-m2", "CreationDate": "2024-03-01T00:00:00Z"},
+                ]
+            ),
+            LEGACY: FakeEC2(
+                [{"ImageId": "ami-l1", "CreationDate": "2024-02-01T00:00:00Z"}]
+            ),
+        }
+        monkeypatch.setattr(
+            module.lookup_ami, "client", lambda resolver, profile: self.ec2[profile]
+        )
+        monkeypatch.setattr(module, "QUERIES", ResolverCache(CacheScope.process))
+        monkeypatch.setattr(module, "FAILED_MANAGEMENT_QUERIES", set())
+        yield
+        ResolverCache.refresh = False
+
+    def resolve(self, argument="Role=app,Name=app"):
+        resolver = module.lookup_ami(argument)
+        resolver.stack = SimpleNamespace(region="eu-west-1", name="stack")
+        return resolver.resolve()
+
+    def test_resolve__latest_image_of_both_accounts(self):
+        assert self.resolve() == "ami-m2"
+
+        self.ec2[LEGACY].images.append(
+            {"ImageId": "ami-l2", "CreationDate": "2024-04-01T00:00:00Z"}
+        )
+        module.QUERIES.clear()
+        assert self.resolve() == "ami-l2"
+
+    def test_resolve__accounts_are_queried_concurrently(self):
+        for ec2 in self.ec2.values():
+            ec2.delay = 0.3
+
+        started = time.monotonic()
+        self.resolve()
+
+        assert time.monotonic() - started < 0.5
+        assert self.ec2[MANAGEMENT].threads != self.ec2[LEGACY].threads
+
+    def test_resolve__management_denied__uses_legacy(self):
+        self.ec2[MANAGEMENT].error = ClientError(
+            {"Error": {"Code": "UnauthorizedOperation"}}, "DescribeImages"
+        )
+
+        assert self.resolve() == "ami-l1"
+
+    def test_resolve__management_denied__is_not_queried_again(self):
+        self.ec2[MANAGEMENT].error = ClientError(
+            {"Error": {"Code": "UnauthorizedOperation"}}, "DescribeImages"
+        )
+        self.resolve("Role=app,Name=app")
+        self.resolve("Role=other,Name=other")
+
+        assert self.ec2[MANAGEMENT].calls == 1
+        assert self.ec2[LEGACY].calls == 2
+
+    def test_resolve__no_images__raises(self):
+        for ec2 in self.ec2.values():
+            ec2.images = []
+
+        with pytest.raises(ValueError):
+            self.resolve()
+
+    def test_resolve__ami_env_var__skips_the_query(self, monkeypatch):
+        monkeypatch.setenv("MY_AMI", "ami-env")
+
+        assert self.resolve("AMIEnvVar=MY_AMI Role=app") == "ami-env"
+        assert self.ec2[MANAGEMENT].calls == 0
+
+    def test_resolve__concurrent_identical_lookups__query_once(self):
+        for ec2 in self.ec2.values():
+            ec2.delay = 0.1
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.resolve()))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        assert results == ["ami-m2"] * 5
+        assert self.ec2[MANAGEMENT].calls == 1
+        assert self.ec2[LEGACY].calls == 1
+
+    def test_resolve__filters_in_another_order__share_the_query(self):
+        self.resolve("Role=app,Name=app")
+        self.resolve("Name=app,Role=app")
+
+        assert self.ec2[MANAGEMENT].calls == 1
+
+    def test_resolve__failures_are_not_cached(self):
+        self.ec2[LEGACY].error = ClientError(
+            {"Error": {"Code": "Throttling"}}, "DescribeImages"
+        )
+        with pytest.raises(ClientError):
+            self.resolve()
+        self.ec2[LEGACY].error = None
+
+        assert self.resolve() == "ami-m2"
+        assert self.ec2[LEGACY].calls == 2
+
+    def test_resolve__disk_cache__is_reused_within_its_ttl(self, monkeypatch, tmp_path):
+        monkeypatch.setenv(module.CACHE_TTL_ENV, "3600")
+        monkeypatch.setenv(module.CACHE_DIR_ENV, str(tmp_path))
+        monkeypatch.setattr(module, "QUERIES", module._queries_cache())
+        self.resolve()
+
+        # a later run
+        monkeypatch.setattr(module, "QUERIES", module._queries_cache())
+        assert self.resolve() == "ami-m2"
+        assert self.ec2[MANAGEMENT].calls == 1
+
+        monkeypatch.setattr(module, "QUERIES", module._queries_cache())
+        ResolverCache.refresh = True
+        self.resolve()
+        assert self.ec2[MANAGEMENT].calls == 2
+
+    def test_resolve__disk_cache__expires_after_its_ttl(self, monkeypatch, tmp_path):
+        monkeypatch.setenv(module.CACHE_TTL_ENV, "0.1")
+        monkeypatch.setenv(module.CACHE_DIR_ENV, str(tmp_path))
+        monkeypatch.setattr(module, "QUERIES", module._queries_cache())
+        self.resolve()
+        time.sleep(0.2)
+
+        monkeypatch.setattr(module, "QUERIES", module._queries_cache())
+        self.resolve()
+
+        assert self.ec2[MANAGEMENT].calls == 2
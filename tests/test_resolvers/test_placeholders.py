@@ -1,5 +1,9 @@
+import threading
+from unittest.mock import MagicMock, patch
+
 import pytest
 
+from sceptre.plan.executor import SceptrePlanExecutor
 from sceptre.resolvers import are_placeholders_enabled, Resolver
 from sceptre.resolvers.placeholders import (
     use_resolver_placeholders_on_error,
@@ -35,6 +39,41 @@ class TestPlaceholders:
 
         assert are_placeholders_enabled() is False
 
+    def test_are_placeholders_enabled__nested_placeholder_contexts__restores_outer(
+        self,
+    ):
+        with use_resolver_placeholders_on_error():
+            with use_resolver_placeholders_on_error():
+                pass
+            assert are_placeholders_enabled() is True
+
+    def test_are_placeholders_enabled__other_thread__returns_false(self):
+        seen = []
+        with use_resolver_placeholders_on_error():
+            thread = threading.Thread(
+                target=lambda: seen.append(are_placeholders_enabled())
+            )
+            thread.start()
+            thread.join()
+
+        assert seen == [False]
+
+    @patch("sceptre.plan.executor.StackActions")
+    def test_are_placeholders_enabled__in_plan_executor__follows_the_caller(
+        self, mock_actions
+    ):
+        seen = []
+        mock_actions.return_value.dump_config.side_effect = lambda: seen.append(
+            are_placeholders_enabled()
+        )
+        executor = SceptrePlanExecutor("dump_config", [{MagicMock()}])
+
+        with use_resolver_placeholders_on_error():
+            executor.execute()
+        executor.execute()
+
+        assert seen == [True, False]
+
     @pytest.mark.parametrize(
         "placeholder_type,argument,expected",
         [
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import tempfile
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("devops")
+# the policy root is read when the module is imported
+os.environ.setdefault("SCEPTRE_ROOT", tempfile.gettempdir())
+
+from sceptre.resolvers import policy as module  # noqa: E402
+
+
+class TestPolicy(object):
+    @pytest.fixture(autouse=True)
+    def policy_root(self, tmp_path):
+        self.root = tmp_path
+        self.stack = SimpleNamespace(
+            stack_group_config={"env_name": "dev"}, **{"__sceptre_user_data": {}}
+        )
+        yield
+        module.get_jinja_env.cache_clear()
+
+    def write(self, name, content):
+        path = self.root / name
+        path.write_text(content)
+        return str(path)
+
+    def render(self, path, local_vars=None):
+        jinja_env = module.get_jinja_env(str(self.root))
+        return module.policy.r(path, self.stack, local_vars or {}, jinja_env)
+
+    def test_r__minifies_json(self):
+        path = self.write("plain.json", '{\n  "Version": "2012-10-17",\n}')
+
+        assert self.render(path) == json.dumps({"Version": "2012-10-17"})
+
+    def test_r__renders_templates_with_vars_and_stack_config(self):
+        path = self.write(
+            "bucket.json.j2", '{"Env": "{{ env_name }}", "Name": "{{ vars.name }}"}'
+        )
+
+        assert json.loads(self.render(path, {"name": "logs"})) == {
+            "Env": "dev",
+            "Name": "logs",
+        }
+
+    def test_r__included_template_changes__are_rendered(self):
+        path = self.write("outer.json.j2", '{"Statement": [{% include "inner.j2" %}]}')
+        inner = self.write("inner.j2", '{"Sid": "first"}')
+        first = self.render(path)
+        self.write("inner.j2", '{"Sid": "second"}')
+        stat = os.stat(inner)
+        # a change the same second, of the same size, is still picked up
+        os.utime(inner, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+
+        second = self.render(path)
+
+        assert json.loads(first)["Statement"] == [{"Sid": "first"}]
+        assert json.loads(second)["Statement"] == [{"Sid": "second"}]
+
+    def test_r__rendered_policy_is_logged_every_time(self):
+        path = self.write("plain.json", '{"Version": "2012-10-17"}')
+
+        with patch.object(module, "highlighter", side_effect=lambda x, **kw: x):
+            with patch.object(module, "log_lazily") as log_lazily:
+                self.render(path)
+                self.render(path)
+
+        rendered = [
+            call.args[1]()
+            for call in log_lazily.call_args_list
+            if "Version" in call.args[1]()
+        ]
+        assert len(rendered) == 2
+
+    def test_get_jinja_env__is_shared_and_caches_compiled_templates(self):
+        path = self.write("shared.json.j2", '{"Env": "{{ env_name }}"}')
+        jinja_env = module.get_jinja_env(str(self.root))
+
+        self.render(path)
+        template = jinja_env.get_template("shared.json.j2")
+        self.render(path)
+
+        assert module.get_jinja_env(str(self.root)) is jinja_env
+        assert jinja_env.get_template("shared.json.j2") is template
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import logging
+import threading
 from unittest import TestCase
 from unittest.mock import call, Mock, sentinel, MagicMock
 
@@ -607,6 +608,166 @@ class TestResolvableContainerPropertyDescriptor:
             "resolver": create_placeholder_value(resolver, PlaceholderType.alphanum)
         }
 
+    def test_get__different_stacks__resolve_concurrently(self):
+        # Each resolver waits until both stacks are resolving at once, which can only happen if
+        # resolving one stack's property doesn't block the other stack's.
+        barrier = threading.Barrier(2, timeout=5)
+
+        class BarrierResolver(Resolver):
+            def resolve(self):
+                barrier.wait()
+                return self.argument
+
+        stacks = [MockClass(), MockClass()]
+        for stack in stacks:
+            stack.resolvable_container_property = {"key": BarrierResolver("value")}
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda s=stack: results.append(s.resolvable_container_property)
+            )
+            for stack in stacks
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        assert results == [{"key": "value"}, {"key": "value"}]
+        assert not barrier.broken
+
+    def test_get__same_stack__concurrent_gets__resolves_once(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        class SlowResolver(Resolver):
+            resolve_count = 0
+
+            def resolve(self):
+                SlowResolver.resolve_count += 1
+                started.set()
+                release.wait(5)
+                return self.argument
+
+        self.mock_object.resolvable_container_property = {"key": SlowResolver("value")}
+        results = []
+
+        def get():
+            results.append(self.mock_object.resolvable_container_property)
+
+        threads = [threading.Thread(target=get) for _ in range(2)]
+        threads[0].start()
+        started.wait(5)
+        threads[1].start()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert results == [{"key": "value"}, {"key": "value"}]
+        assert SlowResolver.resolve_count == 1
+
+
+class TestResolvableContainerPropertyConcurrentResolution:
+    def setup_method(self, test_method):
+        ResolvableContainerProperty.max_concurrent_resolvers = 3
+        self.mock_object = MockClass()
+
+    def teardown_method(self, test_method):
+        ResolvableContainerProperty.max_concurrent_resolvers = 1
+
+    def test_get__resolves_resolvers_concurrently(self):
+        # Each resolver waits until all three are resolving at once.
+        barrier = threading.Barrier(3, timeout=5)
+
+        class BarrierResolver(Resolver):
+            def resolve(self):
+                barrier.wait()
+                return self.argument
+
+        self.mock_object.resolvable_container_property = {
+            "a": BarrierResolver("a"),
+            "nested": {"b": BarrierResolver("b")},
+            "list": ["plain", BarrierResolver("c")],
+        }
+
+        assert self.mock_object.resolvable_container_property == {
+            "a": "a",
+            "nested": {"b": "b"},
+            "list": ["plain", "c"],
+        }
+
+    def test_get__resolvers_resolve_to_none__deletes_those_items(self):
+        self.mock_object.resolvable_container_property = {
+            "a": NestedResolver(None),
+            "b": NestedResolver("b"),
+            "list": [NestedResolver(None), "plain", NestedResolver("c")],
+        }
+
+        assert self.mock_object.resolvable_container_property == {
+            "b": "b",
+            "list": ["plain", "c"],
+        }
+
+    def test_get__resolver_references_same_property_for_other_value__resolves_it(self):
+        class MyResolver(Resolver):
+            def resolve(self):
+                return self.stack.resolvable_container_property["other_value"]
+
+        self.mock_object.resolvable_container_property = {
+            "other_value": NestedResolver("abc"),
+            "resolver": MyResolver(),
+        }
+
+        assert self.mock_object.resolvable_container_property == {
+            "other_value": "abc",
+            "resolver": "abc",
+        }
+
+    def test_get__resolver_references_itself__raises_recursive_resolve(self):
+        class RecursiveResolver(Resolver):
+            def resolve(self):
+                return self.stack.resolvable_container_property["resolver"]
+
+        self.mock_object.resolvable_container_property = {
+            "other_value": NestedResolver("abc"),
+            "resolver": RecursiveResolver(),
+        }
+        with pytest.raises(RecursiveResolve):
+            self.mock_object.resolvable_container_property
+
+    def test_get__resolver_raises_error__placeholders_not_allowed__raises_error(self):
+        class ErroringResolver(Resolver):
+            def resolve(self):
+                raise ValueError()
+
+        self.mock_object.resolvable_container_property = {
+            "a": NestedResolver("a"),
+            "b": ErroringResolver(),
+        }
+        with pytest.raises(ValueError):
+            self.mock_object.resolvable_container_property
+
+    def test_get__resolver_raises_error__placeholders_allowed__returns_placeholder(
+        self,
+    ):
+        class ErroringResolver(Resolver):
+            def resolve(self):
+                raise ValueError()
+
+        resolver = ErroringResolver()
+        self.mock_object.resolvable_container_property = {
+            "a": NestedResolver("a"),
+            "b": resolver,
+        }
+        with use_resolver_placeholders_on_error():
+            result = self.mock_object.resolvable_container_property
+
+        assert result == {
+            "a": "a",
+            "b": create_placeholder_value(resolver, PlaceholderType.explicit),
+        }
+
 
 class TestResolvableValueProperty:
     def setup_method(self, test_method):
@@ -725,3 +886,30 @@ class TestResolvableValueProperty:
             result = self.mock_object.value_with_none_placeholder
 
         assert result == create_placeholder_value(resolver, PlaceholderType.none)
+
+    def test_get__different_stacks__resolve_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        class BarrierResolver(Resolver):
+            def resolve(self):
+                barrier.wait()
+                return self.argument
+
+        stacks = [MockClass(), MockClass()]
+        for stack in stacks:
+            stack.resolvable_value_property = BarrierResolver("value")
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda s=stack: results.append(s.resolvable_value_property)
+            )
+            for stack in stacks
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        assert results == ["value", "value"]
+        assert not barrier.broken
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+
+import contextvars
+import json
+import os
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from sceptre.resolvers import Resolver
+from sceptre.resolvers.cache import (
+    CacheScope,
+    PlanCaches,
+    ResolverCache,
+    cache_resolver,
+    cache_stats,
+    clear_plan_caches,
+)
+
+
+def make_stack(region="eu-west-1", project_code="prj"):
+    stack = MagicMock()
+    stack.region = region
+    stack.stack_group_config = {"project_code": project_code}
+    return stack
+
+
+class CountingResolver(Resolver):
+    cache = ResolverCache(CacheScope.plan, stack_attributes=("region",))
+    calls = []
+
+    def resolve(self):
+        self.calls.append(self.argument)
+        return f"{self.argument}@{self.stack.region}"
+
+
+class ChildResolver(CountingResolver):
+    def resolve(self):
+        return "child:" + super().resolve()
+
+
+class StackScopedResolver(Resolver):
+    cache = ResolverCache(CacheScope.stack)
+    calls = []
+
+    def resolve(self):
+        self.calls.append(self.argument)
+        return self.argument
+
+
+class UncachedResolver(Resolver):
+    calls = []
+
+    def resolve(self):
+        self.calls.append(self.argument)
+        return self.argument
+
+
+class TestResolverCache(object):
+    def setup_method(self, test_method):
+        for resolver_class in (CountingResolver, StackScopedResolver, UncachedResolver):
+            resolver_class.calls = []
+        CountingResolver.cache.clear()
+        StackScopedResolver.cache.clear()
+        self.stack = make_stack()
+
+    def test_resolve__same_argument_and_context__resolves_once(self):
+        first = CountingResolver("arg", make_stack())
+        second = CountingResolver("arg", make_stack())
+
+        assert first.resolve() == second.resolve() == "arg@eu-west-1"
+        assert CountingResolver.calls == ["arg"]
+        assert CountingResolver.cache.stats()["hits"] == 1
+        assert CountingResolver.cache.stats()["misses"] == 1
+
+    def test_resolve__different_argument_or_context__resolves_again(self):
+        CountingResolver("arg", make_stack()).resolve()
+        CountingResolver("other", make_stack()).resolve()
+        CountingResolver("arg", make_stack(region="us-east-1")).resolve()
+
+        assert CountingResolver.calls == ["arg", "other", "arg"]
+
+    def test_resolve__subclass_calling_parent__is_cached_separately(self):
+        assert ChildResolver("arg", self.stack).resolve() == "child:arg@eu-west-1"
+        assert CountingResolver("arg", self.stack).resolve() == "arg@eu-west-1"
+        assert ChildResolver("arg", self.stack).resolve() == "child:arg@eu-west-1"
+
+        assert CountingResolver.calls == ["arg", "arg"]
+
+    def test_resolve__without_cache__resolves_every_time(self):
+        UncachedResolver("arg", self.stack).resolve()
+        UncachedResolver("arg", self.stack).resolve()
+
+        assert UncachedResolver.calls == ["arg", "arg"]
+
+    def test_resolve__stack_scope__is_shared_within_a_stack_only(self):
+        other_stack = make_stack()
+        StackScopedResolver("arg", self.stack).resolve()
+        StackScopedResolver("arg", self.stack).resolve()
+        StackScopedResolver("arg", other_stack).resolve()
+
+        assert StackScopedResolver.calls == ["arg", "arg"]
+
+    def test_resolve__nested_argument__is_keyed_by_resolved_value(self):
+        class Inner(Resolver):
+            def resolve(self):
+                return "inner"
+
+        resolver = CountingResolver({"key": [Inner()]}, None)
+        resolver = resolver.clone_for_stack(self.stack)
+
+        resolver.resolve()
+        CountingResolver({"key": ["inner"]}, self.stack).resolve()
+
+        assert CountingResolver.calls == [{"key": ["inner"]}]
+
+    def test_resolve__error__is_not_cached(self):
+        class Failing(Resolver):
+            cache = ResolverCache()
+            attempts = 0
+
+            def resolve(self):
+                Failing.attempts += 1
+                if Failing.attempts == 1:
+                    raise ValueError("boom")
+                return "ok"
+
+        with pytest.raises(ValueError):
+            Failing("arg", self.stack).resolve()
+
+        assert Failing("arg", self.stack).resolve() == "ok"
+        assert Failing.cache.stats()["errors"] == 1
+
+    def test_resolve__concurrent_identical_resolves__resolve_once(self):
+        release = threading.Event()
+
+        class Slow(Resolver):
+            cache = ResolverCache()
+            calls = 0
+
+            def resolve(self):
+                Slow.calls += 1
+                release.wait(5)
+                return "slow"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(Slow("arg", self.stack).resolve())
+            )
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert results == ["slow"] * 5
+        assert Slow.calls == 1
+
+    def test_resolve__over_max_size__evicts_least_recently_used(self):
+        @cache_resolver(max_size=2)
+        class Small(Resolver):
+            calls = []
+
+            def resolve(self):
+                self.calls.append(self.argument)
+                return self.argument
+
+        for argument in ["a", "b", "a", "c", "a", "b"]:
+            Small(argument, self.stack).resolve()
+
+        assert Small.calls == ["a", "b", "c", "b"]
+        assert Small.cache.stats()["evictions"] == 2
+
+    def test_resolve__dotted_stack_attribute(self):
+        @cache_resolver(stack_attributes=("stack_group_config.project_code",))
+        class ByProject(Resolver):
+            calls = 0
+
+            def resolve(self):
+                ByProject.calls += 1
+                return self.stack.stack_group_config["project_code"]
+
+        assert ByProject("arg", make_stack(project_code="a")).resolve() == "a"
+        assert ByProject("arg", make_stack(project_code="b")).resolve() == "b"
+        assert ByProject("arg", make_stack(project_code="a")).resolve() == "a"
+        assert ByProject.calls == 2
+
+    def test_clear_plan_caches__clears_plan_and_stack_scopes_only(self):
+        @cache_resolver(CacheScope.process)
+        class ProcessScoped(Resolver):
+            calls = 0
+
+            def resolve(self):
+                ProcessScoped.calls += 1
+                return "value"
+
+        CountingResolver("arg", self.stack).resolve()
+        ProcessScoped("arg", self.stack).resolve()
+
+        clear_plan_caches()
+        CountingResolver("arg", self.stack).resolve()
+        ProcessScoped("arg", self.stack).resolve()
+
+        assert CountingResolver.calls == ["arg", "arg"]
+        assert ProcessScoped.calls == 1
+
+    def test_plan_caches__results_are_kept_for_each_plan(self):
+        first, second = PlanCaches(), PlanCaches()
+        with first.activate():
+            CountingResolver("arg", self.stack).resolve()
+        with second.activate():
+            CountingResolver("arg", self.stack).resolve()
+            clear_plan_caches()
+        with first.activate():
+            CountingResolver("arg", self.stack).resolve()
+
+        assert CountingResolver.calls == ["arg", "arg"]
+
+    def test_plan_caches__are_seen_by_threads_running_in_a_copy_of_the_context(self):
+        plan_caches = PlanCaches()
+        with plan_caches.activate():
+            CountingResolver("arg", self.stack).resolve()
+            context = contextvars.copy_context()
+        thread = threading.Thread(
+            target=context.run,
+            args=(lambda: CountingResolver("arg", self.stack).resolve(),),
+        )
+        thread.start()
+        thread.join()
+
+        assert CountingResolver.calls == ["arg"]
+
+    def test_cache_stats__lists_used_caches(self):
+        CountingResolver("arg", self.stack).resolve()
+        CountingResolver("arg", self.stack).resolve()
+
+        stats = {item["resolver"]: item for item in cache_stats()}
+
+        assert stats["CountingResolver"]["hits"] == 1
+        assert stats["CountingResolver"]["scope"] == "plan"
+        assert "StackScopedResolver" not in stats
+
+    def test_disk_scope__requires_ttl(self):
+        with pytest.raises(ValueError):
+            ResolverCache(CacheScope.disk)
+
+
+class TestResolverDiskCache(object):
+    @pytest.fixture(autouse=True)
+    def disk_resolver(self, tmp_path):
+        @cache_resolver(CacheScope.disk, ttl=60, directory=str(tmp_path))
+        class OnDisk(Resolver):
+            calls = 0
+
+            def resolve(self):
+                OnDisk.calls += 1
+                return {"value": self.argument}
+
+        self.resolver_class = OnDisk
+        self.directory = tmp_path
+        yield
+        ResolverCache.refresh = False
+
+    def resolve_in_new_process(self, argument="arg"):
+        # a new process starts with nothing in memory
+        self.resolver_class.cache.clear()
+        return self.resolver_class(argument, make_stack()).resolve()
+
+    def test_results_are_reused_across_processes(self):
+        assert self.resolve_in_new_process() == {"value": "arg"}
+        assert self.resolve_in_new_process() == {"value": "arg"}
+
+        assert self.resolver_class.calls == 1
+        assert self.resolver_class.cache.stats()["disk_hits"] == 1
+        [path] = (self.directory / "OnDisk").iterdir()
+        assert oct(os.stat(str(path)).st_mode & 0o777) == "0o600"
+
+    def test_expired_results_are_resolved_again(self):
+        self.resolve_in_new_process()
+        [path] = (self.directory / "OnDisk").iterdir()
+        cached = json.loads(path.read_text())
+        cached["time"] -= 61
+        path.write_text(json.dumps(cached))
+
+        self.resolve_in_new_process()
+
+        assert self.resolver_class.calls == 2
+
+    def test_refresh__ignores_results_on_disk(self):
+        self.resolve_in_new_process()
+        ResolverCache.refresh = True
+
+        self.resolve_in_new_process()
+        self.resolver_class("arg", make_stack()).resolve()
+
+        assert self.resolver_class.calls == 2
+
+
+class TestResolverCacheLookup(object):
+    def test_lookup__shares_results_by_key(self):
+        cache = ResolverCache(CacheScope.process, name="listings")
+        calls = []
+
+        def load(value):
+            calls.append(value)
+            return value
+
+        assert cache.lookup(("a", 1), lambda: load("first")) == "first"
+        assert cache.lookup(("a", 1), lambda: load("second")) == "first"
+        assert cache.lookup(("a", 2), lambda: load("third")) == "third"
+        assert calls == ["first", "third"]
+
+    def test_lookup__error__is_not_cached(self):
+        cache = ResolverCache(name="listings")
+
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            cache.lookup(("a",), fail)
+
+        assert cache.lookup(("a",), lambda: "ok") == "ok"
+
+    def test_lookup__disk_scope__is_kept_under_the_cache_name(self, tmp_path):
+        cache = ResolverCache(
+            CacheScope.disk, ttl=60, directory=str(tmp_path), name="listings"
+        )
+
+        cache.lookup(("a",), lambda: ["value"])
+        cache.clear()
+
+        assert cache.lookup(("a",), lambda: ["other"]) == ["value"]
+        assert cache.stats()["disk_hits"] == 1
+        assert [path.name for path in tmp_path.iterdir()] == ["listings"]
+
+    def test_lookup__disk_hit__expires_from_memory_with_the_copy_on_disk(
+        self, tmp_path
+    ):
+        cache = ResolverCache(
+            CacheScope.disk, ttl=60, directory=str(tmp_path), name="listings"
+        )
+        cache.lookup(("a",), lambda: "value")
+        [path] = (tmp_path / "listings").iterdir()
+        cached = json.loads(path.read_text())
+        cached["time"] -= 59.5
+        path.write_text(json.dumps(cached))
+        cache.clear()
+
+        assert cache.lookup(("a",), lambda: "other") == "value"
+        [entry] = cache._entries.values()
+        assert entry.expired(0.4)
+        assert not entry.expired(60)
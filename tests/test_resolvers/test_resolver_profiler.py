@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+import json
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from sceptre.resolvers import ResolvableContainerProperty, Resolver
+from sceptre.resolvers.cache import ResolverCache
+from sceptre.resolvers.profiler import ResolverProfiler, resolver_profiler
+
+
+class Sleeping(Resolver):
+    def resolve(self):
+        time.sleep(0.02)
+        return "slept"
+
+
+class Joining(Resolver):
+    def resolve(self):
+        time.sleep(0.01)
+        return "-".join(self.argument)
+
+
+class Cached(Resolver):
+    cache = ResolverCache()
+
+    def resolve(self):
+        return "cached"
+
+
+class Failing(Resolver):
+    def resolve(self):
+        raise ValueError("boom")
+
+
+def make_stack(name):
+    stack = MagicMock()
+    stack.name = name
+    return stack
+
+
+class TestResolverProfiler(object):
+    def setup_method(self, test_method):
+        resolver_profiler.enabled = True
+        resolver_profiler.reset()
+        Cached.cache.clear()
+        self.prop = ResolvableContainerProperty("parameters")
+
+    def teardown_method(self, test_method):
+        resolver_profiler.enabled = False
+        resolver_profiler.reset()
+
+    def entries(self):
+        return {
+            (entry["resolver"], entry["stack"]): entry
+            for entry in resolver_profiler.summary()["top_entries"]
+        }
+
+    def test_profile__records_resolver_argument_and_stack(self):
+        self.prop.resolve_resolver_value(Sleeping("arg", make_stack("dev/app")))
+        self.prop.resolve_resolver_value(Sleeping("arg", make_stack("dev/app")))
+
+        [entry] = resolver_profiler.summary()["top_entries"]
+        assert entry["resolver"] == "Sleeping"
+        assert entry["argument"] == "'arg'"
+        assert entry["stack"] == "dev/app"
+        assert entry["calls"] == 2
+        assert entry["total_seconds"] >= 0.04
+
+    def test_profile__nested_resolves__have_their_own_entries(self):
+        resolver = Joining([Sleeping(), "b"]).clone_for_stack(make_stack("dev/app"))
+
+        assert self.prop.resolve_resolver_value(resolver) == "slept-b"
+
+        entries = self.entries()
+        outer, inner = entries[("Joining", "dev/app")], entries[("Sleeping", "dev/app")]
+        assert inner["calls"] == 1
+        assert outer["total_seconds"] >= inner["total_seconds"] + 0.01
+        assert outer["self_seconds"] < outer["total_seconds"] - 0.015
+
+    def test_profile__cache_hits_are_counted(self):
+        self.prop.resolve_resolver_value(Cached("arg", make_stack("dev/a")))
+        self.prop.resolve_resolver_value(Cached("arg", make_stack("dev/b")))
+
+        entries = self.entries()
+        assert entries[("Cached", "dev/a")]["cache_hits"] == 0
+        assert entries[("Cached", "dev/b")]["cache_hits"] == 1
+        [cache] = [
+            item
+            for item in resolver_profiler.summary()["caches"]
+            if item["resolver"] == "Cached"
+        ]
+        assert cache["hits"] == 1
+
+    def test_profile__errors_are_counted(self):
+        with pytest.raises(ValueError):
+            self.prop.resolve_resolver_value(Failing("arg", make_stack("dev/app")))
+
+        assert self.entries()[("Failing", "dev/app")]["errors"] == 1
+
+    def test_profile__disabled__records_nothing(self):
+        resolver_profiler.enabled = False
+
+        self.prop.resolve_resolver_value(Sleeping("arg", make_stack("dev/app")))
+
+        assert resolver_profiler.summary()["total_resolves"] == 0
+
+    def test_summary__resolvers_are_sorted_by_total_time(self):
+        self.prop.resolve_resolver_value(Cached("arg", make_stack("dev/app")))
+        self.prop.resolve_resolver_value(Sleeping("arg", make_stack("dev/app")))
+
+        names = [item["resolver"] for item in resolver_profiler.summary()["resolvers"]]
+
+        assert names == ["Sleeping", "Cached"]
+
+    def test_report__text_and_json(self):
+        profiler = ResolverProfiler()
+        profiler.enabled = True
+        profiler.add_source("runner", lambda: {"runs": 3})
+        with profiler.profile(Sleeping("arg", make_stack("dev/app"))):
+            pass
+
+        text = profiler.report()
+        assert "!Sleeping 'arg' [dev/app]" in text
+        assert 'runner: {"runs": 3}' in text
+        summary = json.loads(profiler.report("json"))
+        assert summary["total_resolves"] == 1
+        assert summary["sources"] == {"runner": {"runs": 3}}
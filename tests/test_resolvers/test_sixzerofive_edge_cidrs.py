@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+
+import json
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+pytest.importorskip("devops")
+
+from sceptre.resolvers import sixzerofive_edge_cidrs as module  # noqa: E402
+from sceptre.resolvers.cache import CacheScope, ResolverCache  # noqa: E402
+
+resolver_class = module.sixzerofive_edge_cidrs
+
+
+class TestEdgeCidrs(object):
+    @pytest.fixture(autouse=True)
+    def environment(self, monkeypatch, tmp_path):
+        self.directory = str(tmp_path)
+        self.api = MagicMock()
+        self.api.describe_edge_cidrs.return_value = {"ipv4": ["10.0.0.0/8"]}
+        monkeypatch.setattr(module, "api", self.api)
+        self.monkeypatch = monkeypatch
+        self.new_run()
+        yield
+        ResolverCache.refresh = False
+
+    def new_run(self, ttl=3600):
+        """a fresh in-memory cache, as a later run of sceptre would have"""
+        cache = ResolverCache(CacheScope.disk, ttl=ttl, directory=self.directory)
+        cache.__set_name__(resolver_class, "cache")
+        self.monkeypatch.setattr(resolver_class, "cache", cache)
+
+    def resolve(self):
+        return resolver_class().resolve()
+
+    def test_resolve__returns_the_ipv4_cidrs_as_json(self):
+        assert json.loads(self.resolve()) == ["10.0.0.0/8"]
+
+    def test_resolve__looks_the_cidrs_up_once_per_run(self):
+        self.resolve()
+        self.resolve()
+
+        assert self.api.describe_edge_cidrs.call_count == 1
+
+    def test_resolve__later_run_within_the_ttl__reads_them_from_disk(self):
+        self.resolve()
+        self.new_run()
+
+        assert json.loads(self.resolve()) == ["10.0.0.0/8"]
+        assert self.api.describe_edge_cidrs.call_count == 1
+        assert resolver_class.cache.stats()["disk_hits"] == 1
+
+    def test_resolve__later_run_after_the_ttl__looks_them_up_again(self):
+        self.new_run(ttl=0.1)
+        self.resolve()
+        time.sleep(0.2)
+        self.new_run(ttl=0.1)
+
+        self.resolve()
+
+        assert self.api.describe_edge_cidrs.call_count == 2
+
+    def test_resolve__refresh_resolver_cache__looks_them_up_again(self):
+        self.resolve()
+        self.new_run()
+        self.api.describe_edge_cidrs.return_value = {"ipv4": ["192.168.0.0/16"]}
+        ResolverCache.refresh = True
+
+        assert json.loads(self.resolve()) == ["192.168.0.0/16"]
+        # and what's on disk is replaced
+        ResolverCache.refresh = False
+        self.new_run()
+        assert json.loads(self.resolve()) == ["192.168.0.0/16"]
+        assert self.api.describe_edge_cidrs.call_count == 2
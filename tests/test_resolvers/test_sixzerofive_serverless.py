@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+from types import SimpleNamespace
+
+import pytest
+from botocore.exceptions import ClientError
+
+pytest.importorskip("devops")
+
+from sceptre.exceptions import StackDoesNotExistError  # noqa: E402
+from sceptre.resolvers import sixzerofive_serverless as module  # noqa: E402
+
+
+def output(key, value):
+    return {"OutputKey": key, "OutputValue": value}
+
+
+class TestServerless(object):
+    @pytest.fixture(autouse=True)
+    def outputs(self, monkeypatch):
+        self.requests = []
+        self.outputs = [
+            output("ServiceEndpoint", "https://api"),
+            output(
+                "MainLambdaFunctionQualifiedArn",
+                "arn:aws:lambda:eu-west-1:123:function:fn:7",
+            ),
+        ]
+
+        def external_stack_outputs(env_name, stack_name):
+            self.requests.append((env_name, stack_name))
+            if isinstance(self.outputs, Exception):
+                raise self.outputs
+            return self.outputs
+
+        monkeypatch.setattr(module, "external_stack_outputs", external_stack_outputs)
+
+    def resolve(self, argument):
+        resolver = module.serverless(argument)
+        resolver.stack = SimpleNamespace(
+            name="stack", stack_group_config={"env_name": "dev"}
+        )
+        return resolver.resolve()
+
+    def test_resolve__looks_up_the_stage_stack_in_the_env(self):
+        assert self.resolve("prod/blue/api::ServiceEndpoint") == "https://api"
+        assert self.requests == [("prod", "serverless-api-blue")]
+
+    def test_resolve__without_env__uses_the_stacks_env(self):
+        self.resolve("blue/api::ServiceEndpoint")
+
+        assert self.requests == [("dev", "serverless-api-blue")]
+
+    def test_resolve__qualified_arn__drops_the_version(self):
+        assert (
+            self.resolve("prod/blue/api::MainLambdaFunctionQualifiedArn")
+            == "arn:aws:lambda:eu-west-1:123:function:fn"
+        )
+
+    def test_resolve__missing_output__raises(self):
+        with pytest.raises(ValueError):
+            self.resolve("prod/blue/api::Missing")
+
+    def test_resolve__bad_argument__raises(self):
+        with pytest.raises(ValueError):
+            self.resolve("api::ServiceEndpoint")
+
+    def test_resolve__missing_stack__raises(self):
+        self.outputs = ClientError(
+            {
+                "Error": {
+                    "Code": "ValidationError",
+                    "Message": "Stack with id serverless-api-blue does not exist",
+                }
+            },
+            "DescribeStacks",
+        )
+
+        with pytest.raises(ClientError):
+            self.resolve("prod/blue/api::ServiceEndpoint")
+
+    def test_resolve__stack_missing_from_outputs_snapshot__raises(self):
+        self.outputs = StackDoesNotExistError(
+            "Stack with id serverless-api-blue is not in the outputs snapshot"
+        )
+
+        with pytest.raises(StackDoesNotExistError):
+            self.resolve("prod/blue/api::ServiceEndpoint")
+
+    def test_resolve__other_errors__raise(self):
+        self.outputs = ClientError(
+            {"Error": {"Code": "AccessDenied", "Message": "denied"}}, "DescribeStacks"
+        )
+
+        with pytest.raises(ClientError):
+            self.resolve("prod/blue/api::ServiceEndpoint")
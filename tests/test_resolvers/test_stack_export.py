@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+import os
+import threading
+import time
+
+import pytest
+import yaml
+
+pytest.importorskip("devops")
+
+from sceptre.env_config import env_config_store  # noqa: E402
+from sceptre.outputs_cache import stack_outputs_cache  # noqa: E402
+from sceptre.resolvers import stack_export as module  # noqa: E402
+from sceptre.resolvers.stack_export import StackExport  # noqa: E402
+
+
+def write_config(project_path, env_name, config):
+    env_dir = os.path.join(str(project_path), "config", env_name)
+    os.makedirs(env_dir, exist_ok=True)
+    path = os.path.join(env_dir, "config.yaml")
+    with open(path, "w") as fhandle:
+        yaml.safe_dump(config, fhandle)
+    return path
+
+
+class TestExternalConnectionManager(object):
+    @pytest.fixture(autouse=True)
+    def project(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("SCEPTRE_ROOT", str(tmp_path))
+        env_config_store.clear()
+        self.root = tmp_path
+        yield
+        env_config_store.clear()
+
+    def test_external_connection_manager__is_shared(self):
+        write_config(self.root, "prod", {"region": "eu-west-1", "profile": "prod"})
+
+        first = module.external_connection_manager("prod")
+
+        assert module.external_connection_manager("prod") is first
+        assert (first.region, first.profile) == ("eu-west-1", "prod")
+
+    def test_external_connection_manager__config_changes__is_built_again(self):
+        path = write_config(self.root, "prod", {"region": "eu-west-1"})
+        first = module.external_connection_manager("prod")
+
+        write_config(self.root, "prod", {"region": "us-east-1"})
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000))
+        second = module.external_connection_manager("prod")
+
+        assert second is not first
+        assert second.region == "us-east-1"
+
+
+class FakeCloudFormation(object):
+    def __init__(self, outputs):
+        self.outputs = outputs
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def call(self, service, command, kwargs):
+        with self.lock:
+            self.calls += 1
+        time.sleep(0.05)
+        return {
+            "Stacks": [
+                {
+                    "StackName": kwargs["StackName"],
+                    "Outputs": [
+                        {"OutputKey": key, "OutputValue": value}
+                        for key, value in self.outputs.items()
+                    ],
+                }
+            ]
+        }
+
+
+class TestStackExportConcurrency(object):
+    @pytest.fixture(autouse=True)
+    def project(self, monkeypatch, tmp_path):
+        monkeypatch.setenv("SCEPTRE_ROOT", str(tmp_path))
+        write_config(tmp_path, "prod", {"region": "eu-west-1", "project_code": "prj"})
+        self.outputs = {"Key{}".format(i): "value-{}".format(i) for i in range(10)}
+        self.cloudformation = FakeCloudFormation(self.outputs)
+        monkeypatch.setattr(
+            module, "external_connection_manager", lambda env_name: self.cloudformation
+        )
+        env_config_store.clear()
+        stack_outputs_cache.clear()
+        yield
+        env_config_store.clear()
+        stack_outputs_cache.clear()
+
+    def resolve_concurrently(self, arguments):
+        results = {}
+
+        def resolve(argument):
+            results[argument] = StackExport(argument).resolve()
+
+        threads = [
+            threading.Thread(target=resolve, args=(argument,)) for argument in arguments
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+        return results
+
+    def test_resolve__concurrent_keys_of_one_stack__describe_it_once(self):
+        arguments = ["prod/queues::{}".format(key) for key in self.outputs] * 3
+
+        results = self.resolve_concurrently(arguments)
+
+        assert results == {
+            "prod/queues::{}".format(key): value for key, value in self.outputs.items()
+        }
+        assert self.cloudformation.calls == 1
+
+    def test_resolve__keys_of_one_stack__share_its_outputs(self):
+        StackExport("prod/queues::Key1").resolve()
+
+        assert StackExport("prod/queues::Key2").resolve() == "value-2"
+        assert self.cloudformation.calls == 1
+
+    def test_resolve__stack_changed__resolves_the_new_value(self):
+        assert StackExport("prod/queues::Key1").resolve() == "value-1"
+
+        self.outputs["Key1"] = "changed"
+        # as the stack actions do when a stack is updated
+        stack_outputs_cache.invalidate("prj-prod-queues")
+
+        assert StackExport("prod/queues::Key1").resolve() == "changed"
+        assert self.cloudformation.calls == 2
+
+    def test_resolve__empty_export__is_returned(self):
+        self.outputs["Empty"] = ""
+
+        assert StackExport("prod/queues::Empty").resolve() == ""
+        assert StackExport("prod/queues::Empty").resolve() == ""
+        assert self.cloudformation.calls == 1
+
+    def test_resolve__missing_key__raises(self):
+        with pytest.raises(RuntimeError):
+            StackExport("prod/queues::Missing").resolve()
@@ -10,6 +10,8 @@ from sceptre.exceptions import SceptreException
 from botocore.exceptions import ClientError
 
 from sceptre.connection_manager import ConnectionManager
+from sceptre.outputs_cache import stack_outputs_cache
+from sceptre.outputs_snapshot import OutputsSnapshot, use_outputs_snapshot
 from sceptre.resolvers.stack_output import (
     StackOutput,
     StackOutputExternal,
@@ -235,9 +237,15 @@ class MockStackOutputBase(StackOutputBase):
 
 class TestStackOutputBaseResolver(object):
     def setup_method(self, test_method):
+        stack_outputs_cache.clear()
         self.stack = MagicMock(spec=Stack)
         self.stack.name = "my/stack.yaml"
         self.stack._connection_manager = MagicMock(spec=ConnectionManager)
+        self.stack.connection_manager.resolve_session_args.return_value = (
+            None,
+            "region",
+            None,
+        )
         self.base_stack_output_resolver = MockStackOutputBase(None, self.stack)
 
     @patch("sceptre.resolvers.stack_output.StackOutputBase._get_stack_outputs")
@@ -293,6 +301,30 @@ class TestStackOutputBaseResolver(object):
         )
         assert response == {}
 
+    def test_get_stack_outputs_with_outputs_snapshot(self):
+        snapshot = OutputsSnapshot.from_catalogs(
+            [
+                (
+                    "other-account",
+                    "region",
+                    [
+                        {
+                            "StackName": "prj-vpc",
+                            "Outputs": [{"OutputKey": "key", "OutputValue": "value"}],
+                        }
+                    ],
+                )
+            ]
+        )
+        use_outputs_snapshot(snapshot)
+        try:
+            response = self.base_stack_output_resolver._get_stack_outputs("prj-vpc")
+        finally:
+            use_outputs_snapshot(None)
+
+        assert response == {"key": "value"}
+        self.stack.connection_manager.call.assert_not_called()
+
     def test_get_stack_outputs_with_unlaunched_stack(self):
         self.stack.connection_manager.call.side_effect = ClientError(
             {"Error": {"Code": "404", "Message": "stack does not exist"}},
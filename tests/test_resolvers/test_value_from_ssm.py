@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError
+
+from sceptre.resolvers.cache import PlanCaches, clear_plan_caches
+from sceptre.resolvers.value_from_ssm import ParameterStore, parameter_store
+
+LOGGER = logging.getLogger(__name__)
+
+
+def denied(operation):
+    return ClientError(
+        {"Error": {"Code": "AccessDeniedException", "Message": "denied"}}, operation
+    )
+
+
+class FakeSSM(object):
+    """get_parameters fails entirely when any of its names is denied, as SSM does"""
+
+    def __init__(self, values, denied_names=()):
+        self.values = values
+        self.denied_names = set(denied_names)
+        self.calls = []
+
+    def get_parameters(self, Names, WithDecryption):
+        self.calls.append(("get_parameters", list(Names)))
+        if self.denied_names.intersection(Names):
+            raise denied("GetParameters")
+        return {
+            "Parameters": [
+                {"Name": name, "Value": self.values[name]}
+                for name in Names
+                if name in self.values
+            ],
+            "InvalidParameters": [name for name in Names if name not in self.values],
+        }
+
+    def get_parameter(self, Name, WithDecryption):
+        self.calls.append(("get_parameter", Name))
+        if Name in self.denied_names:
+            raise denied("GetParameter")
+        if Name not in self.values:
+            raise ClientError({"Error": {"Code": "ParameterNotFound"}}, "GetParameter")
+        return {"Parameter": {"Name": Name, "Value": self.values[Name]}}
+
+
+class ClearingLock(object):
+    """clears the store as soon as it's next released, as a concurrent clear() would"""
+
+    def __init__(self, store):
+        self.store = store
+        self.lock = threading.Lock()
+        self.armed = False
+
+    def __enter__(self):
+        self.lock.acquire()
+
+    def __exit__(self, *exc_info):
+        self.lock.release()
+        if self.armed:
+            self.armed = False
+            self.store.clear()
+
+
+class TestParameterStore(object):
+    def setup_method(self, test_method):
+        self.good = ["/app/param{:02}".format(i) for i in range(20)]
+        self.ssm = FakeSSM({name: name.upper() for name in self.good}, ["/app/denied"])
+        self.store = ParameterStore()
+        self.store._client = MagicMock(return_value=self.ssm)
+
+    def want(self, names):
+        for name in names:
+            self.store.want("profile", "eu-west-1", name)
+
+    def get(self, name):
+        return self.store.get("profile", "eu-west-1", name, LOGGER)
+
+    def test_get__fetches_wanted_names_in_batches(self):
+        self.want(self.good)
+
+        assert [self.get(name) for name in self.good] == [
+            name.upper() for name in self.good
+        ]
+        assert self.store.calls == 2
+
+    def test_get__denied_name__is_isolated_from_the_rest_of_its_batch(self):
+        self.want(["/app/denied"] + self.good)
+
+        with pytest.raises(ClientError):
+            self.get("/app/denied")
+        values = [self.get(name) for name in self.good]
+
+        assert values == [name.upper() for name in self.good]
+        # the failed batch is bisected down to the denied name, which is then
+        # looked up on its own; the second batch isn't affected
+        assert self.store.calls < len(self.good)
+        assert self.ssm.calls.count(("get_parameter", "/app/denied")) == 1
+        assert not any(
+            call == "get_parameter" and name != "/app/denied"
+            for call, name in self.ssm.calls
+        )
+
+    def test_get__denied_name__is_dropped_from_later_batches(self):
+        self.want(["/app/denied"] + self.good)
+
+        assert self.get(self.good[0]) == self.good[0].upper()
+        calls = len(self.ssm.calls)
+        assert self.get(self.good[15]) == self.good[15].upper()
+
+        assert self.ssm.calls[calls:] == [
+            ("get_parameters", self.good[15:16] + self.good[9:15] + self.good[16:19])
+        ]
+
+    def test_get__missing_name__raises_and_is_not_fetched_again(self):
+        self.want(["/app/missing"] + self.good[:5])
+
+        with pytest.raises(ClientError):
+            self.get("/app/missing")
+        assert self.get(self.good[0]) == self.good[0].upper()
+        assert self.ssm.calls == [
+            ("get_parameters", ["/app/missing"] + self.good[:5]),
+            ("get_parameter", "/app/missing"),
+        ]
+
+    def test_get__store_cleared_after_a_batch__returns_the_fetched_value(self):
+        lock = ClearingLock(self.store)
+        self.store._lock = lock
+        get_parameters = self.ssm.get_parameters
+
+        def get_parameters_then_clear(**kwargs):
+            lock.armed = True
+            return get_parameters(**kwargs)
+
+        self.ssm.get_parameters = get_parameters_then_clear
+        self.want(self.good[:3])
+
+        assert self.get(self.good[0]) == self.good[0].upper()
+
+    def test_get__store_cleared_after_a_lookup__returns_the_value(self):
+        lock = ClearingLock(self.store)
+        self.store._lock = lock
+        get_parameter = self.ssm.get_parameter
+
+        def get_parameter_then_clear(**kwargs):
+            lock.armed = True
+            return get_parameter(**kwargs)
+
+        self.ssm.get_parameter = get_parameter_then_clear
+        self.ssm.values["/app/single"] = "SINGLE"
+        self.ssm.get_parameters = MagicMock(return_value={"Parameters": []})
+
+        assert self.get("/app/single") == "SINGLE"
+
+    def test_get__errors_other_than_client_errors__propagate(self):
+        self.ssm.get_parameters = MagicMock(side_effect=KeyError("boom"))
+        self.want(self.good[:3])
+
+        with pytest.raises(KeyError):
+            self.get(self.good[0])
+
+    def test_clear_plan_caches__clears_the_parameter_store(self):
+        with PlanCaches().activate():
+            parameter_store().want("profile", "eu-west-1", "/app/b")
+
+            clear_plan_caches()
+
+            assert parameter_store()._wanted == {}
+
+    def test_parameter_store__is_kept_for_each_plan(self):
+        first, second = PlanCaches(), PlanCaches()
+        with first.activate():
+            store = parameter_store()
+            assert parameter_store() is store
+        with second.activate():
+            assert parameter_store() is not store
+
+    def test_value_from_ssm__wraps_errors(self):
+        from sceptre.resolvers.value_from_ssm import value_from_ssm
+
+        resolver = value_from_ssm("profile@eu-west-1 /app/denied")
+        with PlanCaches().activate():
+            with patch.object(parameter_store(), "_client", return_value=self.ssm):
+                with pytest.raises(RuntimeError, match="/app/denied"):
+                    resolver.resolve()
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+import os
+import subprocess
+
+import pytest
+
+from sceptre.vcs_metadata import GitMetadata
+
+SHA = "0123456789abcdef0123456789abcdef01234567"
+OTHER_SHA = "89abcdef0123456789abcdef0123456789abcdef"
+
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as fhandle:
+        fhandle.write(content)
+
+
+class TestGitMetadata(object):
+    def setup_method(self, test_method):
+        self.git_calls = []
+        self.metadata = GitMetadata(run_git=self.run_git)
+
+    def run_git(self, args, cwd):
+        self.git_calls.append(args)
+        return "from-git"
+
+    @pytest.fixture
+    def repo(self, tmp_path):
+        git_dir = tmp_path / ".git"
+        write(str(git_dir / "HEAD"), "ref: refs/heads/main\n")
+        write(str(git_dir / "refs" / "heads" / "main"), SHA + "\n")
+        write(
+            str(git_dir / "config"),
+            "[core]\n"
+            "\tbare = false\n"
+            '[remote "origin"]\n'
+            "\turl = git@github.com:605data/stack-core.git\n"
+            "\tfetch = +refs/heads/*:refs/remotes/origin/*\n"
+            '[branch "main"]\n'
+            "\tremote = origin\n",
+        )
+        return tmp_path
+
+    def test_head__loose_ref(self, repo):
+        assert self.metadata.head(str(repo)) == SHA
+        assert self.git_calls == []
+
+    def test_head__packed_ref(self, repo):
+        os.remove(str(repo / ".git" / "refs" / "heads" / "main"))
+        write(
+            str(repo / ".git" / "packed-refs"),
+            "# pack-refs with: peeled fully-peeled sorted\n"
+            "{0} refs/heads/main\n"
+            "{1} refs/tags/v1\n"
+            "^{0}\n".format(SHA, OTHER_SHA),
+        )
+
+        assert self.metadata.head(str(repo)) == SHA
+
+    def test_head__detached(self, repo):
+        write(str(repo / ".git" / "HEAD"), OTHER_SHA + "\n")
+
+        assert self.metadata.head(str(repo)) == OTHER_SHA
+        assert self.metadata.branch(str(repo)) == "HEAD"
+
+    def test_head__from_subdirectory(self, repo):
+        subdirectory = repo / "config" / "dev"
+        subdirectory.mkdir(parents=True)
+
+        assert self.metadata.head(str(subdirectory)) == SHA
+
+    def test_head__worktree(self, repo, tmp_path_factory):
+        worktree_git_dir = repo / ".git" / "worktrees" / "feature"
+        write(str(worktree_git_dir / "HEAD"), "ref: refs/heads/feature\n")
+        write(str(worktree_git_dir / "commondir"), "../..\n")
+        write(str(repo / ".git" / "refs" / "heads" / "feature"), OTHER_SHA + "\n")
+        worktree = tmp_path_factory.mktemp("worktree")
+        write(str(worktree / ".git"), "gitdir: {0}\n".format(worktree_git_dir))
+
+        assert self.metadata.head(str(worktree)) == OTHER_SHA
+        assert self.metadata.branch(str(worktree)) == "feature"
+        assert self.metadata.remote_url(str(worktree)).endswith("stack-core.git")
+
+    def test_head__unborn_branch__falls_back_to_git(self, repo):
+        os.remove(str(repo / ".git" / "refs" / "heads" / "main"))
+
+        assert self.metadata.head(str(repo)) == "from-git"
+        assert self.git_calls == [["rev-parse", "HEAD"]]
+
+    def test_head__is_cached(self, repo):
+        assert self.metadata.head(str(repo)) == SHA
+        write(str(repo / ".git" / "refs" / "heads" / "main"), OTHER_SHA + "\n")
+
+        assert self.metadata.head(str(repo)) == SHA
+        self.metadata.clear()
+        assert self.metadata.head(str(repo)) == OTHER_SHA
+
+    def test_branch(self, repo):
+        assert self.metadata.branch(str(repo)) == "main"
+
+    def test_remote_url(self, repo):
+        assert (
+            self.metadata.remote_url(str(repo))
+            == "git@github.com:605data/stack-core.git"
+        )
+        assert self.git_calls == []
+
+    def test_remote_url__missing_remote__falls_back_to_git(self, repo):
+        assert self.metadata.remote_url(str(repo), "upstream") == "from-git"
+        assert self.git_calls == [["config", "--get", "remote.upstream.url"]]
+
+    def test_remote_url__quoted_value__falls_back_to_git(self, repo):
+        write(
+            str(repo / ".git" / "config"),
+            '[remote "origin"]\n\turl = "git@github.com:605data/stack-core.git"\n',
+        )
+
+        assert self.metadata.remote_url(str(repo)) == "from-git"
+
+
+def test_git_metadata__matches_git(tmp_path):
+    try:
+        subprocess.check_call(["git", "init", "-q", "-b", "main", str(tmp_path)])
+        subprocess.check_call(
+            ["git", "remote", "add", "origin", "https://example.com/repo.git"],
+            cwd=str(tmp_path),
+        )
+        subprocess.check_call(
+            [
+                "git",
+                "-c",
+                "user.name=test",
+                "-c",
+                "user.email=test@example.com",
+                "commit",
+                "-q",
+                "--allow-empty",
+                "-m",
+                "initial",
+            ],
+            cwd=str(tmp_path),
+        )
+    except (OSError, subprocess.CalledProcessError):
+        pytest.skip("git is not available")
+
+    def git(*args):
+        return (
+            subprocess.check_output(("git",) + args, cwd=str(tmp_path)).decode().strip()
+        )
+
+    metadata = GitMetadata(run_git=lambda args, cwd: pytest.fail("ran git"))
+    assert metadata.head(str(tmp_path)) == git("rev-parse", "HEAD")
+    assert metadata.branch(str(tmp_path)) == "main"
+    assert metadata.remote_url(str(tmp_path)) == "https://example.com/repo.git"